@@ -3,6 +3,32 @@ from fastapi import APIRouter, HTTPException
 router = APIRouter(tags=["cache"], prefix="/cache")
 
 
+@router.get("/stats")
+async def get_cache_stats():
+    """
+    Cache performance metrics (hit rate, entries, most used)
+    """
+    try:
+        from ..services.cache_service import cache_service
+        
+        return await cache_service.get_cache_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting cache stats: {str(e)}")
+
+
+@router.get("/prompt-prefix/stats")
+async def get_prompt_prefix_stats():
+    """
+    Provider-side prompt prefix cache hit rate and latency effect per language
+    """
+    try:
+        from ..services.prompt_cache_stats import prompt_cache_stats
+        
+        return await prompt_cache_stats.get_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting prompt prefix stats: {str(e)}")
+
+
 @router.delete("/clear")
 async def clear_all_cache():
     """
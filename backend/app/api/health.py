@@ -110,6 +110,7 @@ async def detailed_health_check():
         checks = {
             "mongodb": await detailed_mongodb_check(),
             "openai": await detailed_openai_check(),
+            "ai_circuit_breaker": check_ai_circuit_breaker(),
             "rate_limiting": check_rate_limiting_health(),
             "disk_space": check_disk_space()
         }
@@ -170,6 +171,19 @@ async def detailed_openai_check() -> dict:
     }
 
 
+def check_ai_circuit_breaker() -> dict:
+    """
+    State of the circuit breaker in front of the AI provider
+    """
+    from ..services.ai_service import ai_service
+    
+    breaker = ai_service.circuit_breaker.snapshot()
+    return {
+        "status": "unhealthy" if breaker["state"] == "open" else "healthy",
+        **breaker
+    }
+
+
 def check_rate_limiting_health() -> dict:
     """
     Verify rate limiting configuration
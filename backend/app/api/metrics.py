@@ -0,0 +1,90 @@
+from fastapi import APIRouter, HTTPException
+
+router = APIRouter(tags=["metrics"], prefix="/metrics")
+
+
+@router.get("/ai-backends")
+async def get_ai_backend_metrics():
+    """
+    Routing decisions, EWMA latency/error rate and ejection state per AI backend
+    """
+    try:
+        from ..services.ai_service import ai_service
+        
+        return ai_service.router.snapshot()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting AI backend metrics: {str(e)}")
+
+
+@router.get("/ai-concurrency")
+async def get_ai_concurrency_metrics():
+    """
+    Adaptive concurrency limit, in-flight calls and queue depth per AI backend
+    """
+    try:
+        from ..services.ai_service import ai_service
+        
+        backends = [
+            {"name": backend.name, **backend.limiter.snapshot()}
+            for backend in ai_service.router.backends
+        ]
+        return {
+            "limit": sum(backend["limit"] for backend in backends),
+            "in_flight": sum(backend["in_flight"] for backend in backends),
+            "queue_depth": sum(backend["queue_depth"] for backend in backends),
+            "backends": backends
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting AI concurrency metrics: {str(e)}")
+
+
+@router.get("/ai-budget")
+async def get_ai_budget_metrics():
+    """
+    Utilization of the cluster-wide requests/tokens-per-minute budget per AI backend
+    """
+    try:
+        from ..services.ai_service import ai_service
+        
+        return {"backends": [await backend.budget.snapshot() for backend in ai_service.router.backends]}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting AI budget metrics: {str(e)}")
+
+
+@router.get("/review-queue")
+async def get_review_queue_metrics():
+    """
+    Review job queue depth, pending (unacknowledged) jobs and dead letters
+    """
+    try:
+        from ..services.review_queue import review_queue
+        
+        return await review_queue.snapshot()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting review queue metrics: {str(e)}")
+
+
+@router.get("/review-scheduler")
+async def get_review_scheduler_metrics():
+    """
+    Waiting reviews and queue-wait percentiles per priority class
+    """
+    try:
+        from ..services.review_scheduler import review_scheduler
+        
+        return await review_scheduler.snapshot()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting review scheduler metrics: {str(e)}")
+
+
+@router.get("/review-events")
+async def get_review_events_metrics():
+    """
+    Open review event streams in this process and events published/delivered
+    """
+    try:
+        from ..services.review_events import review_events
+        
+        return review_events.snapshot()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting review event metrics: {str(e)}")
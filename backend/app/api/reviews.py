@@ -4,7 +4,8 @@ from typing import Optional, List
 from datetime import datetime
 import io
 
-from ..models.review import CodeSubmission, Review, ReviewResponse, ReviewStatus, ReviewListResponse
+from ..core.config import settings
+from ..models.review import CodeSubmission, DiffSubmission, BatchSubmission, BatchStatusResponse, Review, ReviewResponse, ReviewStatus, ReviewListResponse, PartialReviewResponse
 from ..models.user import UserResponse
 from ..services.review_service import review_service
 from ..utils.csv_exporter import csv_exporter
@@ -25,23 +26,122 @@ async def submit_code_review(
     current_user: Optional[UserResponse] = Depends(optional_auth)
 ):
     """
-    Submit code for review by AI
+    Submit code for review by AI. Code already reviewed comes back completed,
+    with its feedback, in this response.
     """
     try:
         client_ip = get_client_ip(request)
-        review_id = await review_service.submit_review(
+        review = await review_service.submit_review(
             submission, 
             client_ip, 
             user_id=current_user.id if current_user else None,
             user_email=current_user.email if current_user else None
         )
         
+        if review.status == ReviewStatus.COMPLETED:
+            message = "Code reviewed from cache."
+        elif submission.deferred:
+            message = "Code queued for the next review batch. Use the ID to check status."
+        else:
+            message = "Code submitted for review. Use the ID to check status."
+        
+        return ReviewResponse(id=review.id, status=review.status, message=message, feedback=review.feedback)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        if "Rate limit" in str(e):
+            raise HTTPException(status_code=429, detail=str(e))
+        else:
+            raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+
+
+@router.post("/reviews/batch", response_model=BatchStatusResponse)
+async def submit_batch_review(
+    submission: BatchSubmission,
+    request: Request,
+    current_user: Optional[UserResponse] = Depends(optional_auth)
+):
+    """
+    Submit many files in one request (e.g. from CI). Files already in the cache
+    complete immediately; the rest are queued as one batch. Each file counts
+    against the rate limit.
+    """
+    try:
+        client_ip = get_client_ip(request)
+        return await review_service.submit_batch(
+            submission,
+            client_ip,
+            user_id=current_user.id if current_user else None,
+            user_email=current_user.email if current_user else None
+        )
+        
+    except Exception as e:
+        if "Rate limit" in str(e):
+            raise HTTPException(status_code=429, detail=str(e))
+        else:
+            raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+
+
+@router.get("/reviews/batch/{batch_id}", response_model=BatchStatusResponse)
+async def get_batch_review(
+    batch_id: str,
+    current_user: Optional[UserResponse] = Depends(optional_auth)
+):
+    """
+    Get aggregate and per-file status of a batch submission
+    """
+    try:
+        batch = await review_service.get_batch(
+            batch_id,
+            user_id=current_user.id if current_user else None
+        )
+        
+        if not batch:
+            raise HTTPException(status_code=404, detail="Batch not found")
+        
+        return batch
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+
+
+@router.post("/reviews/{review_id}/diff", response_model=ReviewResponse)
+async def submit_diff_review(
+    review_id: str,
+    submission: DiffSubmission,
+    request: Request,
+    current_user: Optional[UserResponse] = Depends(optional_auth)
+):
+    """
+    Re-review a new version of previously reviewed code (unified diff or full code).
+    Only the changed regions are sent to the AI; prior findings that still apply are kept.
+    """
+    try:
+        client_ip = get_client_ip(request)
+        new_review_id = await review_service.submit_diff_review(
+            review_id,
+            submission,
+            client_ip,
+            user_id=current_user.id if current_user else None,
+            user_email=current_user.email if current_user else None
+        )
+        
+        if not new_review_id:
+            raise HTTPException(status_code=404, detail="Review not found")
+        
         return ReviewResponse(
-            id=review_id,
+            id=new_review_id,
             status=ReviewStatus.PENDING,
-            message="Code submitted for review. Use the ID to check status."
+            message="Changes submitted for review. Use the ID to check status."
         )
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         if "Rate limit" in str(e):
             raise HTTPException(status_code=429, detail=str(e))
@@ -52,13 +152,22 @@ async def submit_code_review(
 @router.get("/reviews/{review_id}", response_model=Review)
 async def get_review(
     review_id: str,
+    wait: float = Query(
+        0, ge=0, le=settings.REVIEW_LONG_POLL_MAX_SECONDS,
+        description="Seconds to hold the request while the review is pending or in progress"
+    ),
     current_user: Optional[UserResponse] = Depends(optional_auth)
 ):
     """
-    Get specific review by ID
+    Get specific review by ID. With wait, responds as soon as the review
+    finishes (long poll) or when wait seconds have passed.
     """
     try:
-        review = await review_service.get_review(review_id)
+        review = await review_service.get_review(
+            review_id,
+            wait=wait,
+            user_id=current_user.id if current_user else None
+        )
         
         if not review:
             raise HTTPException(status_code=404, detail="Review not found")
@@ -74,6 +183,61 @@ async def get_review(
         raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
 
 
+@router.get("/reviews/{review_id}/events")
+async def stream_review_events(
+    review_id: str,
+    current_user: Optional[UserResponse] = Depends(optional_auth)
+):
+    """
+    Server-Sent Events for a review: the current status, then each status change,
+    streamed section and the final feedback, instead of polling GET /reviews/{id}
+    """
+    try:
+        events = await review_service.watch_review(
+            review_id,
+            user_id=current_user.id if current_user else None
+        )
+        
+        if events is None:
+            raise HTTPException(status_code=404, detail="Review not found")
+        
+        return StreamingResponse(
+            events,
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+
+
+@router.get("/reviews/{review_id}/partial", response_model=PartialReviewResponse)
+async def get_partial_review(
+    review_id: str,
+    current_user: Optional[UserResponse] = Depends(optional_auth)
+):
+    """
+    Get feedback sections streamed so far for a review in progress
+    """
+    try:
+        review = await review_service.get_partial_review(
+            review_id,
+            user_id=current_user.id if current_user else None
+        )
+        
+        if not review:
+            raise HTTPException(status_code=404, detail="Review not found")
+        
+        return review
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+
+
 @router.get("/reviews", response_model=ReviewListResponse)
 async def list_reviews(
     page: int = Query(1, ge=1, description="Page number"),
@@ -6,6 +6,121 @@ class Settings(BaseSettings):
     MONGODB_URI: str = os.getenv("MONGODB_URI", "mongodb://localhost:27017/codereviewer")
     
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+    OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
+    OPENAI_PRICE_INPUT_PER_1M: float = float(os.getenv("OPENAI_PRICE_INPUT_PER_1M", "0.40"))
+    OPENAI_PRICE_CACHED_INPUT_PER_1M: float = float(os.getenv("OPENAI_PRICE_CACHED_INPUT_PER_1M", "0.10"))
+    OPENAI_PRICE_OUTPUT_PER_1M: float = float(os.getenv("OPENAI_PRICE_OUTPUT_PER_1M", "1.60"))
+    OPENAI_BATCH_DISCOUNT: float = float(os.getenv("OPENAI_BATCH_DISCOUNT", "0.5"))
+    
+    OPENAI_HTTP2: bool = os.getenv("OPENAI_HTTP2", "true").lower() == "true"
+    OPENAI_MAX_CONNECTIONS: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    OPENAI_KEEPALIVE_EXPIRY: float = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "60"))
+    OPENAI_TIMEOUT: float = float(os.getenv("OPENAI_TIMEOUT", "60"))
+    # JSON list of {"name", "base_url", "api_key", "model"}; empty uses OPENAI_BASE_URL only
+    OPENAI_BACKENDS: str = os.getenv("OPENAI_BACKENDS", "")
+    ROUTER_EWMA_ALPHA: float = float(os.getenv("ROUTER_EWMA_ALPHA", "0.3"))
+    ROUTER_MIN_SAMPLES: int = int(os.getenv("ROUTER_MIN_SAMPLES", "5"))
+    ROUTER_EJECT_CONSECUTIVE_ERRORS: int = int(os.getenv("ROUTER_EJECT_CONSECUTIVE_ERRORS", "3"))
+    ROUTER_EJECT_LATENCY_FACTOR: float = float(os.getenv("ROUTER_EJECT_LATENCY_FACTOR", "3.0"))
+    ROUTER_EJECT_BASE_SECONDS: float = float(os.getenv("ROUTER_EJECT_BASE_SECONDS", "30"))
+    ROUTER_EJECT_MAX_SECONDS: float = float(os.getenv("ROUTER_EJECT_MAX_SECONDS", "300"))
+    OPENAI_STREAMING: bool = os.getenv("OPENAI_STREAMING", "true").lower() == "true"
+    
+    AI_MAX_RETRIES: int = int(os.getenv("AI_MAX_RETRIES", "3"))
+    AI_RETRY_BASE_DELAY: float = float(os.getenv("AI_RETRY_BASE_DELAY", "0.5"))
+    AI_RETRY_MAX_DELAY: float = float(os.getenv("AI_RETRY_MAX_DELAY", "20"))
+    AI_CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("AI_CIRCUIT_FAILURE_THRESHOLD", "5"))
+    AI_CIRCUIT_RECOVERY_SECONDS: float = float(os.getenv("AI_CIRCUIT_RECOVERY_SECONDS", "30"))
+    AI_CIRCUIT_MAX_DEFERRALS: int = int(os.getenv("AI_CIRCUIT_MAX_DEFERRALS", "3"))
+    AI_CONCURRENCY_INITIAL: int = int(os.getenv("AI_CONCURRENCY_INITIAL", "8"))
+    AI_CONCURRENCY_MIN: int = int(os.getenv("AI_CONCURRENCY_MIN", "1"))
+    AI_CONCURRENCY_MAX: int = int(os.getenv("AI_CONCURRENCY_MAX", "64"))
+    AI_CONCURRENCY_BACKOFF: float = float(os.getenv("AI_CONCURRENCY_BACKOFF", "0.5"))
+    AI_CONCURRENCY_LATENCY_TOLERANCE: float = float(os.getenv("AI_CONCURRENCY_LATENCY_TOLERANCE", "3.0"))
+    # Cluster-wide budget per backend shared through Redis; 0 disables the dimension
+    AI_BUDGET_RPM: int = int(os.getenv("AI_BUDGET_RPM", "0"))
+    AI_BUDGET_TPM: int = int(os.getenv("AI_BUDGET_TPM", "0"))
+    AI_BUDGET_PREFETCH_REQUESTS: int = int(os.getenv("AI_BUDGET_PREFETCH_REQUESTS", "5"))
+    AI_BUDGET_MAX_WAIT: float = float(os.getenv("AI_BUDGET_MAX_WAIT", "30"))
+    
+    BATCH_ENABLED: bool = os.getenv("BATCH_ENABLED", "true").lower() == "true"
+    BATCH_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("BATCH_FLUSH_INTERVAL_SECONDS", "60"))
+    BATCH_MIN_REQUESTS: int = int(os.getenv("BATCH_MIN_REQUESTS", "50"))
+    BATCH_MAX_REQUESTS: int = int(os.getenv("BATCH_MAX_REQUESTS", "5000"))
+    BATCH_MAX_WAIT_SECONDS: float = float(os.getenv("BATCH_MAX_WAIT_SECONDS", "900"))
+    BATCH_COMPLETION_WINDOW: str = os.getenv("BATCH_COMPLETION_WINDOW", "24h")
+    
+    MAX_CODE_LENGTH: int = int(os.getenv("MAX_CODE_LENGTH", "100000"))
+    MAX_BATCH_FILES: int = int(os.getenv("MAX_BATCH_FILES", "100"))
+    MAX_BATCH_CODE_LENGTH: int = int(os.getenv("MAX_BATCH_CODE_LENGTH", "2000000"))
+    # Files of a bulk submission that count as one request against RATE_LIMIT_PER_HOUR
+    BATCH_FILES_PER_REQUEST: int = int(os.getenv("BATCH_FILES_PER_REQUEST", "10"))
+    LARGE_SUBMISSION_THRESHOLD: int = int(os.getenv("LARGE_SUBMISSION_THRESHOLD", "8000"))
+    CHUNK_MAX_CHARS: int = int(os.getenv("CHUNK_MAX_CHARS", "6000"))
+    CHUNK_REVIEW_CONCURRENCY: int = int(os.getenv("CHUNK_REVIEW_CONCURRENCY", "4"))
+    
+    MAX_PROMPT_TOKENS: int = int(os.getenv("MAX_PROMPT_TOKENS", "12000"))
+    COMPLETION_TOKENS_MIN: int = int(os.getenv("COMPLETION_TOKENS_MIN", "400"))
+    COMPLETION_TOKENS_MAX: int = int(os.getenv("COMPLETION_TOKENS_MAX", "2000"))
+    COMPLETION_TOKENS_PER_PROMPT_TOKEN: float = float(os.getenv("COMPLETION_TOKENS_PER_PROMPT_TOKEN", "0.6"))
+    
+    UNIT_CACHE_ENABLED: bool = os.getenv("UNIT_CACHE_ENABLED", "true").lower() == "true"
+    UNIT_MIN_CHARS: int = int(os.getenv("UNIT_MIN_CHARS", "300"))
+    
+    DIFF_CONTEXT_LINES: int = int(os.getenv("DIFF_CONTEXT_LINES", "3"))
+    DIFF_MAX_CHANGED_RATIO: float = float(os.getenv("DIFF_MAX_CHANGED_RATIO", "0.5"))
+
+    STATIC_ANALYSIS_ENABLED: bool = os.getenv("STATIC_ANALYSIS_ENABLED", "true").lower() == "true"
+    STATIC_ANALYSIS_WORKERS: int = int(os.getenv("STATIC_ANALYSIS_WORKERS", "2"))
+    STATIC_ANALYSIS_TIMEOUT: float = float(os.getenv("STATIC_ANALYSIS_TIMEOUT", "5"))
+    # Python version submissions are written for; a parser older than this cannot rule code out
+    STATIC_ANALYSIS_PYTHON_VERSION: str = os.getenv("STATIC_ANALYSIS_PYTHON_VERSION", "3.14")
+
+    NEAR_DUPLICATE_ENABLED: bool = os.getenv("NEAR_DUPLICATE_ENABLED", "true").lower() == "true"
+    NEAR_DUPLICATE_THRESHOLD: float = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.9"))
+    NEAR_DUPLICATE_MIN_TOKENS: int = int(os.getenv("NEAR_DUPLICATE_MIN_TOKENS", "40"))
+    NEAR_DUPLICATE_MAX_CHARS: int = int(os.getenv("NEAR_DUPLICATE_MAX_CHARS", "20000"))
+    MINHASH_NUM_PERM: int = int(os.getenv("MINHASH_NUM_PERM", "64"))
+    MINHASH_BANDS: int = int(os.getenv("MINHASH_BANDS", "16"))
+
+    REVIEW_QUEUE_ENABLED: bool = os.getenv("REVIEW_QUEUE_ENABLED", "true").lower() == "true"
+    # Consumers run inside each API process; set 0 when `python -m app.worker` does the reviews
+    REVIEW_API_WORKER_CONCURRENCY: int = int(os.getenv("REVIEW_API_WORKER_CONCURRENCY", "4"))
+    REVIEW_WORKER_CONCURRENCY: int = int(os.getenv("REVIEW_WORKER_CONCURRENCY", "8"))
+    REVIEW_QUEUE_BLOCK_MS: int = int(os.getenv("REVIEW_QUEUE_BLOCK_MS", "2000"))
+    REVIEW_QUEUE_CLAIM_IDLE_SECONDS: float = float(os.getenv("REVIEW_QUEUE_CLAIM_IDLE_SECONDS", "300"))
+    REVIEW_QUEUE_CLAIM_INTERVAL_SECONDS: float = float(os.getenv("REVIEW_QUEUE_CLAIM_INTERVAL_SECONDS", "30"))
+    REVIEW_QUEUE_MAX_DELIVERIES: int = int(os.getenv("REVIEW_QUEUE_MAX_DELIVERIES", "3"))
+    REVIEW_QUEUE_MAXLEN: int = int(os.getenv("REVIEW_QUEUE_MAXLEN", "100000"))
+
+    # Fair-share scheduling of queued reviews across users/IPs and priority classes
+    REVIEW_SCHEDULER_ENABLED: bool = os.getenv("REVIEW_SCHEDULER_ENABLED", "true").lower() == "true"
+    REVIEW_SCHEDULER_INTERACTIVE_WEIGHT: float = float(os.getenv("REVIEW_SCHEDULER_INTERACTIVE_WEIGHT", "8"))
+    REVIEW_SCHEDULER_BULK_WEIGHT: float = float(os.getenv("REVIEW_SCHEDULER_BULK_WEIGHT", "1"))
+    # A waiting review gains one class weight of priority per this many seconds
+    REVIEW_SCHEDULER_AGING_SECONDS: float = float(os.getenv("REVIEW_SCHEDULER_AGING_SECONDS", "30"))
+    # Interactive submissions beyond this many waiting per user/IP are queued as bulk (0 disables)
+    REVIEW_SCHEDULER_BULK_THRESHOLD: int = int(os.getenv("REVIEW_SCHEDULER_BULK_THRESHOLD", "5"))
+    REVIEW_SCHEDULER_USER_WEIGHT: float = float(os.getenv("REVIEW_SCHEDULER_USER_WEIGHT", "1"))
+    REVIEW_SCHEDULER_IP_WEIGHT: float = float(os.getenv("REVIEW_SCHEDULER_IP_WEIGHT", "1"))
+    # Code length counted as one unit of work when charging a user/IP for a review
+    REVIEW_SCHEDULER_COST_CHARS: int = int(os.getenv("REVIEW_SCHEDULER_COST_CHARS", "4000"))
+    # Reviews released to the stream ahead of free consumers; the rest wait in fair order
+    REVIEW_SCHEDULER_READY_DEPTH: int = int(os.getenv("REVIEW_SCHEDULER_READY_DEPTH", "1"))
+
+    # Server-sent review events (GET /reviews/{id}/events)
+    REVIEW_EVENTS_KEEPALIVE_SECONDS: float = float(os.getenv("REVIEW_EVENTS_KEEPALIVE_SECONDS", "15"))
+    REVIEW_EVENTS_MAX_SECONDS: float = float(os.getenv("REVIEW_EVENTS_MAX_SECONDS", "900"))
+    # Status polling interval when Redis pub/sub is unavailable (Upstash REST)
+    REVIEW_EVENTS_POLL_SECONDS: float = float(os.getenv("REVIEW_EVENTS_POLL_SECONDS", "2"))
+    # Longest GET /reviews/{id}?wait=... may hold a request open
+    REVIEW_LONG_POLL_MAX_SECONDS: float = float(os.getenv("REVIEW_LONG_POLL_MAX_SECONDS", "60"))
+
+    SINGLE_FLIGHT_LEASE_SECONDS: int = int(os.getenv("SINGLE_FLIGHT_LEASE_SECONDS", "90"))
+    SINGLE_FLIGHT_WAIT_SECONDS: float = float(os.getenv("SINGLE_FLIGHT_WAIT_SECONDS", "90"))
+    SINGLE_FLIGHT_POLL_INTERVAL: float = float(os.getenv("SINGLE_FLIGHT_POLL_INTERVAL", "0.25"))
     
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:3000")
     BACKEND_URL: str = os.getenv("BACKEND_URL", "http://localhost:8000")
@@ -20,6 +135,10 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
     
     DATABASE_NAME: str = "codereviewer"
+    # Write concern ("0", "1", "majority") for intermediate review writes: the
+    # IN_PROGRESS transition and streamed partial sections. Final results use the default.
+    MONGO_STATUS_WRITE_CONCERN: str = os.getenv("MONGO_STATUS_WRITE_CONCERN", "1")
+    MONGO_PARTIAL_WRITE_CONCERN: str = os.getenv("MONGO_PARTIAL_WRITE_CONCERN", "0")
     
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
     REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
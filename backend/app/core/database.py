@@ -1,4 +1,5 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import WriteConcern
 import asyncio
 from datetime import datetime, timedelta
 from .config import settings
@@ -65,6 +66,11 @@ async def create_indexes():
         await database.reviews.create_index([("language", 1)])
         await database.reviews.create_index([("status", 1)])
         await database.reviews.create_index([("ip_address", 1), ("created_at", -1)])
+        await database.reviews.create_index([("deferred", 1), ("status", 1), ("batch_id", 1), ("created_at", 1)])
+        await database.reviews.create_index([("submission_batch_id", 1)], sparse=True)
+        
+        await database.ai_batches.create_index([("batch_id", 1)], unique=True)
+        await database.ai_batches.create_index([("status", 1)])
         
         await database.rate_limits.create_index([("ip_address", 1)])
         await database.rate_limits.create_index([("timestamp", 1)], expireAfterSeconds=3600)
@@ -78,6 +84,11 @@ async def create_indexes():
         print(f"Error creating indexes: {e}")
 
 
+def write_concern(level: str) -> WriteConcern:
+    """Write concern from a setting value ("0", "1", "majority"), without waiting for the journal"""
+    return WriteConcern(w=int(level) if level.isdigit() else level, j=False)
+
+
 def get_database():
     """Get database instance"""
     return database
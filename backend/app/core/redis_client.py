@@ -1,7 +1,7 @@
 import redis.asyncio as redis
 import json
 import httpx
-from typing import Optional, Any
+from typing import Optional, Any, Dict, List, Tuple
 from .config import settings
 
 
@@ -79,17 +79,34 @@ class RedisClient:
             print(f"Redis GET error: {e}")
             return None
     
-    async def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
-        """Set value in Redis with optional expiration"""
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        """Get several values in one round trip (all None on error)"""
+        if not keys:
+            return []
         try:
             if self.is_upstash:
+                return await self._upstash_request("mget", *keys) or [None] * len(keys)
+            else:
+                return await self.client.mget(keys)
+        except Exception as e:
+            print(f"Redis MGET error: {e}")
+            return [None] * len(keys)
+    
+    async def set(self, key: str, value: str, ex: Optional[int] = None, nx: bool = False) -> bool:
+        """Set value in Redis with optional expiration (nx=True only sets if the key is absent)"""
+        try:
+            if self.is_upstash:
+                if nx:
+                    args = ["set", key, value] + (["EX", ex] if ex else []) + ["NX"]
+                    result = await self._upstash_request(*args)
+                    return result == "OK"
                 if ex:
                     await self._upstash_request("setex", key, ex, value)
                 else:
                     await self._upstash_request("set", key, value)
                 return True
             else:
-                return await self.client.set(key, value, ex=ex)
+                return bool(await self.client.set(key, value, ex=ex, nx=nx))
         except Exception as e:
             print(f"Redis SET error: {e}")
             return False
@@ -130,6 +147,65 @@ class RedisClient:
             print(f"Redis INCR error: {e}")
             return 0
     
+    async def incrby(self, key: str, amount: int) -> int:
+        """Increment value in Redis by amount"""
+        try:
+            if self.is_upstash:
+                return await self._upstash_request("incrby", key, amount)
+            else:
+                return await self.client.incrby(key, amount)
+        except Exception as e:
+            print(f"Redis INCRBY error: {e}")
+            return 0
+    
+    async def expire(self, key: str, seconds: int) -> bool:
+        """Set expiration of key"""
+        try:
+            if self.is_upstash:
+                return await self._upstash_request("expire", key, seconds) == 1
+            else:
+                return bool(await self.client.expire(key, seconds))
+        except Exception as e:
+            print(f"Redis EXPIRE error: {e}")
+            return False
+    
+    async def sadd(self, key: str, *members: str) -> int:
+        """Add members to a set"""
+        try:
+            if self.is_upstash:
+                return await self._upstash_request("sadd", key, *members)
+            else:
+                return await self.client.sadd(key, *members)
+        except Exception as e:
+            print(f"Redis SADD error: {e}")
+            return 0
+    
+    async def smembers(self, key: str) -> set:
+        """Get all members of a set"""
+        try:
+            if self.is_upstash:
+                result = await self._upstash_request("smembers", key)
+                return set(result or [])
+            else:
+                return set(await self.client.smembers(key))
+        except Exception as e:
+            print(f"Redis SMEMBERS error: {e}")
+            return set()
+    
+    async def sunion(self, keys: List[str]) -> set:
+        """Members of several sets in one round trip"""
+        if not keys:
+            return set()
+        try:
+            if self.is_upstash:
+                result = await self._upstash_request("sunion", *keys)
+                return set(result or [])
+            else:
+                return set(await self.client.sunion(keys))
+        except Exception as e:
+            print(f"Redis SUNION error: {e}")
+            return set()
+    
     async def ttl(self, key: str) -> int:
         """Get TTL of key"""
         try:
@@ -141,6 +217,171 @@ class RedisClient:
             print(f"Redis TTL error: {e}")
             return -1
     
+    async def eval(self, script: str, keys: list, args: list) -> Any:
+        """Run a Lua script atomically (None on error)"""
+        try:
+            if self.is_upstash:
+                return await self._upstash_request("eval", script, len(keys), *keys, *args)
+            else:
+                return await self.client.eval(script, len(keys), *keys, *args)
+        except Exception as e:
+            print(f"Redis EVAL error: {e}")
+            return None
+    
+    async def publish(self, channel: str, message: str) -> int:
+        """Publish a message; returns the number of subscribers that received it"""
+        try:
+            if self.is_upstash:
+                return await self._upstash_request("publish", channel, message) or 0
+            else:
+                return await self.client.publish(channel, message)
+        except Exception as e:
+            print(f"Redis PUBLISH error: {e}")
+            return 0
+    
+    def pubsub(self):
+        """Subscription connection, or None over Upstash REST (no long-lived subscriptions)"""
+        if self.is_upstash or self.client is None:
+            return None
+        return self.client.pubsub()
+    
+    @staticmethod
+    def _stream_entries(entries) -> List[Tuple[str, Dict[str, str]]]:
+        """Normalize stream entries ([id, [k, v, ...]] over REST, (id, dict) locally)"""
+        normalized = []
+        for entry_id, fields in entries or []:
+            if isinstance(fields, list):
+                fields = dict(zip(fields[::2], fields[1::2]))
+            normalized.append((entry_id, fields or {}))
+        return normalized
+    
+    async def xadd(self, stream: str, fields: Dict[str, Any], maxlen: Optional[int] = None) -> Optional[str]:
+        """Append an entry to a stream (approximately trimmed to maxlen)"""
+        try:
+            if self.is_upstash:
+                trim = ["MAXLEN", "~", maxlen] if maxlen else []
+                args = [item for pair in fields.items() for item in pair]
+                return await self._upstash_request("xadd", stream, *trim, "*", *args)
+            else:
+                return await self.client.xadd(stream, fields, maxlen=maxlen, approximate=True)
+        except Exception as e:
+            print(f"Redis XADD error: {e}")
+            return None
+    
+    async def xgroup_create(self, stream: str, group: str, id: str = "0") -> bool:
+        """Create a consumer group (and the stream); an existing group counts as success"""
+        try:
+            if self.is_upstash:
+                await self._upstash_request("xgroup", "create", stream, group, id, "MKSTREAM")
+            else:
+                await self.client.xgroup_create(stream, group, id=id, mkstream=True)
+            return True
+        except Exception as e:
+            if "BUSYGROUP" in str(e):
+                return True
+            print(f"Redis XGROUP CREATE error: {e}")
+            return False
+    
+    async def xreadgroup(
+        self, group: str, consumer: str, stream: str, id: str = ">", count: int = 1, block_ms: Optional[int] = None
+    ) -> List[Tuple[str, Dict[str, str]]]:
+        """Read entries for a consumer (">" = new entries, "0" = its own pending ones)"""
+        try:
+            if self.is_upstash:
+                # The REST API cannot hold a request open, so no BLOCK
+                result = await self._upstash_request("xreadgroup", "GROUP", group, consumer, "COUNT", count, "STREAMS", stream, id)
+            else:
+                result = await self.client.xreadgroup(group, consumer, {stream: id}, count=count, block=block_ms)
+            return self._stream_entries(result[0][1]) if result else []
+        except Exception as e:
+            print(f"Redis XREADGROUP error: {e}")
+            return []
+    
+    async def xack(self, stream: str, group: str, *ids: str) -> int:
+        """Acknowledge processed entries"""
+        try:
+            if self.is_upstash:
+                return await self._upstash_request("xack", stream, group, *ids)
+            else:
+                return await self.client.xack(stream, group, *ids)
+        except Exception as e:
+            print(f"Redis XACK error: {e}")
+            return 0
+    
+    async def xdel(self, stream: str, *ids: str) -> int:
+        """Remove entries from a stream"""
+        try:
+            if self.is_upstash:
+                return await self._upstash_request("xdel", stream, *ids)
+            else:
+                return await self.client.xdel(stream, *ids)
+        except Exception as e:
+            print(f"Redis XDEL error: {e}")
+            return 0
+    
+    async def xclaim_justid(self, stream: str, group: str, consumer: str, *ids: str) -> int:
+        """Reset the idle time of pending entries owned by consumer (delivery counts unchanged)"""
+        try:
+            if self.is_upstash:
+                result = await self._upstash_request("xclaim", stream, group, consumer, 0, *ids, "JUSTID")
+            else:
+                result = await self.client.xclaim(stream, group, consumer, 0, list(ids), justid=True)
+            return len(result or [])
+        except Exception as e:
+            print(f"Redis XCLAIM error: {e}")
+            return 0
+    
+    async def xautoclaim(
+        self, stream: str, group: str, consumer: str, min_idle_ms: int, start_id: str = "0-0", count: int = 10
+    ) -> Tuple[str, List[Tuple[str, Dict[str, str]]]]:
+        """Take over entries pending longer than min_idle_ms; returns the next start id and the entries"""
+        try:
+            if self.is_upstash:
+                result = await self._upstash_request("xautoclaim", stream, group, consumer, min_idle_ms, start_id, "COUNT", count)
+            else:
+                result = await self.client.xautoclaim(stream, group, consumer, min_idle_ms, start_id=start_id, count=count)
+            return result[0], self._stream_entries(result[1])
+        except Exception as e:
+            print(f"Redis XAUTOCLAIM error: {e}")
+            return "0-0", []
+    
+    async def xpending_count(self, stream: str, group: str, entry_id: str) -> int:
+        """Times an entry has been delivered (0 if it is not pending)"""
+        try:
+            if self.is_upstash:
+                result = await self._upstash_request("xpending", stream, group, entry_id, entry_id, 1)
+                return int(result[0][3]) if result else 0
+            else:
+                result = await self.client.xpending_range(stream, group, min=entry_id, max=entry_id, count=1)
+                return int(result[0]["times_delivered"]) if result else 0
+        except Exception as e:
+            print(f"Redis XPENDING error: {e}")
+            return 0
+    
+    async def xpending_total(self, stream: str, group: str) -> int:
+        """Entries delivered but not yet acknowledged"""
+        try:
+            if self.is_upstash:
+                result = await self._upstash_request("xpending", stream, group)
+                return int(result[0]) if result else 0
+            else:
+                result = await self.client.xpending(stream, group)
+                return int(result["pending"]) if result else 0
+        except Exception as e:
+            print(f"Redis XPENDING error: {e}")
+            return 0
+    
+    async def xlen(self, stream: str) -> int:
+        """Number of entries in a stream"""
+        try:
+            if self.is_upstash:
+                return await self._upstash_request("xlen", stream) or 0
+            else:
+                return await self.client.xlen(stream)
+        except Exception as e:
+            print(f"Redis XLEN error: {e}")
+            return 0
+    
     async def keys(self, pattern: str = "*") -> list:
         """Get keys matching pattern (use with caution in production)"""
         try:
@@ -1,8 +1,10 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, root_validator
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
 
+from ..core.config import settings
+
 
 class ReviewStatus(str, Enum):
     PENDING = "pending"
@@ -11,6 +13,11 @@ class ReviewStatus(str, Enum):
     FAILED = "failed"
 
 
+class ReviewPriority(str, Enum):
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
+
+
 class ProgrammingLanguage(str, Enum):
     PYTHON = "python"
     JAVASCRIPT = "javascript"
@@ -26,11 +33,43 @@ class ProgrammingLanguage(str, Enum):
 
 
 class CodeSubmission(BaseModel):
-    code: str = Field(..., min_length=1, max_length=10000, description="Code to be reviewed")
+    code: str = Field(..., min_length=1, max_length=settings.MAX_CODE_LENGTH, description="Code to be reviewed")
+    language: ProgrammingLanguage = Field(..., description="Programming language")
+    description: Optional[str] = Field(None, max_length=500, description="Optional code description")
+    deferred: bool = Field(default=False, description="Review through the Batch API (cheaper, results may take hours)")
+    priority: ReviewPriority = Field(default=ReviewPriority.INTERACTIVE, description="Scheduling class: interactive, or bulk for large batches")
+
+
+class BatchFile(BaseModel):
+    path: Optional[str] = Field(None, max_length=500, description="File path, echoed back in the batch status")
+    code: str = Field(..., min_length=1, max_length=settings.MAX_CODE_LENGTH, description="Code to be reviewed")
     language: ProgrammingLanguage = Field(..., description="Programming language")
     description: Optional[str] = Field(None, max_length=500, description="Optional code description")
 
 
+class BatchSubmission(BaseModel):
+    files: List[BatchFile] = Field(..., min_items=1, max_items=settings.MAX_BATCH_FILES, description="Files to review")
+    priority: ReviewPriority = Field(default=ReviewPriority.BULK, description="Scheduling class for the reviews in this batch")
+    
+    @root_validator(skip_on_failure=True)
+    def check_total_size(cls, values):
+        if sum(len(item.code) for item in values.get("files", [])) > settings.MAX_BATCH_CODE_LENGTH:
+            raise ValueError(f"The batch exceeds {settings.MAX_BATCH_CODE_LENGTH} characters of code in total")
+        return values
+
+
+class DiffSubmission(BaseModel):
+    diff: Optional[str] = Field(None, min_length=1, max_length=settings.MAX_CODE_LENGTH, description="Unified diff against the reviewed code")
+    code: Optional[str] = Field(None, min_length=1, max_length=settings.MAX_CODE_LENGTH, description="New version of the reviewed code")
+    description: Optional[str] = Field(None, max_length=500, description="Optional code description (defaults to the prior review's)")
+    
+    @root_validator(skip_on_failure=True)
+    def check_diff_or_code(cls, values):
+        if bool(values.get("diff")) == bool(values.get("code")):
+            raise ValueError("Provide exactly one of 'diff' or 'code'")
+        return values
+
+
 class ReviewFeedback(BaseModel):
     quality_score: int = Field(..., ge=1, le=10, description="Quality score (1-10)")
     issues: List[str] = Field(default=[], description="Identified issues")
@@ -39,6 +78,9 @@ class ReviewFeedback(BaseModel):
     performance_recommendations: List[str] = Field(default=[], description="Performance recommendations")
     positive_aspects: List[str] = Field(default=[], description="Positive aspects of the code")
     cost_info: Optional[Dict[str, Any]] = Field(default=None, description="Cost information of the request")
+    approximate: bool = Field(default=False, description="Served from the review of a near-duplicate submission")
+    similarity: Optional[float] = Field(default=None, description="Estimated similarity to the reused submission")
+    static_analysis: Optional[Dict[str, Any]] = Field(default=None, description="Local static analysis metrics")
 
 
 class Review(BaseModel):
@@ -48,6 +90,7 @@ class Review(BaseModel):
     description: Optional[str] = Field(None, description="Optional code description")
     status: ReviewStatus = Field(default=ReviewStatus.PENDING, description="Review status")
     feedback: Optional[ReviewFeedback] = Field(None, description="AI feedback")
+    partial_feedback: Optional[Dict[str, Any]] = Field(None, description="Feedback sections streamed so far, while the review is in progress")
     created_at: datetime = Field(default_factory=datetime.utcnow, description="Creation date")
     completed_at: Optional[datetime] = Field(None, description="Completion date")
     ip_address: Optional[str] = Field(None, description="Client IP address")
@@ -55,6 +98,12 @@ class Review(BaseModel):
     user_email: Optional[str] = Field(None, description="User email for quick reference")
     processing_time: Optional[float] = Field(None, description="Processing time in seconds")
     error_message: Optional[str] = Field(None, description="Error message if failed")
+    deferred: bool = Field(default=False, description="Processed through the Batch API")
+    batch_id: Optional[str] = Field(None, description="Batch API job processing this review")
+    parent_review_id: Optional[str] = Field(None, description="Prior review this one re-reviews the changes of")
+    priority: ReviewPriority = Field(default=ReviewPriority.INTERACTIVE, description="Requested scheduling class")
+    submission_batch_id: Optional[str] = Field(None, description="Bulk submission this review belongs to")
+    path: Optional[str] = Field(None, description="File path given in a bulk submission")
 
     class Config:
         json_schema_extra = {
@@ -71,6 +120,33 @@ class ReviewResponse(BaseModel):
     id: str = Field(..., description="Unique review ID")
     status: ReviewStatus = Field(..., description="Current status")
     message: str = Field(..., description="Response message")
+    feedback: Optional[ReviewFeedback] = Field(None, description="Feedback, when the review was answered from the cache at submission")
+
+
+class BatchReviewItem(BaseModel):
+    id: str = Field(..., description="Review ID")
+    path: Optional[str] = Field(None, description="File path given in the submission")
+    status: ReviewStatus = Field(..., description="Current status")
+
+
+class BatchStatusResponse(BaseModel):
+    batch_id: str = Field(..., description="Unique batch ID")
+    status: ReviewStatus = Field(..., description="Aggregate status: completed once every review has finished")
+    total: int = Field(..., description="Number of files in the batch")
+    pending: int = Field(default=0, description="Reviews waiting for a worker")
+    in_progress: int = Field(default=0, description="Reviews being processed")
+    completed: int = Field(default=0, description="Completed reviews")
+    failed: int = Field(default=0, description="Failed reviews")
+    cache_hits: int = Field(default=0, description="Reviews answered from the cache at submission")
+    reviews: List[BatchReviewItem] = Field(default=[], description="Per-file review status")
+    created_at: Optional[datetime] = Field(None, description="Submission date")
+
+
+class PartialReviewResponse(BaseModel):
+    id: str = Field(..., description="Unique review ID")
+    status: ReviewStatus = Field(..., description="Current status")
+    sections: Dict[str, Any] = Field(default={}, description="Feedback sections available so far")
+    feedback: Optional[ReviewFeedback] = Field(None, description="Final feedback once completed")
 
 
 class ReviewListResponse(BaseModel):
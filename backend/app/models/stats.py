@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
@@ -20,6 +20,16 @@ class CommonIssue(BaseModel):
     count: int = Field(..., description="Frequency of the issue")
 
 
+class CostBreakdown(BaseModel):
+    key: str = Field(..., description="Language, date (YYYY-MM-DD) or user id")
+    reviews: int = Field(..., description="Number of reviews")
+    prompt_tokens: int = Field(default=0, description="Prompt tokens billed")
+    completion_tokens: int = Field(default=0, description="Completion tokens billed")
+    cached_tokens: int = Field(default=0, description="Prompt tokens served from the provider prefix cache")
+    cost_usd: float = Field(default=0.0, description="Computed cost in USD")
+    avg_upstream_latency_ms: Optional[float] = Field(default=None, description="Average AI provider latency, excluding reviews served from cache")
+
+
 class StatsResponse(BaseModel):
     total_reviews: int = Field(..., description="Total number of reviews")
     total_completed: int = Field(..., description="Total number of completed reviews")
@@ -35,6 +45,17 @@ class StatsResponse(BaseModel):
 
     score_distribution: Dict[str, int] = Field(default={}, description="Score distribution")
 
+    total_cost_usd: float = Field(default=0.0, description="Total computed AI cost in USD")
+    total_prompt_tokens: int = Field(default=0, description="Total prompt tokens")
+    total_completion_tokens: int = Field(default=0, description="Total completion tokens")
+    total_cached_tokens: int = Field(default=0, description="Total prompt tokens served from the prefix cache")
+    average_upstream_latency_ms: float = Field(default=0.0, description="Average upstream AI call latency")
+    cache_served_reviews: int = Field(default=0, description="Reviews served from the review cache")
+
+    cost_by_language: List[CostBreakdown] = Field(default=[], description="Cost and tokens per language")
+    cost_by_day: List[CostBreakdown] = Field(default=[], description="Cost and tokens per day for the last 30 days")
+    cost_by_user: List[CostBreakdown] = Field(default=[], description="Top users by cost (system statistics only)")
+
 
 class ExportRequest(BaseModel):
     start_date: datetime = Field(..., description="Start date")
@@ -0,0 +1,200 @@
+import json
+import random
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+from ..core.config import settings
+from ..utils.adaptive_limiter import AdaptiveConcurrencyLimiter
+from .upstream_budget import UpstreamBudget
+
+
+class AIBackend:
+    """
+    One OpenAI-compatible endpoint with its latency and error statistics
+    """
+
+    def __init__(self, name: str, base_url: str, api_key: str, model: str, rpm: int = 0, tpm: int = 0):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.model = model
+        self.limiter = AdaptiveConcurrencyLimiter(name=f"AI backend {name}")
+        self.budget = UpstreamBudget(name, rpm=rpm, tpm=tpm)
+
+        self.ewma_latency: Optional[float] = None
+        self.ewma_error_rate = 0.0
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.times_ejected = 0
+        self.samples = 0
+
+        self.requests = 0
+        self.errors = 0
+        self.selected = 0
+
+    @property
+    def ejected(self) -> bool:
+        return time.monotonic() < self.ejected_until
+
+    def score(self) -> float:
+        """
+        Expected cost of sending the next request here (lower is better).
+        Backends without samples score 0 so they get measured first; calls queued
+        behind the concurrency limit count as in flight.
+        """
+        if self.ewma_latency is None:
+            return 0.0
+        return self.ewma_latency * (1 + self.in_flight + self.limiter.waiting) / max(1.0 - self.ewma_error_rate, 0.05)
+
+    def headers(self) -> dict:
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "base_url": self.base_url,
+            "model": self.model,
+            "ewma_latency_ms": round(self.ewma_latency * 1000, 1) if self.ewma_latency is not None else None,
+            "ewma_error_rate": round(self.ewma_error_rate, 4),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "errors": self.errors,
+            "selected": self.selected,
+            "ejected": self.ejected,
+            "ejected_for_seconds": round(max(0.0, self.ejected_until - time.monotonic()), 1),
+            "times_ejected": self.times_ejected,
+            "concurrency": self.limiter.snapshot()
+        }
+
+
+def load_backends() -> List[AIBackend]:
+    """
+    Backends from OPENAI_BACKENDS (JSON list of {name, base_url, api_key, model, rpm, tpm}),
+    falling back to the single OPENAI_BASE_URL endpoint
+    """
+    if not settings.OPENAI_BACKENDS:
+        return [AIBackend(
+            "default", settings.OPENAI_BASE_URL, settings.OPENAI_API_KEY, settings.OPENAI_MODEL,
+            rpm=settings.AI_BUDGET_RPM, tpm=settings.AI_BUDGET_TPM
+        )]
+
+    backends = []
+    for index, entry in enumerate(json.loads(settings.OPENAI_BACKENDS)):
+        backends.append(AIBackend(
+            name=entry.get("name") or f"backend-{index}",
+            base_url=entry["base_url"],
+            api_key=entry.get("api_key", settings.OPENAI_API_KEY),
+            model=entry.get("model", settings.OPENAI_MODEL),
+            rpm=int(entry.get("rpm", settings.AI_BUDGET_RPM)),
+            tpm=int(entry.get("tpm", settings.AI_BUDGET_TPM))
+        ))
+
+    if not backends:
+        raise ValueError("OPENAI_BACKENDS must list at least one backend")
+    return backends
+
+
+class BackendRouter:
+    """
+    Latency-aware routing across AI backends.
+
+    Picks the better-scoring of two random healthy backends (power of two choices),
+    where the score combines the EWMA latency, EWMA error rate and in-flight calls.
+    Backends are ejected for a growing period after consecutive failures or when
+    their latency is an outlier against the others; the last healthy backend is
+    never ejected.
+    """
+
+    def __init__(self, backends: List[AIBackend]):
+        self.backends = backends
+        self.decisions = 0
+
+    @property
+    def primary(self) -> AIBackend:
+        return self.backends[0]
+
+    def has_alternative(self, backend: AIBackend) -> bool:
+        return any(other is not backend and not other.ejected for other in self.backends)
+
+    def select(self, exclude: Optional[AIBackend] = None) -> AIBackend:
+        candidates = [backend for backend in self.backends if not backend.ejected]
+        if not candidates:
+            candidates = [min(self.backends, key=lambda backend: backend.ejected_until)]
+        if exclude is not None and len(candidates) > 1:
+            candidates = [backend for backend in candidates if backend is not exclude]
+
+        if len(candidates) == 1:
+            choice = candidates[0]
+        else:
+            first, second = random.sample(candidates, 2)
+            choice = first if first.score() <= second.score() else second
+
+        choice.selected += 1
+        self.decisions += 1
+        return choice
+
+    def record(self, backend: AIBackend, latency: float, success: bool):
+        """
+        Feed the outcome of a call into the backend's statistics and eject outliers
+        """
+        alpha = settings.ROUTER_EWMA_ALPHA
+        backend.requests += 1
+        backend.samples += 1
+        backend.ewma_error_rate = (1 - alpha) * backend.ewma_error_rate + alpha * (0.0 if success else 1.0)
+
+        if success:
+            backend.consecutive_failures = 0
+            if backend.ewma_latency is None:
+                backend.ewma_latency = latency
+            else:
+                backend.ewma_latency = (1 - alpha) * backend.ewma_latency + alpha * latency
+
+            if self._is_latency_outlier(backend):
+                self._eject(backend, "latency outlier")
+        else:
+            backend.errors += 1
+            backend.consecutive_failures += 1
+            if backend.consecutive_failures >= settings.ROUTER_EJECT_CONSECUTIVE_ERRORS:
+                self._eject(backend, f"{backend.consecutive_failures} consecutive failures")
+
+    def _is_latency_outlier(self, backend: AIBackend) -> bool:
+        if backend.samples < settings.ROUTER_MIN_SAMPLES:
+            return False
+
+        others = [
+            other.ewma_latency for other in self.backends
+            if other is not backend and not other.ejected and other.ewma_latency is not None
+        ]
+        if not others:
+            return False
+
+        return backend.ewma_latency > settings.ROUTER_EJECT_LATENCY_FACTOR * statistics.median(others)
+
+    def _eject(self, backend: AIBackend, reason: str):
+        healthy = [other for other in self.backends if other is not backend and not other.ejected]
+        if not healthy or backend.ejected:
+            return
+
+        duration = min(
+            settings.ROUTER_EJECT_MAX_SECONDS,
+            settings.ROUTER_EJECT_BASE_SECONDS * (2 ** backend.times_ejected)
+        )
+        backend.times_ejected += 1
+        backend.ejected_until = time.monotonic() + duration
+        backend.consecutive_failures = 0
+        # Start fresh when it comes back so one bad window does not eject it again
+        backend.ewma_latency = None
+        backend.ewma_error_rate = 0.0
+        backend.samples = 0
+        print(f"Ejected AI backend {backend.name} for {duration:.0f}s ({reason})")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "decisions": self.decisions,
+            "backends": [backend.snapshot() for backend in self.backends]
+        }
@@ -1,21 +1,182 @@
+import asyncio
 import httpx
 import json
+import random
+import re
 import time
-from typing import Optional
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from ..core.config import settings
 from ..models.review import ReviewFeedback, ProgrammingLanguage
+from ..utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from ..utils.code_chunker import CodeChunk, split_code, split_review_units
+from ..utils.code_diff import carry_forward_entry, changed_regions, removed_identifiers, unchanged_line_map
+from ..utils.json_stream import IncrementalJSONObjectParser
+from ..utils.single_flight import SingleFlight
+from ..utils.token_estimator import estimate_message_tokens
+from .ai_router import AIBackend, BackendRouter, load_backends
 from .cache_service import cache_service
+from .prompt_cache_stats import prompt_cache_stats
+
+
+SectionCallback = Callable[[str, Any], Awaitable[None]]
+
+
+SYSTEM_PROMPT = "You are a code review expert. Analyze code and respond ONLY with valid JSON. Be direct and concise."
+
+LANGUAGE_TIPS = {
+    "python": "Focus on PEP 8, exception handling, performance and security.",
+    "javascript": "Analyze var/let/const usage, async/await, DOM manipulation and performance.",
+    "typescript": "Check typing, interfaces, generics and TypeScript best practices.",
+    "java": "Analyze OOP, exception handling, performance and design patterns.",
+    "cpp": "Focus on memory management, performance and C++ patterns.",
+    "csharp": "Analyze LINQ, async/await, garbage collection and .NET patterns.",
+    "go": "Check goroutines, channels, error handling and Go idioms.",
+    "rust": "Analyze ownership, borrowing, safety and performance.",
+    "php": "Focus on security, PSRs, performance and modern best practices.",
+    "ruby": "Analyze Ruby idioms, gems, performance and Rails patterns."
+}
+
+RESPONSE_SCHEMA = """{
+    "quality_score": 7,
+    "issues": ["specific problems found"],
+    "suggestions": ["practical improvements"],
+    "security_concerns": ["security issues"],
+    "performance_recommendations": ["performance and optimization tips"],
+    "positive_aspects": ["good practices"]
+}"""
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class UpstreamError(Exception):
+    """
+    Non-200 response from the AI provider
+    """
+    
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None):
+        self.status_code = status_code
+        self.retry_after = retry_after
+        super().__init__(f"OpenAI API error {status_code}: {message}")
+    
+    @property
+    def retryable(self) -> bool:
+        return self.status_code in RETRYABLE_STATUS_CODES
+
+
+def parse_retry_after(headers: httpx.Headers) -> Optional[float]:
+    """
+    Read the provider's retry hint in seconds (retry-after-ms, retry-after seconds or HTTP date)
+    """
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
 
 
 class AIService:
     def __init__(self):
-        self.api_key = settings.OPENAI_API_KEY
-        self.base_url = "https://api.openai.com/v1"
+        self.router = BackendRouter(load_backends())
+        # Batch API jobs and anything that needs a single endpoint use the primary backend
+        self.api_key = self.router.primary.api_key
+        self.base_url = self.router.primary.base_url
+        self.model = self.router.primary.model
+        self._client: Optional[httpx.AsyncClient] = None
+        self.single_flight = SingleFlight()
+        self.circuit_breaker = CircuitBreaker(name="openai")
+        self._prefix_cache: Dict[str, str] = {}
+    
+    def _create_client(self) -> httpx.AsyncClient:
+        """
+        Build the shared HTTP client (keep-alive pool, HTTP/2 when available)
+        """
+        limits = httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY
+        )
         
-    async def review_code(self, code: str, language: ProgrammingLanguage, description: Optional[str] = None) -> ReviewFeedback:
+        http2 = settings.OPENAI_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                print("h2 package not installed - falling back to HTTP/1.1")
+                http2 = False
+        
+        return httpx.AsyncClient(
+            http2=http2,
+            limits=limits,
+            timeout=httpx.Timeout(settings.OPENAI_TIMEOUT, connect=10.0)
+        )
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        App-lifetime HTTP client, created lazily if startup did not open it
         """
-        Review code using OpenAI GPT-5-mini via direct HTTP API with caching
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+    
+    async def start(self):
+        """
+        Open the connection pool and warm it up so the first review skips DNS/TCP/TLS setup
+        """
+        client = self.client
+        
+        for backend in self.router.backends:
+            if not backend.api_key:
+                continue
+            
+            try:
+                await client.get(
+                    f"{backend.base_url}/models",
+                    headers={"Authorization": f"Bearer {backend.api_key}"},
+                    timeout=5.0
+                )
+                print(f"OpenAI connection pool warmed up for backend {backend.name}")
+            except Exception as e:
+                print(f"OpenAI connection warm-up failed for backend {backend.name}: {e}")
+    
+    async def close(self):
+        """
+        Close the shared HTTP client and its pooled connections
+        """
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            print("OpenAI HTTP client closed")
+        self._client = None
+        
+    async def review_code(
+        self,
+        code: str,
+        language: ProgrammingLanguage,
+        description: Optional[str] = None,
+        on_section: Optional[SectionCallback] = None
+    ) -> ReviewFeedback:
+        """
+        Review code using OpenAI GPT-5-mini via direct HTTP API with caching.
+        Identical concurrent requests are coalesced into a single upstream call.
+        When on_section is given and streaming is enabled, each feedback section
+        is passed to it as soon as it has been generated.
         """
         start_time = time.time()
         
@@ -23,101 +184,626 @@ class AIService:
             cached_feedback = await cache_service.get_cached_feedback(code, language, description)
             if cached_feedback:
                 print(f"Returned cached result in {time.time() - start_time:.3f}s")
-                return cached_feedback
-            
-            print("Cache miss - calling AI service...")
-            prompt = self._build_review_prompt(code, language, description)
-                        
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}"
-            }
-            
-            payload = {
-                "model": "gpt-4.1-mini",
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are a code review expert. Analyze code and respond ONLY with valid JSON. Be direct and concise."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                "temperature": 0.2,
-                 "max_completion_tokens": 2000,
-                "response_format": {"type": "json_object"}
-            }
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=60.0
+                return self._as_cache_hit(cached_feedback)
+            
+            near_duplicate = await cache_service.get_near_duplicate_feedback(code, language, description)
+            if near_duplicate:
+                print(f"Returned near-duplicate result ({near_duplicate.similarity:.2f}) in {time.time() - start_time:.3f}s")
+                return self._as_cache_hit(near_duplicate)
+            
+            cache_key = cache_service._generate_code_hash(code, language, description)
+            called_upstream = False
+            
+            async def lead():
+                nonlocal called_upstream
+                leader_cached = await cache_service.get_cached_feedback(code, language, description, track_stats=False)
+                if leader_cached:
+                    return leader_cached
+                called_upstream = True
+                large = (
+                    len(code) > settings.LARGE_SUBMISSION_THRESHOLD
+                    or self._estimate_prompt_tokens(code, language, description) > settings.MAX_PROMPT_TOKENS
                 )
+                if settings.UNIT_CACHE_ENABLED:
+                    units = split_review_units(code, language, settings.UNIT_MIN_CHARS, settings.CHUNK_MAX_CHARS)
+                    if len(units) > 1:
+                        cached_units = await self._cached_units(units, language, description)
+                        # Per-unit calls only pay off when they reuse earlier units or the file must be
+                        # split anyway; otherwise a single streamed call is cheaper and feeds on_section
+                        if large or any(cached_units):
+                            return await self._review_incremental(code, language, description, start_time, units, cached_units)
+                if large:
+                    return await self._review_large(code, language, description, start_time)
+                return await self._review_uncached(code, language, description, start_time, on_section)
+            
+            async def fetch_shared():
+                return await cache_service.get_cached_feedback(code, language, description, track_stats=False)
+            
+            feedback = await self.single_flight.do(cache_key, lead, fetch_shared)
+            return feedback if called_upstream else self._as_cache_hit(feedback)
+            
+        except CircuitOpenError:
+            raise
+        except json.JSONDecodeError as e:
+            raise Exception(f"Error parsing AI response: {e}")
+        except Exception as e:
+            raise Exception(f"Error in code review: {e}")
+    
+    async def _review_uncached(
+        self,
+        code: str,
+        language: ProgrammingLanguage,
+        description: Optional[str],
+        start_time: float,
+        on_section: Optional[SectionCallback] = None
+    ) -> ReviewFeedback:
+        """
+        Call the AI provider and cache the resulting feedback
+        """
+        print("Cache miss - calling AI service...")
+        feedback = await self._generate_feedback(code, language, description, on_section)
+        
+        processing_time = time.time() - start_time
+        await cache_service.cache_feedback(code, language, feedback, description, processing_time)
+        
+        print(f"AI analysis completed in {processing_time:.3f}s")
+        return feedback
+    
+    async def _review_large(
+        self,
+        code: str,
+        language: ProgrammingLanguage,
+        description: Optional[str],
+        start_time: float
+    ) -> ReviewFeedback:
+        """
+        Review a large submission as language-aware chunks in parallel and merge the results
+        """
+        chunks = split_code(code, language, settings.CHUNK_MAX_CHARS)
+        if len(chunks) <= 1:
+            return await self._review_uncached(code, language, description, start_time)
+        
+        print(f"Large submission - reviewing {len(chunks)} chunks in parallel...")
+        semaphore = asyncio.Semaphore(settings.CHUNK_REVIEW_CONCURRENCY)
+        
+        async def review_chunk(chunk: CodeChunk) -> ReviewFeedback:
+            context = f"Lines {chunk.start_line}-{chunk.end_line} of a larger file."
+            chunk_description = f"{description} ({context})" if description else context
+            async with semaphore:
+                return await self._generate_feedback(chunk.text, language, chunk_description)
+        
+        results = await asyncio.gather(*[review_chunk(chunk) for chunk in chunks])
+        feedback = self._merge_feedback(chunks, results)
+        
+        processing_time = time.time() - start_time
+        await cache_service.cache_feedback(code, language, feedback, description, processing_time)
+        
+        print(f"Chunked AI analysis completed in {processing_time:.3f}s")
+        return feedback
+    
+    async def _cached_units(
+        self,
+        units: List[CodeChunk],
+        language: ProgrammingLanguage,
+        description: Optional[str]
+    ) -> List[Optional[ReviewFeedback]]:
+        return list(await asyncio.gather(*[
+            cache_service.get_cached_unit_feedback(unit.text, language, description) for unit in units
+        ]))
+    
+    async def _review_incremental(
+        self,
+        code: str,
+        language: ProgrammingLanguage,
+        description: Optional[str],
+        start_time: float,
+        units: List[CodeChunk],
+        cached: Optional[List[Optional[ReviewFeedback]]] = None
+    ) -> ReviewFeedback:
+        """
+        Review a file unit by unit (functions/classes), reusing cached per-unit feedback
+        and sending only new or changed units to the AI provider
+        """
+        if cached is None:
+            cached = await self._cached_units(units, language, description)
+        missing = [index for index, feedback in enumerate(cached) if feedback is None]
+        print(f"Incremental review - {len(units) - len(missing)}/{len(units)} units cached, reviewing {len(missing)}...")
+        
+        semaphore = asyncio.Semaphore(settings.CHUNK_REVIEW_CONCURRENCY)
+        
+        async def review_unit(unit: CodeChunk) -> ReviewFeedback:
+            context = f"Lines {unit.start_line}-{unit.end_line} of a larger file."
+            unit_description = f"{description} ({context})" if description else context
+            async with semaphore:
+                feedback = await self._generate_feedback(unit.text, language, unit_description)
+            await cache_service.cache_unit_feedback(unit.text, language, feedback, description)
+            return feedback
+        
+        fresh = await asyncio.gather(*[review_unit(units[index]) for index in missing])
+        fresh_by_index = dict(zip(missing, fresh))
+        
+        results = [
+            fresh_by_index[index] if index in fresh_by_index else self._as_cache_hit(feedback)
+            for index, feedback in enumerate(cached)
+        ]
+        feedback = self._merge_feedback(units, results)
+        feedback.cost_info = {
+            **(feedback.cost_info or {}),
+            "source": "incremental" if len(missing) < len(units) else "upstream",
+            "model": next((result.cost_info["model"] for result in results if (result.cost_info or {}).get("model")), None),
+            "units": len(units),
+            "units_cached": len(units) - len(missing)
+        }
+        
+        processing_time = time.time() - start_time
+        await cache_service.cache_feedback(code, language, feedback, description, processing_time)
+        
+        print(f"Incremental AI analysis completed in {processing_time:.3f}s")
+        return feedback
+    
+    async def review_changes(
+        self,
+        old_code: str,
+        new_code: str,
+        language: ProgrammingLanguage,
+        prior: ReviewFeedback,
+        description: Optional[str] = None
+    ) -> ReviewFeedback:
+        """
+        Review a new version of previously reviewed code by sending only the changed
+        regions (with a few lines of context) to the AI provider. Prior feedback
+        entries that do not cite changed lines or removed identifiers are carried
+        forward with their line numbers remapped.
+        """
+        start_time = time.time()
+        
+        cached_feedback = await cache_service.get_cached_feedback(new_code, language, description)
+        if cached_feedback:
+            return self._as_cache_hit(cached_feedback)
+        
+        regions = changed_regions(old_code, new_code, settings.DIFF_CONTEXT_LINES)
+        lines = new_code.split("\n")
+        excerpt_lines = sum(region.end_line - region.start_line + 1 for region in regions)
+        
+        if excerpt_lines > len(lines) * settings.DIFF_MAX_CHANGED_RATIO:
+            # review_code wraps its own errors
+            print(f"Diff review - {excerpt_lines}/{len(lines)} lines changed, reviewing the full file")
+            return await self.review_code(new_code, language, description)
+        
+        try:
+            line_map = unchanged_line_map(old_code, new_code)
+            removed = removed_identifiers(old_code, new_code)
+            
+            def carry(entries: List[str]) -> List[str]:
+                kept = [carry_forward_entry(entry, line_map, removed) for entry in entries]
+                return [entry for entry in kept if entry is not None]
+            
+            carried = ReviewFeedback(
+                quality_score=prior.quality_score,
+                issues=carry(prior.issues),
+                suggestions=carry(prior.suggestions),
+                security_concerns=carry(prior.security_concerns),
+                performance_recommendations=carry(prior.performance_recommendations),
+                positive_aspects=carry(prior.positive_aspects)
+            )
+            carried_count = sum(
+                len(getattr(carried, field)) for field in
+                ("issues", "suggestions", "security_concerns", "performance_recommendations", "positive_aspects")
+            )
+            
+            if not regions:
+                feedback = carried
+                feedback.cost_info = {**self._as_cache_hit(prior).cost_info, "source": "carried_forward"}
+            else:
+                excerpt = "\n...\n".join(
+                    "\n".join(lines[region.start_line - 1:region.end_line]) for region in regions
+                )
+                ranges = ", ".join(f"{region.start_line}-{region.end_line}" for region in regions)
+                context = f"Changed lines {ranges} of a larger file (with surrounding context); review only these excerpts."
+                diff_description = f"{description} ({context})" if description else context
                 
-                if response.status_code != 200:
-                    raise Exception(f"OpenAI API error {response.status_code}: {response.text}")
+                print(f"Diff review - sending {excerpt_lines}/{len(lines)} lines, carrying forward {carried_count} entries")
+                fresh = await self._generate_feedback(excerpt, language, diff_description)
                 
-                response_data = response.json()
-            
-            content = response_data["choices"][0]["message"]["content"]
-            feedback_data = json.loads(content)
+                unchanged_text = "\n".join(lines[index - 1] for index in line_map.values())
+                feedback = self._merge_feedback(
+                    [CodeChunk(1, len(lines), excerpt), CodeChunk(1, len(lines), unchanged_text)],
+                    [fresh, carried]
+                )
+                feedback.cost_info = {**(feedback.cost_info or {}), "source": "diff"}
             
-            feedback = self._parse_feedback(feedback_data)
+            feedback.cost_info.update({
+                "changed_regions": len(regions),
+                "reviewed_lines": excerpt_lines,
+                "total_lines": len(lines),
+                "carried_forward": carried_count
+            })
             
             processing_time = time.time() - start_time
-            await cache_service.cache_feedback(code, language, feedback, description, processing_time)
+            await cache_service.cache_feedback(new_code, language, feedback, description, processing_time)
             
-            print(f"AI analysis completed in {processing_time:.3f}s")
+            print(f"Diff AI analysis completed in {processing_time:.3f}s")
             return feedback
-            
+        
+        except CircuitOpenError:
+            raise
         except json.JSONDecodeError as e:
             raise Exception(f"Error parsing AI response: {e}")
         except Exception as e:
             raise Exception(f"Error in code review: {e}")
     
-    def _build_review_prompt(self, code: str, language: ProgrammingLanguage, description: Optional[str]) -> str:
+    async def _generate_feedback(
+        self,
+        code: str,
+        language: ProgrammingLanguage,
+        description: Optional[str],
+        on_section: Optional[SectionCallback] = None
+    ) -> ReviewFeedback:
         """
-        Build prompt for code review
+        Request feedback for a piece of code from the AI provider (no caching)
         """
+        payload, estimated_prompt_tokens = self.build_payload(code, language, description)
+        max_completion_tokens = payload["max_completion_tokens"]
+        
+        # Providers count the prompt plus max_completion_tokens against the TPM limit
+        budget_tokens = estimated_prompt_tokens + max_completion_tokens
+        
+        upstream_start = time.monotonic()
+        if on_section and settings.OPENAI_STREAMING:
+            (feedback_data, usage), backend = await self._call_with_retry(
+                lambda backend: self._complete_streaming(backend, payload, on_section), budget_tokens
+            )
+        else:
+            (feedback_data, usage), backend = await self._call_with_retry(
+                lambda backend: self._complete(backend, payload), budget_tokens
+            )
+        upstream_latency = time.monotonic() - upstream_start
+        
+        cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+        await prompt_cache_stats.record(language, usage.get("prompt_tokens") or 0, cached_tokens, upstream_latency)
         
-        language_tips = {
-            "python": "Focus on PEP 8, exception handling, performance and security.",
-            "javascript": "Analyze var/let/const usage, async/await, DOM manipulation and performance.",
-            "typescript": "Check typing, interfaces, generics and TypeScript best practices.",
-            "java": "Analyze OOP, exception handling, performance and design patterns.",
-            "cpp": "Focus on memory management, performance and C++ patterns.",
-            "csharp": "Analyze LINQ, async/await, garbage collection and .NET patterns.",
-            "go": "Check goroutines, channels, error handling and Go idioms.",
-            "rust": "Analyze ownership, borrowing, safety and performance.",
-            "php": "Focus on security, PSRs, performance and modern best practices.",
-            "ruby": "Analyze Ruby idioms, gems, performance and Rails patterns."
+        feedback = self._parse_feedback(feedback_data)
+        feedback.cost_info = {
+            "source": "upstream",
+            "model": backend.model,
+            "backend": backend.name,
+            "estimated_prompt_tokens": estimated_prompt_tokens,
+            "max_completion_tokens": max_completion_tokens,
+            "prompt_tokens": usage.get("prompt_tokens") or 0,
+            "completion_tokens": usage.get("completion_tokens") or 0,
+            "cached_tokens": cached_tokens,
+            "upstream_latency_ms": round(upstream_latency * 1000, 1),
+            "cost_usd": self.compute_cost(
+                usage.get("prompt_tokens") or 0, cached_tokens, usage.get("completion_tokens") or 0
+            )
         }
         
+        if usage.get("prompt_tokens"):
+            error = (estimated_prompt_tokens - usage["prompt_tokens"]) / usage["prompt_tokens"] * 100
+            print(f"Prompt tokens: estimated {estimated_prompt_tokens}, actual {usage['prompt_tokens']} ({error:+.1f}%)")
+        
+        return feedback
+    
+    def build_payload(self, code: str, language: ProgrammingLanguage, description: Optional[str]) -> Tuple[dict, int]:
+        """
+        Build the chat-completions request body for a review and its estimated prompt tokens
+        """
+        messages = self._build_messages(code, language, description)
+        estimated_prompt_tokens = estimate_message_tokens(messages)
+        
+        if estimated_prompt_tokens > settings.MAX_PROMPT_TOKENS:
+            raise Exception(
+                f"Submission too large for a single review: ~{estimated_prompt_tokens} prompt tokens "
+                f"(limit {settings.MAX_PROMPT_TOKENS})"
+            )
+        
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": 0.2,
+            "max_completion_tokens": self._completion_budget(estimated_prompt_tokens),
+            "response_format": {"type": "json_object"},
+            "prompt_cache_key": f"code-review:{language if isinstance(language, str) else language.value}"
+        }, estimated_prompt_tokens
+    
+    def _build_messages(self, code: str, language: ProgrammingLanguage, description: Optional[str]) -> List[dict]:
+        """
+        Build the chat-completions message list for a review
+        """
+        return [
+            {"role": "system", "content": self._build_static_prefix(language)},
+            {"role": "user", "content": self._build_review_prompt(code, language, description)}
+        ]
+    
+    def _estimate_prompt_tokens(self, code: str, language: ProgrammingLanguage, description: Optional[str]) -> int:
+        return estimate_message_tokens(self._build_messages(code, language, description))
+    
+    def _completion_budget(self, prompt_tokens: int) -> int:
+        """
+        Size max_completion_tokens to the input: small snippets get small output budgets
+        """
+        budget = settings.COMPLETION_TOKENS_MIN + int(prompt_tokens * settings.COMPLETION_TOKENS_PER_PROMPT_TOKEN)
+        return max(settings.COMPLETION_TOKENS_MIN, min(settings.COMPLETION_TOKENS_MAX, budget))
+    
+    def _merge_feedback(self, chunks: List[CodeChunk], results: List[ReviewFeedback]) -> ReviewFeedback:
+        """
+        Combine per-chunk feedback: size-weighted quality score and de-duplicated entries
+        """
+        total_size = sum(len(chunk.text) for chunk in chunks) or 1
+        weighted_score = sum(
+            feedback.quality_score * len(chunk.text) for chunk, feedback in zip(chunks, results)
+        ) / total_size
+        
+        def dedupe(entries: List[str]) -> List[str]:
+            seen = set()
+            unique = []
+            for entry in entries:
+                key = re.sub(r"[^a-z0-9]+", " ", entry.lower()).strip()
+                if key and key not in seen:
+                    seen.add(key)
+                    unique.append(entry)
+            return unique
+        
+        def collect(field: str) -> List[str]:
+            return dedupe([entry for feedback in results for entry in getattr(feedback, field)])
+        
+        cost_info = {}
+        for feedback in results:
+            for key, value in (feedback.cost_info or {}).items():
+                if key == "upstream_latency_ms":
+                    cost_info[key] = max(cost_info.get(key, 0), value or 0)
+                elif isinstance(value, (int, float)):
+                    cost_info[key] = cost_info.get(key, 0) + value
+                else:
+                    cost_info.setdefault(key, value)
+        if "cost_usd" in cost_info:
+            cost_info["cost_usd"] = round(cost_info["cost_usd"], 6)
+        
+        return ReviewFeedback(
+            quality_score=max(1, min(10, round(weighted_score))),
+            issues=collect("issues"),
+            suggestions=collect("suggestions"),
+            security_concerns=collect("security_concerns"),
+            performance_recommendations=collect("performance_recommendations"),
+            positive_aspects=collect("positive_aspects"),
+            cost_info={**cost_info, "chunks": len(chunks)} if cost_info else None
+        )
+    
+    def compute_cost(self, prompt_tokens: int, cached_tokens: int, completion_tokens: int, batch: bool = False) -> float:
+        """
+        Cost in USD of a completion; cached prompt tokens are billed at the cached-input rate
+        """
+        uncached_tokens = max(0, prompt_tokens - cached_tokens)
+        cost = (
+            uncached_tokens * settings.OPENAI_PRICE_INPUT_PER_1M
+            + cached_tokens * settings.OPENAI_PRICE_CACHED_INPUT_PER_1M
+            + completion_tokens * settings.OPENAI_PRICE_OUTPUT_PER_1M
+        ) / 1_000_000
+        
+        if batch:
+            cost *= settings.OPENAI_BATCH_DISCOUNT
+        return round(cost, 6)
+    
+    async def get_cached_reviews(
+        self,
+        submissions: List[Tuple[str, ProgrammingLanguage, Optional[str]]]
+    ) -> List[Optional[ReviewFeedback]]:
+        """
+        Exact-match cache lookup for many (code, language, description) submissions
+        at once; None marks the ones that still need a review
+        """
+        cached = await cache_service.get_cached_feedback_many(submissions)
+        return [self._as_cache_hit(feedback) if feedback else None for feedback in cached]
+    
+    def _as_cache_hit(self, feedback: ReviewFeedback) -> ReviewFeedback:
+        """
+        Copy of cached feedback whose cost_info reflects that no upstream call was made
+        """
+        original = feedback.cost_info or {}
+        if original.get("source") == "cache":
+            return feedback
+        
+        return feedback.copy(update={"cost_info": {
+            "source": "cache",
+            "model": original.get("model"),
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cached_tokens": 0,
+            "upstream_latency_ms": 0,
+            "cost_usd": 0.0,
+            "saved_cost_usd": original.get("cost_usd", 0.0)
+        }})
+    
+    async def _call_with_retry(self, call: Callable[[AIBackend], Awaitable[Any]], tokens: int = 0) -> Tuple[Any, AIBackend]:
+        """
+        Run an upstream call behind the circuit breaker on a backend picked by the router,
+        within that backend's cluster-wide budget (`tokens` per attempt) and adaptive
+        concurrency limit, retrying transient failures
+        (on another backend when one is available) with exponential backoff and full
+        jitter, honouring Retry-After.
+        Returns the call's result and the backend that produced it.
+        """
+        attempt = 0
+        backend = None
+        
+        while True:
+            self.circuit_breaker.before_call()
+            # Every exit must settle the breaker, or a half-open probe slot leaks
+            settled = False
+            try:
+                backend = self.router.select(exclude=backend)
+                await backend.budget.acquire(tokens)
+                await backend.limiter.acquire()
+                backend.in_flight += 1
+                call_start = time.monotonic()
+                try:
+                    result = await call(backend)
+                    latency = time.monotonic() - call_start
+                    self.router.record(backend, latency, success=True)
+                    backend.limiter.record_success(latency)
+                    self.circuit_breaker.record_success()
+                    settled = True
+                    return result, backend
+                except (UpstreamError, httpx.TransportError) as e:
+                    if isinstance(e, UpstreamError) and e.status_code in (429, 503):
+                        backend.limiter.record_overload(e.retry_after)
+                    if isinstance(e, UpstreamError) and not e.retryable:
+                        # A rejected request still shows the backend is up
+                        if e.status_code < 500:
+                            self.circuit_breaker.record_success()
+                        else:
+                            self.circuit_breaker.record_failure()
+                        settled = True
+                        raise
+                    
+                    self.router.record(backend, time.monotonic() - call_start, success=False)
+                    self.circuit_breaker.record_failure()
+                    settled = True
+                    attempt += 1
+                    
+                    retry_after = e.retry_after if isinstance(e, UpstreamError) else None
+                    if self.router.has_alternative(backend):
+                        # Retry-After only applies to the backend that sent it
+                        retry_after = None
+                    delay = self._backoff_delay(attempt, retry_after)
+                    
+                    if attempt > settings.AI_MAX_RETRIES or delay > settings.AI_RETRY_MAX_DELAY:
+                        raise
+                    
+                    print(
+                        f"Upstream call to {backend.name} failed ({e}); "
+                        f"retry {attempt}/{settings.AI_MAX_RETRIES} in {delay:.2f}s"
+                    )
+                except json.JSONDecodeError:
+                    self.circuit_breaker.record_failure()
+                    settled = True
+                    raise
+                finally:
+                    backend.in_flight -= 1
+                    await backend.limiter.release()
+            finally:
+                if not settled:
+                    # Cancelled, or stopped before reaching upstream (e.g. budget)
+                    self.circuit_breaker.release()
+            
+            await asyncio.sleep(delay)
+    
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return retry_after + random.uniform(0, settings.AI_RETRY_BASE_DELAY)
+        
+        ceiling = min(settings.AI_RETRY_MAX_DELAY, settings.AI_RETRY_BASE_DELAY * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+    
+    async def _complete(self, backend: AIBackend, payload: dict) -> Tuple[dict, dict]:
+        """
+        Request a full chat completion and return the parsed JSON content and token usage
+        """
+        response = await self.client.post(
+            f"{backend.base_url}/chat/completions",
+            headers=backend.headers(),
+            json={**payload, "model": backend.model}
+        )
+        
+        if response.status_code != 200:
+            backend.limiter.observe_headers(response.headers)
+            raise UpstreamError(response.status_code, response.text, parse_retry_after(response.headers))
+        
+        response_data = response.json()
+        usage = response_data.get("usage") or {}
+        backend.limiter.observe_headers(response.headers, usage.get("total_tokens"))
+        
+        content = response_data["choices"][0]["message"]["content"]
+        return json.loads(content), usage
+    
+    async def _complete_streaming(
+        self,
+        backend: AIBackend,
+        payload: dict,
+        on_section: SectionCallback
+    ) -> Tuple[dict, dict]:
+        """
+        Consume the SSE completion stream, reporting each top-level section as it completes
+        """
+        parser = IncrementalJSONObjectParser()
+        usage = {}
+        
+        async with self.client.stream(
+            "POST",
+            f"{backend.base_url}/chat/completions",
+            headers=backend.headers(),
+            json={**payload, "model": backend.model, "stream": True, "stream_options": {"include_usage": True}}
+        ) as response:
+            if response.status_code != 200:
+                backend.limiter.observe_headers(response.headers)
+                body = await response.aread()
+                raise UpstreamError(
+                    response.status_code,
+                    body.decode(errors="replace"),
+                    parse_retry_after(response.headers)
+                )
+            
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                
+                chunk = json.loads(data)
+                if chunk.get("usage"):
+                    usage = chunk["usage"]
+                
+                choices = chunk.get("choices") or []
+                if not choices:
+                    continue
+                
+                delta = choices[0].get("delta", {}).get("content")
+                if not delta:
+                    continue
+                
+                for key, value in parser.feed(delta):
+                    if key in ReviewFeedback.__fields__:
+                        try:
+                            await on_section(key, value)
+                        except Exception as e:
+                            print(f"Error delivering partial feedback section {key}: {e}")
+            
+            backend.limiter.observe_headers(response.headers, usage.get("total_tokens"))
+        
+        return json.loads(parser.buffer), usage
+    
+    def _build_static_prefix(self, language: ProgrammingLanguage) -> str:
+        """
+        Static per-language system prompt (instructions + tips + response schema).
+        It is byte-identical for every review in a language so the provider can cache it.
+        """
         language_str = language if isinstance(language, str) else language.value
-        specific_tips = language_tips.get(language_str, "Analyze language best practices.")
         
-        prompt = f"""Analyze this {language_str} code. {specific_tips}
+        if language_str not in self._prefix_cache:
+            specific_tips = LANGUAGE_TIPS.get(language_str, "Analyze language best practices.")
+            self._prefix_cache[language_str] = f"""{SYSTEM_PROMPT}
 
-CODE:
-```{language_str}
-{code}
-```
-
-{f"CONTEXT: {description}" if description else ""}
+You review {language_str} code. {specific_tips}
 
 Return JSON only:
-{{
-    "quality_score": 7,
-    "issues": ["specific problems found"],
-    "suggestions": ["practical improvements"],
-    "security_concerns": ["security issues"],
-    "performance_recommendations": ["performance and optimization tips"],
-    "positive_aspects": ["good practices"]
-}}"""
+{RESPONSE_SCHEMA}"""
+        
+        return self._prefix_cache[language_str]
+    
+    def _build_review_prompt(self, code: str, language: ProgrammingLanguage, description: Optional[str]) -> str:
+        """
+        Build the variable part of the review prompt (code and optional context)
+        """
+        language_str = language if isinstance(language, str) else language.value
+        
+        prompt = f"""CODE:
+```{language_str}
+{code}
+```"""
+        if description:
+            prompt += f"\n\nCONTEXT: {description}"
         return prompt
     
     def _parse_feedback(self, feedback_data: dict) -> ReviewFeedback:
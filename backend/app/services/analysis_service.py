@@ -0,0 +1,110 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from ..core.config import settings
+from ..models.review import ReviewFeedback, ProgrammingLanguage
+from ..utils.static_analysis import AnalysisResult, run_analyzers
+
+
+class AnalysisService:
+    """
+    Runs the local static analyzers in a process pool so parsing and AST walks
+    never block the event loop
+    """
+    
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+    
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=settings.STATIC_ANALYSIS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = self._create_executor()
+        return self._executor
+    
+    async def start(self):
+        """
+        Start the worker processes ahead of the first submission
+        """
+        if not settings.STATIC_ANALYSIS_ENABLED:
+            return
+        
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(self.executor, run_analyzers, "", "other")
+            for _ in range(settings.STATIC_ANALYSIS_WORKERS)
+        ])
+        print(f"Static analysis pool started with {settings.STATIC_ANALYSIS_WORKERS} workers")
+    
+    async def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            print("Static analysis pool shut down")
+    
+    async def analyze(self, code: str, language: ProgrammingLanguage) -> AnalysisResult:
+        """
+        Run the analyzers registered for the language. Analysis is best effort:
+        a timeout or worker failure yields an empty result so the AI review still runs.
+        """
+        if not settings.STATIC_ANALYSIS_ENABLED:
+            return AnalysisResult()
+        
+        language_str = language if isinstance(language, str) else language.value
+        loop = asyncio.get_running_loop()
+        
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self.executor, run_analyzers, code, language_str),
+                timeout=settings.STATIC_ANALYSIS_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            print(f"Static analysis timed out after {settings.STATIC_ANALYSIS_TIMEOUT}s")
+        except BrokenProcessPool:
+            print("Static analysis pool broke - restarting it")
+            self._executor = None
+        except Exception as e:
+            print(f"Static analysis failed: {e}")
+        
+        return AnalysisResult()
+    
+    def syntax_error_feedback(self, result: AnalysisResult) -> ReviewFeedback:
+        """
+        Immediate feedback for code that does not parse, instead of an AI call
+        """
+        return ReviewFeedback(
+            quality_score=1,
+            issues=result.issues,
+            suggestions=["Fix the syntax errors and resubmit for a full review"],
+            static_analysis={"syntax_ok": False, "analyzers": result.analyzers, **result.metrics},
+            cost_info={"source": "static_analysis", "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+        )
+    
+    def merge(self, feedback: ReviewFeedback, result: AnalysisResult) -> ReviewFeedback:
+        """
+        Prepend local findings to the AI feedback
+        """
+        if not result.analyzers:
+            return feedback
+        
+        def combine(local, remote):
+            return list(local) + [entry for entry in remote if entry not in local]
+        
+        return feedback.copy(update={
+            "issues": combine(result.issues, feedback.issues),
+            "suggestions": combine(result.suggestions, feedback.suggestions),
+            "security_concerns": combine(result.security_concerns, feedback.security_concerns),
+            "performance_recommendations": combine(result.performance_recommendations, feedback.performance_recommendations),
+            "static_analysis": {"syntax_ok": result.syntax_ok, "analyzers": result.analyzers, **result.metrics}
+        })
+
+
+analysis_service = AnalysisService()
@@ -0,0 +1,325 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+
+from ..core.config import settings
+from ..core.database import get_database
+from ..core.redis_client import redis_client
+from ..models.review import ReviewFeedback, ReviewStatus
+from .ai_service import ai_service
+from .analysis_service import analysis_service
+from .cache_service import cache_service
+from .review_events import review_events
+
+
+ACTIVE_BATCH_STATUSES = ["validating", "in_progress", "finalizing", "cancelling"]
+REQUEUE_BATCH_STATUSES = ["expired", "cancelled"]
+
+
+class BatchService:
+    """
+    Deferred review mode: accumulates deferred reviews into Batch API jobs,
+    polls them and fans the results back out to reviews and the cache.
+    """
+
+    def __init__(self):
+        self.lock_key = "batch:scheduler_lock"
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """
+        Start the periodic submit/poll loop
+        """
+        if settings.BATCH_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._run())
+            print("Started batch review scheduler")
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+            print("Batch review scheduler cancelled")
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.sleep(settings.BATCH_FLUSH_INTERVAL_SECONDS)
+                await self.run_once()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"Error in batch scheduler: {e}")
+
+    async def run_once(self, force: bool = False):
+        """
+        Submit pending deferred reviews and collect finished batches (one worker at a time)
+        """
+        token = uuid.uuid4().hex
+        lease = int(max(60, settings.BATCH_FLUSH_INTERVAL_SECONDS * 2))
+
+        # Without the lease (held elsewhere, or Redis unreachable) another worker could
+        # submit the same pending reviews to a second batch
+        acquired = await redis_client.set(self.lock_key, token, ex=lease, nx=True)
+        if not acquired:
+            return
+
+        try:
+            await self.submit_pending(force=force)
+            await self.poll_batches()
+        finally:
+            if await redis_client.get(self.lock_key) == token:
+                await redis_client.delete(self.lock_key)
+
+    async def submit_pending(self, force: bool = False) -> Optional[str]:
+        """
+        Build a batch file from pending deferred reviews and submit it.
+        Waits for BATCH_MIN_REQUESTS reviews or BATCH_MAX_WAIT_SECONDS unless forced.
+        """
+        db = get_database()
+
+        cursor = db.reviews.find(
+            {"deferred": True, "status": ReviewStatus.PENDING, "batch_id": None},
+            {"code": 1, "language": 1, "description": 1, "created_at": 1}
+        ).sort("created_at", 1).limit(settings.BATCH_MAX_REQUESTS)
+        pending = await cursor.to_list(length=settings.BATCH_MAX_REQUESTS)
+
+        if not pending:
+            return None
+
+        oldest_wait = (datetime.utcnow() - pending[0]["created_at"]).total_seconds()
+        if not force and len(pending) < settings.BATCH_MIN_REQUESTS and oldest_wait < settings.BATCH_MAX_WAIT_SECONDS:
+            return None
+
+        lines = []
+        review_ids = []
+
+        for doc in pending:
+            analysis = await analysis_service.analyze(doc["code"], doc["language"])
+            if not analysis.syntax_ok:
+                await self._complete_review(doc, analysis_service.syntax_error_feedback(analysis))
+                continue
+            
+            cached = (
+                await cache_service.get_cached_feedback(doc["code"], doc["language"], doc.get("description"))
+                or await cache_service.get_near_duplicate_feedback(doc["code"], doc["language"], doc.get("description"))
+            )
+            if cached:
+                await self._complete_review(doc, analysis_service.merge(cached, analysis))
+                continue
+
+            try:
+                payload, _ = ai_service.build_payload(doc["code"], doc["language"], doc.get("description"))
+            except Exception as e:
+                await self._fail_review(doc["_id"], str(e))
+                continue
+
+            lines.append(json.dumps({
+                "custom_id": str(doc["_id"]),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": payload
+            }))
+            review_ids.append(doc["_id"])
+
+        if not lines:
+            return None
+
+        input_file = await self._request(
+            "POST", "/files",
+            data={"purpose": "batch"},
+            files={"file": ("reviews.jsonl", "\n".join(lines).encode("utf-8"), "application/jsonl")}
+        )
+        batch = await self._request("POST", "/batches", json={
+            "input_file_id": input_file["id"],
+            "endpoint": "/v1/chat/completions",
+            "completion_window": settings.BATCH_COMPLETION_WINDOW
+        })
+
+        now = datetime.utcnow()
+        await db.ai_batches.insert_one({
+            "batch_id": batch["id"],
+            "input_file_id": input_file["id"],
+            "status": batch.get("status", "validating"),
+            "review_ids": review_ids,
+            "request_count": len(review_ids),
+            "created_at": now,
+            "updated_at": now
+        })
+        await db.reviews.update_many(
+            {"_id": {"$in": review_ids}},
+            {"$set": {"batch_id": batch["id"], "status": ReviewStatus.IN_PROGRESS}}
+        )
+        await self._publish_status(review_ids, ReviewStatus.IN_PROGRESS)
+
+        print(f"Submitted batch {batch['id']} with {len(review_ids)} reviews")
+        return batch["id"]
+
+    async def poll_batches(self):
+        """
+        Check active batches and distribute results of the finished ones
+        """
+        db = get_database()
+        active = await db.ai_batches.find({"status": {"$in": ACTIVE_BATCH_STATUSES}}).to_list(length=None)
+
+        for record in active:
+            try:
+                batch = await self._request("GET", f"/batches/{record['batch_id']}")
+                status = batch.get("status")
+
+                if status not in ACTIVE_BATCH_STATUSES:
+                    await self._collect_results(record, batch)
+
+                await db.ai_batches.update_one(
+                    {"_id": record["_id"]},
+                    {"$set": {
+                        "status": status,
+                        "request_counts": batch.get("request_counts"),
+                        "updated_at": datetime.utcnow()
+                    }}
+                )
+            except Exception as e:
+                print(f"Error polling batch {record['batch_id']}: {e}")
+
+    async def _collect_results(self, record: Dict[str, Any], batch: Dict[str, Any]):
+        db = get_database()
+        remaining = {str(review_id) for review_id in record["review_ids"]}
+
+        if batch.get("output_file_id"):
+            for line in await self._read_jsonl(batch["output_file_id"]):
+                review_id = line.get("custom_id")
+                if review_id not in remaining:
+                    continue
+                remaining.discard(review_id)
+
+                response = line.get("response") or {}
+                if response.get("status_code") != 200:
+                    await self._fail_review(ObjectId(review_id), f"Batch request failed: {response.get('body')}")
+                    continue
+
+                try:
+                    body = response["body"]
+                    feedback = ai_service._parse_feedback(json.loads(body["choices"][0]["message"]["content"]))
+                    usage = body.get("usage") or {}
+                    cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+                    feedback.cost_info = {
+                        "source": "batch",
+                        "model": body.get("model") or ai_service.model,
+                        "prompt_tokens": usage.get("prompt_tokens") or 0,
+                        "completion_tokens": usage.get("completion_tokens") or 0,
+                        "cached_tokens": cached_tokens,
+                        "cost_usd": ai_service.compute_cost(
+                            usage.get("prompt_tokens") or 0,
+                            cached_tokens,
+                            usage.get("completion_tokens") or 0,
+                            batch=True
+                        ),
+                        "batch_id": record["batch_id"]
+                    }
+                except Exception as e:
+                    await self._fail_review(ObjectId(review_id), f"Error parsing batch result: {e}")
+                    continue
+
+                review_doc = await db.reviews.find_one({"_id": ObjectId(review_id)})
+                if review_doc:
+                    await cache_service.cache_feedback(
+                        review_doc["code"], review_doc["language"], feedback, review_doc.get("description")
+                    )
+                    analysis = await analysis_service.analyze(review_doc["code"], review_doc["language"])
+                    await self._complete_review(review_doc, analysis_service.merge(feedback, analysis))
+
+        if batch.get("error_file_id"):
+            for line in await self._read_jsonl(batch["error_file_id"]):
+                review_id = line.get("custom_id")
+                if review_id in remaining:
+                    remaining.discard(review_id)
+                    error = line.get("error") or (line.get("response") or {}).get("body")
+                    await self._fail_review(ObjectId(review_id), f"Batch request failed: {error}")
+
+        if not remaining:
+            return
+
+        leftover = [ObjectId(review_id) for review_id in remaining]
+        if batch.get("status") in REQUEUE_BATCH_STATUSES:
+            await db.reviews.update_many(
+                {"_id": {"$in": leftover}},
+                {"$set": {"status": ReviewStatus.PENDING, "batch_id": None}}
+            )
+            await self._publish_status(leftover, ReviewStatus.PENDING)
+            print(f"Re-queued {len(leftover)} reviews from {batch.get('status')} batch {record['batch_id']}")
+        else:
+            for review_id in leftover:
+                await self._fail_review(review_id, f"Batch {record['batch_id']} ended with status {batch.get('status')}")
+
+    async def _complete_review(self, review_doc: Dict[str, Any], feedback: ReviewFeedback):
+        db = get_database()
+        completed_at = datetime.utcnow()
+        processing_time = (completed_at - review_doc["created_at"]).total_seconds()
+
+        await db.reviews.update_one(
+            {"_id": review_doc["_id"]},
+            {"$set": {
+                "status": ReviewStatus.COMPLETED,
+                "feedback": feedback.dict(),
+                "completed_at": completed_at,
+                "processing_time": processing_time
+            }}
+        )
+        await review_events.publish(
+            str(review_doc["_id"]), "completed",
+            status=ReviewStatus.COMPLETED,
+            feedback=feedback.dict(),
+            completed_at=completed_at.isoformat(),
+            processing_time=processing_time
+        )
+
+    async def _fail_review(self, review_id: ObjectId, message: str):
+        db = get_database()
+        completed_at = datetime.utcnow()
+        await db.reviews.update_one(
+            {"_id": review_id},
+            {"$set": {
+                "status": ReviewStatus.FAILED,
+                "error_message": message,
+                "completed_at": completed_at
+            }}
+        )
+        await review_events.publish(
+            str(review_id), "failed",
+            status=ReviewStatus.FAILED,
+            error_message=message,
+            completed_at=completed_at.isoformat()
+        )
+
+    async def _publish_status(self, review_ids: List[ObjectId], status: ReviewStatus):
+        await asyncio.gather(*[
+            review_events.publish(str(review_id), "status", status=status) for review_id in review_ids
+        ])
+
+    async def _read_jsonl(self, file_id: str) -> List[Dict[str, Any]]:
+        response = await ai_service.client.get(
+            f"{ai_service.base_url}/files/{file_id}/content",
+            headers={"Authorization": f"Bearer {ai_service.api_key}"}
+        )
+        if response.status_code != 200:
+            raise Exception(f"OpenAI API error {response.status_code}: {response.text}")
+
+        return [json.loads(line) for line in response.text.splitlines() if line.strip()]
+
+    async def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        response = await ai_service.client.request(
+            method,
+            f"{ai_service.base_url}{path}",
+            headers={"Authorization": f"Bearer {ai_service.api_key}"},
+            **kwargs
+        )
+        if response.status_code not in (200, 201):
+            raise Exception(f"OpenAI API error {response.status_code}: {response.text}")
+
+        return response.json()
+
+
+batch_service = BatchService()
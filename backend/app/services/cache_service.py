@@ -2,31 +2,99 @@ import hashlib
 import json
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
+from ..core.config import settings
 from ..core.redis_client import redis_client
 from ..models.review import ReviewFeedback, ProgrammingLanguage
+from ..utils.code_normalizer import normalize_code
+from ..utils.minhash import MinHasher, shingles, tokenize
 
 logger = logging.getLogger(__name__)
 
+# Store a MinHash signature (KEYS[1]) and add the entry (ARGV[1]) to its LSH
+# band buckets (KEYS[2..]), all expiring after ARGV[3] seconds
+INDEX_NEAR_DUPLICATE_SCRIPT = """
+local ttl = tonumber(ARGV[3])
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ttl)
+for i = 2, #KEYS do
+    redis.call('SADD', KEYS[i], ARGV[1])
+    redis.call('EXPIRE', KEYS[i], ttl)
+end
+return 1
+"""
+
 
 class CodeCacheService:
     
     def __init__(self):
         self.cache_ttl_seconds = 2592000
         self.stats_key = "cache:stats"
+        self.near_duplicate_prefix = "near_dup"
+        self.minhasher = MinHasher(settings.MINHASH_NUM_PERM, settings.MINHASH_BANDS)
     
     def _generate_code_hash(self, code: str, language: ProgrammingLanguage, description: Optional[str] = None) -> str:
-        normalized_code = ' '.join(code.strip().split()).lower()
+        normalized_code = normalize_code(code, language)
         cache_key = f"{normalized_code}|{language}|{description or ''}"
         hash_value = hashlib.sha256(cache_key.encode('utf-8')).hexdigest()
         return f"code_cache:{hash_value}"
     
+    def _generate_unit_hash(self, unit_code: str, language: ProgrammingLanguage, description: Optional[str] = None) -> str:
+        cache_key = f"{normalize_code(unit_code, language)}|{language}|{description or ''}"
+        hash_value = hashlib.sha256(cache_key.encode('utf-8')).hexdigest()
+        return f"unit_cache:{hash_value}"
+    
+    async def get_cached_unit_feedback(
+        self,
+        unit_code: str,
+        language: ProgrammingLanguage,
+        description: Optional[str] = None
+    ) -> Optional[ReviewFeedback]:
+        """
+        Feedback previously generated for one top-level unit (function/class) of a file
+        """
+        try:
+            cached_data = await redis_client.get(self._generate_unit_hash(unit_code, language, description))
+            
+            if cached_data:
+                await self._update_stats("unit_hits")
+                return ReviewFeedback(**json.loads(cached_data)["feedback"])
+            
+            await self._update_stats("unit_misses")
+            return None
+            
+        except Exception as e:
+            logger.error(f"Error checking unit cache: {e}")
+            return None
+    
+    async def cache_unit_feedback(
+        self,
+        unit_code: str,
+        language: ProgrammingLanguage,
+        feedback: ReviewFeedback,
+        description: Optional[str] = None
+    ) -> bool:
+        try:
+            cache_entry = {
+                "feedback": feedback.dict(),
+                "language": language,
+                "created_at": datetime.utcnow().isoformat()
+            }
+            return await redis_client.set(
+                self._generate_unit_hash(unit_code, language, description),
+                json.dumps(cache_entry, default=str),
+                ex=self.cache_ttl_seconds
+            )
+        except Exception as e:
+            logger.error(f"Error caching unit feedback: {e}")
+            return False
+    
     async def get_cached_feedback(
         self, 
         code: str, 
         language: ProgrammingLanguage, 
-        description: Optional[str] = None
+        description: Optional[str] = None,
+        track_stats: bool = True
     ) -> Optional[ReviewFeedback]:
         try:
             cache_key = self._generate_code_hash(code, language, description)
@@ -38,14 +106,15 @@ class CodeCacheService:
                 
                 feedback_data = json.loads(cached_data)
                 
-                await self._increment_usage_count(cache_key)
-                
-                await self._update_stats("hits")
+                if track_stats:
+                    await self._increment_usage_count(cache_key)
+                    await self._update_stats("hits")
                 
                 return ReviewFeedback(**feedback_data["feedback"])
             
             logger.debug(f"Cache MISS for hash: {cache_key[-12:]}...")
-            await self._update_stats("misses")
+            if track_stats:
+                await self._update_stats("misses")
             return None
             
         except Exception as e:
@@ -53,6 +122,35 @@ class CodeCacheService:
             await self._update_stats("errors")
             return None
     
+    async def get_cached_feedback_many(
+        self,
+        submissions: List[Tuple[str, ProgrammingLanguage, Optional[str]]]
+    ) -> List[Optional[ReviewFeedback]]:
+        """
+        Look up (code, language, description) submissions with a single MGET.
+        Hits and misses are counted in aggregate; per-entry usage counts are not
+        updated, to keep the lookup to one round trip.
+        """
+        try:
+            keys = [self._generate_code_hash(code, language, description) for code, language, description in submissions]
+            values = await redis_client.mget(keys)
+            
+            results = []
+            for cached_data in values:
+                results.append(ReviewFeedback(**json.loads(cached_data)["feedback"]) if cached_data else None)
+            
+            hits = sum(1 for feedback in results if feedback)
+            if hits:
+                await self._update_stats("hits", hits)
+            if len(results) - hits:
+                await self._update_stats("misses", len(results) - hits)
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error checking cache: {e}")
+            await self._update_stats("errors")
+            return [None] * len(submissions)
+    
     async def cache_feedback(
         self, 
         code: str, 
@@ -82,6 +180,8 @@ class CodeCacheService:
             if success:
                 logger.debug(f"Cached feedback for hash: {cache_key[-12:]}...")
                 await self._update_stats("cached")
+                if not feedback.approximate:
+                    await self._index_near_duplicate(cache_key, code, language, description)
                 return True
             else:
                 logger.warning(f"Failed to cache feedback for hash: {cache_key[-12:]}...")
@@ -92,6 +192,100 @@ class CodeCacheService:
             await self._update_stats("cache_errors")
             return False
     
+    def _near_duplicate_signature(self, code: str, language: ProgrammingLanguage) -> Optional[list]:
+        """
+        MinHash signature of the code, or None if it is too short or too long to compare reliably
+        """
+        if not settings.NEAR_DUPLICATE_ENABLED or len(code) > settings.NEAR_DUPLICATE_MAX_CHARS:
+            return None
+        normalized_code = normalize_code(code, language)
+        if len(tokenize(normalized_code)) < settings.NEAR_DUPLICATE_MIN_TOKENS:
+            return None
+        return self.minhasher.signature(shingles(normalized_code))
+    
+    def _near_duplicate_namespace(self, language: ProgrammingLanguage, description: Optional[str]) -> str:
+        description_hash = hashlib.sha256((description or "").encode("utf-8")).hexdigest()[:16]
+        return f"{self.near_duplicate_prefix}:{language}:{description_hash}"
+    
+    async def _index_near_duplicate(
+        self,
+        cache_key: str,
+        code: str,
+        language: ProgrammingLanguage,
+        description: Optional[str] = None
+    ) -> bool:
+        """
+        Store the entry's MinHash signature and add it to the LSH band buckets
+        """
+        try:
+            signature = self._near_duplicate_signature(code, language)
+            if signature is None:
+                return False
+            
+            namespace = self._near_duplicate_namespace(language, description)
+            buckets = [f"{namespace}:{band_key}" for band_key in self.minhasher.band_keys(signature)]
+            indexed = await redis_client.eval(
+                INDEX_NEAR_DUPLICATE_SCRIPT,
+                [f"{self.near_duplicate_prefix}:sig:{cache_key}", *buckets],
+                [cache_key, json.dumps(signature), self.cache_ttl_seconds]
+            )
+            return indexed is not None
+            
+        except Exception as e:
+            logger.error(f"Error indexing near-duplicate signature: {e}")
+            return False
+    
+    async def get_near_duplicate_feedback(
+        self,
+        code: str,
+        language: ProgrammingLanguage,
+        description: Optional[str] = None
+    ) -> Optional[ReviewFeedback]:
+        """
+        Reuse the review of the most similar cached submission if its estimated
+        similarity reaches NEAR_DUPLICATE_THRESHOLD; the result is flagged approximate
+        """
+        try:
+            signature = self._near_duplicate_signature(code, language)
+            if signature is None:
+                return None
+            
+            namespace = self._near_duplicate_namespace(language, description)
+            candidates = sorted(await redis_client.sunion(
+                [f"{namespace}:{band_key}" for band_key in self.minhasher.band_keys(signature)]
+            ))
+            signatures = await redis_client.mget([f"{self.near_duplicate_prefix}:sig:{candidate}" for candidate in candidates])
+            
+            best_key, best_similarity = None, 0.0
+            for candidate, stored in zip(candidates, signatures):
+                if not stored:
+                    continue
+                similarity = self.minhasher.similarity(signature, json.loads(stored))
+                if similarity > best_similarity:
+                    best_key, best_similarity = candidate, similarity
+            
+            if best_key is None or best_similarity < settings.NEAR_DUPLICATE_THRESHOLD:
+                await self._update_stats("near_misses")
+                return None
+            
+            cached_data = await redis_client.get(best_key)
+            if not cached_data:
+                await self._update_stats("near_misses")
+                return None
+            
+            logger.debug(f"Near-duplicate HIT ({best_similarity:.2f}) for hash: {best_key[-12:]}...")
+            await self._increment_usage_count(best_key)
+            await self._update_stats("near_hits")
+            
+            feedback = ReviewFeedback(**json.loads(cached_data)["feedback"])
+            feedback.approximate = True
+            feedback.similarity = round(best_similarity, 3)
+            return feedback
+            
+        except Exception as e:
+            logger.error(f"Error checking near-duplicate cache: {e}")
+            return None
+    
     async def _increment_usage_count(self, cache_key: str) -> bool:
         try:
             usage_key = f"{cache_key}:usage"
@@ -102,10 +296,10 @@ class CodeCacheService:
             logger.error(f"Error incrementing cache usage: {e}")
             return False
     
-    async def _update_stats(self, stat_type: str) -> bool:
+    async def _update_stats(self, stat_type: str, amount: int = 1) -> bool:
         try:
             stats_key = f"{self.stats_key}:{stat_type}"
-            await redis_client.incr(stats_key)
+            await redis_client.incrby(stats_key, amount)
             await redis_client.set(stats_key, await redis_client.get(stats_key), ex=7*24*60*60)
             return True
         except Exception as e:
@@ -121,6 +315,10 @@ class CodeCacheService:
             misses = await redis_client.get(f"{self.stats_key}:misses") or "0"
             cached = await redis_client.get(f"{self.stats_key}:cached") or "0"
             errors = await redis_client.get(f"{self.stats_key}:errors") or "0"
+            near_hits = int(await redis_client.get(f"{self.stats_key}:near_hits") or "0")
+            near_misses = int(await redis_client.get(f"{self.stats_key}:near_misses") or "0")
+            unit_hits = int(await redis_client.get(f"{self.stats_key}:unit_hits") or "0")
+            unit_misses = int(await redis_client.get(f"{self.stats_key}:unit_misses") or "0")
             
             hits = int(hits)
             misses = int(misses)
@@ -161,6 +359,16 @@ class CodeCacheService:
                 "hit_rate_percent": round(hit_rate, 2),
                 "entries_cached": cached,
                 "cache_errors": errors,
+                "near_duplicate_hits": near_hits,
+                "near_duplicate_misses": near_misses,
+                "near_duplicate_hit_rate_percent": round(
+                    near_hits / (near_hits + near_misses) * 100 if near_hits + near_misses else 0, 2
+                ),
+                "unit_hits": unit_hits,
+                "unit_misses": unit_misses,
+                "unit_hit_rate_percent": round(
+                    unit_hits / (unit_hits + unit_misses) * 100 if unit_hits + unit_misses else 0, 2
+                ),
                 "most_used_entries": most_used,
                 "cache_ttl_days": self.cache_ttl_seconds // (24 * 60 * 60)
             }
@@ -175,6 +383,12 @@ class CodeCacheService:
                 "hit_rate_percent": 0,
                 "entries_cached": 0,
                 "cache_errors": 0,
+                "near_duplicate_hits": 0,
+                "near_duplicate_misses": 0,
+                "near_duplicate_hit_rate_percent": 0,
+                "unit_hits": 0,
+                "unit_misses": 0,
+                "unit_hit_rate_percent": 0,
                 "most_used_entries": [],
                 "cache_ttl_days": 30
             }
@@ -183,10 +397,12 @@ class CodeCacheService:
         try:
             cache_keys = await redis_client.keys("code_cache:*")
             usage_keys = await redis_client.keys("cache:*")
+            near_duplicate_keys = await redis_client.keys(f"{self.near_duplicate_prefix}:*")
+            unit_keys = await redis_client.keys("unit_cache:*")
             
             deleted_count = 0
             
-            for key in cache_keys + usage_keys:
+            for key in cache_keys + usage_keys + near_duplicate_keys + unit_keys:
                 if await redis_client.delete(key):
                     deleted_count += 1
             
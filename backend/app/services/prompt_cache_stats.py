@@ -0,0 +1,88 @@
+import logging
+from typing import Any, Dict
+
+from ..core.redis_client import redis_client
+from ..models.review import ProgrammingLanguage
+
+logger = logging.getLogger(__name__)
+
+# Add each (field, amount) pair of ARGV to the language's counters hash
+RECORD_SCRIPT = """
+for i = 1, #ARGV, 2 do
+    redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return 1
+"""
+
+# The counters hash of every language in KEYS, in order
+STATS_SCRIPT = """
+local result = {}
+for i = 1, #KEYS do
+    table.insert(result, redis.call('HGETALL', KEYS[i]))
+end
+return result
+"""
+
+
+class PromptCacheStats:
+    """
+    Per-language counters for provider-side prompt prefix caching (usage.prompt_tokens_details.cached_tokens).
+    Each language keeps one hash, so recording and reading are a single round trip.
+    """
+    
+    def __init__(self):
+        self.key_prefix = "prompt_cache"
+        self.fields = ["requests", "hits", "prompt_tokens", "cached_tokens", "latency_ms_hit", "latency_ms_miss"]
+    
+    def _key(self, language: str) -> str:
+        return f"{self.key_prefix}:{language}"
+    
+    async def record(self, language: ProgrammingLanguage, prompt_tokens: int, cached_tokens: int, latency: float) -> bool:
+        try:
+            language_str = language if isinstance(language, str) else language.value
+            latency_ms = int(latency * 1000)
+            
+            increments = ["requests", 1, "prompt_tokens", prompt_tokens]
+            if cached_tokens > 0:
+                increments += ["hits", 1, "cached_tokens", cached_tokens, "latency_ms_hit", latency_ms]
+            else:
+                increments += ["latency_ms_miss", latency_ms]
+            
+            return await redis_client.eval(RECORD_SCRIPT, [self._key(language_str)], increments) is not None
+        except Exception as e:
+            logger.error(f"Error recording prompt cache usage: {e}")
+            return False
+    
+    async def get_stats(self) -> Dict[str, Any]:
+        languages = {}
+        names = [language.value for language in ProgrammingLanguage]
+        
+        hashes = await redis_client.eval(STATS_SCRIPT, [self._key(name) for name in names], [])
+        if hashes is None:
+            logger.error("Error reading prompt cache stats")
+            return {"languages": languages}
+        
+        for name, flat in zip(names, hashes):
+            stored = dict(zip(flat[::2], flat[1::2]))
+            values = {field: int(stored.get(field) or 0) for field in self.fields}
+            
+            requests = values["requests"]
+            if not requests:
+                continue
+            
+            hits = values["hits"]
+            misses = requests - hits
+            languages[name] = {
+                "requests": requests,
+                "prefix_hit_rate_percent": round(hits / requests * 100, 2),
+                "cached_token_ratio_percent": round(
+                    values["cached_tokens"] / values["prompt_tokens"] * 100, 2
+                ) if values["prompt_tokens"] else 0.0,
+                "avg_latency_ms_hit": round(values["latency_ms_hit"] / hits, 1) if hits else None,
+                "avg_latency_ms_miss": round(values["latency_ms_miss"] / misses, 1) if misses else None
+            }
+        
+        return {"languages": languages}
+
+
+prompt_cache_stats = PromptCacheStats()
@@ -0,0 +1,130 @@
+import asyncio
+import json
+from typing import Any, Dict, Optional, Set
+
+from ..core.redis_client import redis_client
+
+
+def format_event(event: Dict[str, Any]) -> str:
+    """
+    Server-Sent Events frame; the event name is the event's type
+    """
+    return f"event: {event.get('type', 'message')}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+class ReviewEventHub:
+    """
+    Review status events across processes over Redis pub/sub.
+    
+    Workers publish each transition on the review's channel. Every API process
+    holds a single subscription connection and subscribes only to the reviews
+    someone is watching there, fanning each message out to local watchers.
+    """
+    
+    def __init__(self):
+        self.prefix = "review_events"
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self._subscribed: Optional[asyncio.Event] = None
+        self._watchers: Dict[str, Set[asyncio.Queue]] = {}
+        
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+    
+    def channel(self, review_id: str) -> str:
+        return f"{self.prefix}:{review_id}"
+    
+    async def publish(self, review_id: str, event_type: str, **fields: Any):
+        """
+        Announce a review event; best effort, subscribers fall back to the stored state
+        """
+        message = json.dumps({"type": event_type, "review_id": review_id, **fields}, default=str)
+        await redis_client.publish(self.channel(review_id), message)
+        self.published += 1
+    
+    async def watch(self, review_id: str) -> Optional[asyncio.Queue]:
+        """
+        Queue receiving the review's events, or None when pub/sub is unavailable
+        """
+        if self._pubsub is None:
+            self._pubsub = redis_client.pubsub()
+            if self._pubsub is None:
+                return None
+            self._subscribed = asyncio.Event()
+            self._reader = asyncio.create_task(self._read())
+        
+        queue: asyncio.Queue = asyncio.Queue(maxsize=100)
+        watchers = self._watchers.get(review_id)
+        if watchers is None:
+            try:
+                await self._pubsub.subscribe(self.channel(review_id))
+            except Exception as e:
+                print(f"Error subscribing to review events: {e}")
+                return None
+            watchers = self._watchers.setdefault(review_id, set())
+            self._subscribed.set()
+        watchers.add(queue)
+        return queue
+    
+    async def unwatch(self, review_id: str, queue: asyncio.Queue):
+        watchers = self._watchers.get(review_id)
+        if watchers is None:
+            return
+        
+        watchers.discard(queue)
+        if not watchers:
+            del self._watchers[review_id]
+            if not self._watchers:
+                self._subscribed.clear()
+            try:
+                await self._pubsub.unsubscribe(self.channel(review_id))
+            except Exception as e:
+                print(f"Error unsubscribing from review events: {e}")
+    
+    async def _read(self):
+        while True:
+            try:
+                await self._subscribed.wait()
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is not None:
+                    self._deliver(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"Error reading review events: {e}")
+                await asyncio.sleep(1)
+    
+    def _deliver(self, channel: str, data: str):
+        review_id = channel[len(self.prefix) + 1:]
+        event = json.loads(data)
+        for queue in list(self._watchers.get(review_id, ())):
+            if queue.full():
+                # A stalled client only needs the latest state
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(event)
+            self.delivered += 1
+    
+    async def close(self):
+        if self._reader:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+        if self._pubsub is not None:
+            await self._pubsub.reset()
+            self._pubsub = None
+        self._watchers.clear()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "pubsub_available": not redis_client.is_upstash and redis_client.client is not None,
+            "watched_reviews": len(self._watchers),
+            "watchers": sum(len(watchers) for watchers in self._watchers.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped
+        }
+
+
+review_events = ReviewEventHub()
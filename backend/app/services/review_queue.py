@@ -0,0 +1,260 @@
+import asyncio
+import os
+import socket
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..core.config import settings
+from ..core.redis_client import redis_client
+
+
+ReviewHandler = Callable[[str, int, Optional[Dict[str, Any]]], Awaitable[None]]
+DeadLetterHandler = Callable[[str, int], Awaitable[None]]
+RefillHook = Callable[[], Awaitable[Any]]
+
+# Submission fields carried in the job so workers do not re-read the review document
+REVIEW_PAYLOAD_FIELDS = ("code", "language", "description", "parent_review_id")
+
+
+class ReviewQueue:
+    """
+    Durable review job queue on a Redis stream with a consumer group.
+    
+    Entries are acknowledged (and deleted) only after the handler returns, so a
+    worker that crashes mid-review leaves them pending; any worker claims
+    entries pending longer than REVIEW_QUEUE_CLAIM_IDLE_SECONDS. While a review
+    runs, its worker keeps resetting the entry's idle time, so slow reviews are
+    never taken over from a live worker. Entries that keep failing past
+    REVIEW_QUEUE_MAX_DELIVERIES move to a dead-letter stream.
+    """
+    
+    def __init__(self):
+        self.stream = "reviews:queue"
+        self.dead_letter_stream = "reviews:dead_letter"
+        self.group = "review-workers"
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self._group_ready = False
+        self._stopping = False
+        self._tasks: List[asyncio.Task] = []
+        self._active: Dict[str, asyncio.Task] = {}
+        
+        self.processed = 0
+        self.failed = 0
+        self.claimed = 0
+        self.dead_lettered = 0
+    
+    async def ensure_group(self) -> bool:
+        if not self._group_ready:
+            self._group_ready = await redis_client.xgroup_create(self.stream, self.group)
+        return self._group_ready
+    
+    async def enqueue(
+        self,
+        review_id: str,
+        deferrals: int = 0,
+        delay: float = 0.0,
+        payload: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Add a review job; delay holds it back (circuit-breaker deferrals) and
+        payload carries the submission fields
+        """
+        if not await self.ensure_group():
+            return False
+        
+        fields = self.entry_fields(review_id, deferrals, delay, payload)
+        entry_id = await redis_client.xadd(self.stream, fields, maxlen=settings.REVIEW_QUEUE_MAXLEN)
+        return entry_id is not None
+    
+    @staticmethod
+    def entry_fields(
+        review_id: str,
+        deferrals: int = 0,
+        delay: float = 0.0,
+        payload: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        fields = {"review_id": review_id, "deferrals": deferrals, "not_before": round(time.time() + delay, 3) if delay else 0}
+        for name in REVIEW_PAYLOAD_FIELDS:
+            if payload and payload.get(name) is not None:
+                fields[name] = payload[name]
+        return fields
+    
+    async def start(
+        self,
+        handler: ReviewHandler,
+        on_dead_letter: DeadLetterHandler,
+        concurrency: int,
+        refill: Optional[RefillHook] = None
+    ):
+        """
+        Start `concurrency` consumers plus the loop that claims stale entries.
+        refill is called before each read so a scheduler can release the next job.
+        """
+        if self._tasks or concurrency <= 0:
+            return
+        
+        await self.ensure_group()
+        self._stopping = False
+        self._tasks = [
+            asyncio.create_task(self._consume(handler, f"{self.consumer}-{index}", refill))
+            for index in range(concurrency)
+        ]
+        self._tasks.append(asyncio.create_task(self._claim_stale(handler, on_dead_letter)))
+        print(f"Started {concurrency} review queue consumers ({self.consumer})")
+    
+    async def close(self, timeout: float = 30.0):
+        """
+        Stop reading new entries and let reviews in progress finish; whatever is
+        still running after the timeout stays pending and is claimed later
+        """
+        if not self._tasks:
+            return
+        
+        self._stopping = True
+        if self._active:
+            await asyncio.wait(list(self._active.values()), timeout=timeout)
+        
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        print("Review queue consumers stopped")
+    
+    async def _consume(self, handler: ReviewHandler, consumer: str, refill: Optional[RefillHook] = None):
+        # Entries this consumer name read before a restart come first
+        start_id = "0"
+        
+        while not self._stopping:
+            try:
+                if refill and start_id == ">":
+                    await refill()
+                entries = await redis_client.xreadgroup(
+                    self.group, consumer, self.stream, id=start_id,
+                    count=1, block_ms=settings.REVIEW_QUEUE_BLOCK_MS
+                )
+                if not entries:
+                    if start_id == "0":
+                        start_id = ">"
+                    elif redis_client.is_upstash:
+                        await asyncio.sleep(settings.REVIEW_QUEUE_BLOCK_MS / 1000)
+                    continue
+                
+                for entry_id, fields in entries:
+                    if refill and start_id == ">":
+                        # Hand the next job to another idle consumer while this one works
+                        await refill()
+                    await self._run(entry_id, fields, handler, consumer)
+            
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"Error in review queue consumer {consumer}: {e}")
+                await asyncio.sleep(1)
+    
+    async def _run(self, entry_id: str, fields: Dict[str, Any], handler: ReviewHandler, consumer: str):
+        task = asyncio.create_task(self._handle(entry_id, fields, handler))
+        heartbeat = asyncio.create_task(self._heartbeat(entry_id, consumer))
+        self._active[entry_id] = task
+        try:
+            await task
+        finally:
+            heartbeat.cancel()
+            self._active.pop(entry_id, None)
+    
+    async def _heartbeat(self, entry_id: str, consumer: str):
+        """
+        Keep the entry's idle time well below the claim threshold while it is handled
+        """
+        interval = settings.REVIEW_QUEUE_CLAIM_IDLE_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            await redis_client.xclaim_justid(self.stream, self.group, consumer, entry_id)
+    
+    async def _handle(self, entry_id: str, fields: Dict[str, Any], handler: ReviewHandler):
+        delay = float(fields.get("not_before") or 0) - time.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        
+        try:
+            payload = {name: fields[name] for name in REVIEW_PAYLOAD_FIELDS if fields.get(name) is not None}
+            await handler(fields["review_id"], int(fields.get("deferrals") or 0), payload or None)
+        except Exception as e:
+            # Left pending: another attempt happens once the entry is claimed as stale
+            self.failed += 1
+            print(f"Review job {entry_id} failed: {e}")
+            return
+        
+        await redis_client.xack(self.stream, self.group, entry_id)
+        await redis_client.xdel(self.stream, entry_id)
+        self.processed += 1
+    
+    async def _claim_stale(self, handler: ReviewHandler, on_dead_letter: DeadLetterHandler):
+        while not self._stopping:
+            try:
+                await asyncio.sleep(settings.REVIEW_QUEUE_CLAIM_INTERVAL_SECONDS)
+                await self.claim_stale_once(handler, on_dead_letter)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"Error claiming stale review jobs: {e}")
+    
+    async def claim_stale_once(self, handler: ReviewHandler, on_dead_letter: DeadLetterHandler):
+        """
+        Take over entries left pending by crashed workers and retry them,
+        dead-lettering those delivered too many times
+        """
+        consumer = f"{self.consumer}-claimer"
+        min_idle_ms = int(settings.REVIEW_QUEUE_CLAIM_IDLE_SECONDS * 1000)
+        start_id = "0-0"
+        
+        while not self._stopping:
+            start_id, entries = await redis_client.xautoclaim(
+                self.stream, self.group, consumer, min_idle_ms, start_id, count=10
+            )
+            for entry_id, fields in entries:
+                deliveries = await redis_client.xpending_count(self.stream, self.group, entry_id)
+                if deliveries > settings.REVIEW_QUEUE_MAX_DELIVERIES or "review_id" not in fields:
+                    await self._dead_letter(entry_id, fields, deliveries, on_dead_letter)
+                else:
+                    self.claimed += 1
+                    print(f"Claimed stale review job {entry_id} (delivery {deliveries})")
+                    await self._run(entry_id, fields, handler, consumer)
+            if start_id == "0-0":
+                break
+    
+    async def _dead_letter(self, entry_id: str, fields: Dict[str, Any], deliveries: int, on_dead_letter: DeadLetterHandler):
+        await redis_client.xadd(
+            self.dead_letter_stream,
+            {**fields, "entry_id": entry_id, "deliveries": deliveries, "dead_lettered_at": datetime.utcnow().isoformat()},
+            maxlen=settings.REVIEW_QUEUE_MAXLEN
+        )
+        await redis_client.xack(self.stream, self.group, entry_id)
+        await redis_client.xdel(self.stream, entry_id)
+        self.dead_lettered += 1
+        print(f"Moved review job {entry_id} to the dead-letter stream after {deliveries} deliveries")
+        
+        if fields.get("review_id"):
+            try:
+                await on_dead_letter(fields["review_id"], deliveries)
+            except Exception as e:
+                print(f"Error failing dead-lettered review {fields['review_id']}: {e}")
+    
+    async def snapshot(self) -> Dict[str, Any]:
+        length = await redis_client.xlen(self.stream)
+        pending = await redis_client.xpending_total(self.stream, self.group)
+        return {
+            "stream_length": length,
+            "waiting": max(0, length - pending),
+            "pending": pending,
+            "dead_letter_length": await redis_client.xlen(self.dead_letter_stream),
+            "consumers_in_this_process": max(0, len(self._tasks) - 1),
+            "active_in_this_process": len(self._active),
+            "processed": self.processed,
+            "failed": self.failed,
+            "claimed": self.claimed,
+            "dead_lettered": self.dead_lettered
+        }
+
+
+review_queue = ReviewQueue()
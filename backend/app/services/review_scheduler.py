@@ -0,0 +1,255 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from ..core.redis_client import redis_client
+from ..models.review import ReviewPriority
+from .review_queue import review_queue
+
+# Queue jobs for a user/IP in a priority class. Jobs beyond the threshold of
+# interactive reviews waiting for the user/IP are queued as bulk. A user/IP that
+# becomes backlogged starts at the class virtual time (or where its last job
+# finished, if later), so idle time cannot be banked. Returns each job's class.
+ENQUEUE_SCRIPT = """
+local prefix = ARGV[1]
+local requested = ARGV[2]
+local tenant = ARGV[3]
+local threshold = tonumber(ARGV[4])
+local bulk = ARGV[5]
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local classes = {}
+
+for i = 6, #ARGV do
+    local class = requested
+    if threshold > 0 and class ~= bulk and redis.call('LLEN', prefix .. ':' .. class .. ':jobs:' .. tenant) >= threshold then
+        class = bulk
+    end
+
+    local job = cjson.decode(ARGV[i])
+    job.enqueued_at = now
+
+    local base = prefix .. ':' .. class
+    redis.call('RPUSH', base .. ':jobs:' .. tenant, cjson.encode(job))
+    redis.call('HINCRBY', prefix .. ':depth', class, 1)
+
+    if not redis.call('ZSCORE', base .. ':tenants', tenant) then
+        local vt = tonumber(redis.call('GET', base .. ':vt')) or 0
+        local finish = tonumber(redis.call('HGET', base .. ':finish', tenant)) or 0
+        redis.call('HDEL', base .. ':finish', tenant)
+        redis.call('ZADD', base .. ':tenants', math.max(vt, finish), tenant)
+    end
+    table.insert(classes, class)
+end
+return classes
+"""
+
+# Move the next job into the review stream, unless READY_DEPTH jobs there are
+# still undelivered. Within a class, users/IPs are served in start-time fair
+# order (lowest virtual start tag first, advanced by cost / weight per job);
+# across classes, the head job with the highest weight * (1 + waited / aging)
+# wins, so bulk work waiting long enough overtakes fresh interactive work.
+DISPATCH_SCRIPT = """
+local prefix = ARGV[1]
+local stream = ARGV[2]
+local ready_depth = tonumber(ARGV[5])
+local aging = tonumber(ARGV[6])
+
+if ready_depth > 0 then
+    local undelivered = redis.call('XLEN', stream) - redis.call('XPENDING', stream, ARGV[3])[1]
+    if undelivered >= ready_depth then
+        return false
+    end
+end
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local best, best_priority, best_tenant, best_job
+for i = 7, #ARGV, 2 do
+    local class = ARGV[i]
+    local base = prefix .. ':' .. class
+    local head = redis.call('ZRANGE', base .. ':tenants', 0, 0)[1]
+    if head then
+        local raw = redis.call('LINDEX', base .. ':jobs:' .. head, 0)
+        if raw then
+            local job = cjson.decode(raw)
+            local priority = tonumber(ARGV[i + 1]) * (1 + (now - job.enqueued_at) / aging)
+            if not best or priority > best_priority then
+                best, best_priority, best_tenant, best_job = class, priority, head, job
+            end
+        else
+            redis.call('ZREM', base .. ':tenants', head)
+        end
+    end
+end
+
+if not best then
+    return false
+end
+
+local base = prefix .. ':' .. best
+local jobs = base .. ':jobs:' .. best_tenant
+redis.call('LPOP', jobs)
+redis.call('HINCRBY', prefix .. ':depth', best, -1)
+
+local start = tonumber(redis.call('ZSCORE', base .. ':tenants', best_tenant))
+local finish = start + best_job.cost / best_job.weight
+redis.call('SET', base .. ':vt', tostring(start))
+if redis.call('LLEN', jobs) > 0 then
+    redis.call('ZADD', base .. ':tenants', finish, best_tenant)
+else
+    redis.call('ZREM', base .. ':tenants', best_tenant)
+    redis.call('HSET', base .. ':finish', best_tenant, tostring(finish))
+end
+
+local wait = now - best_job.enqueued_at
+redis.call('LPUSH', base .. ':waits', tostring(wait))
+redis.call('LTRIM', base .. ':waits', 0, 999)
+
+local entry_id = redis.call('XADD', stream, 'MAXLEN', '~', ARGV[4], '*', unpack(best_job.fields))
+return {entry_id, best, tostring(wait)}
+"""
+
+# Per class: waiting reviews, backlogged users/IPs and recent queue waits
+STATS_SCRIPT = """
+local prefix = ARGV[1]
+local result = {}
+for i = 2, #ARGV do
+    local base = prefix .. ':' .. ARGV[i]
+    table.insert(result, tonumber(redis.call('HGET', prefix .. ':depth', ARGV[i])) or 0)
+    table.insert(result, redis.call('ZCARD', base .. ':tenants'))
+    table.insert(result, redis.call('LRANGE', base .. ':waits', 0, -1))
+end
+return result
+"""
+
+
+def _percentile(ordered: List[float], pct: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class ReviewScheduler:
+    """
+    Fair-share admission of reviews into the review queue.
+    
+    Submissions wait in Redis per priority class and per user/IP; consumers
+    release one job at a time into the review stream, so a user who submits
+    hundreds of files only gets their fair share of the workers. Everything
+    lives in Redis, so the order is fair across all API and worker processes.
+    """
+    
+    def __init__(self):
+        self.prefix = "review_sched"
+        self.submitted = 0
+        self.dispatched = 0
+    
+    @property
+    def class_weights(self) -> Dict[str, float]:
+        return {
+            ReviewPriority.INTERACTIVE.value: settings.REVIEW_SCHEDULER_INTERACTIVE_WEIGHT,
+            ReviewPriority.BULK.value: settings.REVIEW_SCHEDULER_BULK_WEIGHT
+        }
+    
+    @staticmethod
+    def tenant(user_id: Optional[str], ip_address: Optional[str]) -> str:
+        return f"user:{user_id}" if user_id else f"ip:{ip_address or 'unknown'}"
+    
+    @staticmethod
+    def tenant_weight(user_id: Optional[str]) -> float:
+        return settings.REVIEW_SCHEDULER_USER_WEIGHT if user_id else settings.REVIEW_SCHEDULER_IP_WEIGHT
+    
+    async def submit_many(
+        self,
+        jobs: List[Tuple[str, Optional[Dict[str, Any]]]],
+        priority: ReviewPriority,
+        user_id: Optional[str],
+        ip_address: Optional[str]
+    ) -> Optional[List[str]]:
+        """
+        Queue (review_id, payload) jobs from one user/IP in a single round trip.
+        Returns the class of each job, or None when Redis is unavailable.
+        """
+        if not jobs or not await review_queue.ensure_group():
+            return None
+        
+        encoded = []
+        for review_id, payload in jobs:
+            fields = review_queue.entry_fields(review_id, payload=payload)
+            encoded.append(json.dumps({
+                "fields": [str(item) for pair in fields.items() for item in pair],
+                "cost": 1 + len((payload or {}).get("code") or "") / settings.REVIEW_SCHEDULER_COST_CHARS,
+                "weight": self.tenant_weight(user_id)
+            }))
+        
+        queued = await redis_client.eval(ENQUEUE_SCRIPT, [], [
+            self.prefix,
+            priority.value,
+            self.tenant(user_id, ip_address),
+            settings.REVIEW_SCHEDULER_BULK_THRESHOLD,
+            ReviewPriority.BULK.value,
+            *encoded
+        ])
+        if not queued:
+            return None
+        
+        self.submitted += len(queued)
+        await self.dispatch()
+        return list(queued)
+    
+    async def dispatch(self) -> bool:
+        """
+        Release the next job into the review stream if a consumer is ready for it
+        """
+        args = [
+            self.prefix,
+            review_queue.stream,
+            review_queue.group,
+            settings.REVIEW_QUEUE_MAXLEN,
+            settings.REVIEW_SCHEDULER_READY_DEPTH,
+            settings.REVIEW_SCHEDULER_AGING_SECONDS
+        ]
+        for name, weight in self.class_weights.items():
+            args.extend([name, weight])
+        
+        released = await redis_client.eval(DISPATCH_SCRIPT, [], args)
+        if not released:
+            return False
+        self.dispatched += 1
+        return True
+    
+    async def snapshot(self) -> Dict[str, Any]:
+        """
+        Waiting reviews and queue-wait percentiles per priority class
+        """
+        names = list(self.class_weights)
+        stats = await redis_client.eval(STATS_SCRIPT, [], [self.prefix, *names]) or []
+        
+        classes = {}
+        for index, name in enumerate(names):
+            depth, tenants, waits = stats[index * 3:index * 3 + 3] or (0, 0, [])
+            ordered = sorted(float(wait) for wait in waits)
+            classes[name] = {
+                "weight": self.class_weights[name],
+                "waiting": int(depth),
+                "backlogged_users": int(tenants),
+                "wait_samples": len(ordered),
+                "wait_p50_seconds": round(_percentile(ordered, 50), 3) if ordered else None,
+                "wait_p95_seconds": round(_percentile(ordered, 95), 3) if ordered else None,
+                "wait_p99_seconds": round(_percentile(ordered, 99), 3) if ordered else None
+            }
+        
+        return {
+            "enabled": settings.REVIEW_SCHEDULER_ENABLED,
+            "aging_seconds": settings.REVIEW_SCHEDULER_AGING_SECONDS,
+            "ready_depth": settings.REVIEW_SCHEDULER_READY_DEPTH,
+            "classes": classes,
+            "submitted_by_this_process": self.submitted,
+            "dispatched_by_this_process": self.dispatched
+        }
+
+
+review_scheduler = ReviewScheduler()
@@ -1,14 +1,25 @@
 import asyncio
+import math
 import time
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
 from bson import ObjectId
 from pymongo.errors import PyMongoError
 
-from ..core.database import get_database
-from ..models.review import Review, ReviewStatus, CodeSubmission, ReviewListResponse
+from ..core.config import settings
+from ..core.database import get_database, write_concern
+from ..models.review import (
+    Review, ReviewStatus, ReviewPriority, CodeSubmission, DiffSubmission, BatchSubmission, BatchStatusResponse, BatchReviewItem, ProgrammingLanguage,
+    ReviewListResponse, ReviewFeedback, PartialReviewResponse
+)
 from ..utils.rate_limiter import check_rate_limit
+from ..utils.circuit_breaker import CircuitOpenError
+from ..utils.code_diff import apply_unified_diff
 from .ai_service import ai_service
+from .analysis_service import analysis_service
+from .review_queue import REVIEW_PAYLOAD_FIELDS, review_queue
+from .review_events import format_event, review_events
+from .review_scheduler import review_scheduler
 
 
 class ReviewService:
@@ -21,86 +32,423 @@ class ReviewService:
         ip_address: str,
         user_id: Optional[str] = None,
         user_email: Optional[str] = None
-    ) -> str:
+    ) -> Review:
         """
-        Submit code for review
+        Submit code for review. Code whose review is already cached is stored as
+        completed straight away and returned with its feedback.
         """
+        start_time = time.time()
+        if submission.deferred and not settings.BATCH_ENABLED:
+            # Only the batch scheduler picks deferred reviews up
+            raise ValueError("Deferred reviews are not available: batch processing is disabled")
         if not await check_rate_limit(ip_address):
             raise Exception("Rate limit exceeded. Please try again later.")
         
+        [cached] = await ai_service.get_cached_reviews([(submission.code, submission.language, submission.description)])
+        feedback = await self._with_static_analysis(cached, submission.code, submission.language) if cached else None
+        
+        now = datetime.utcnow()
         review = Review(
             code=submission.code,
             language=submission.language,
             description=submission.description,
-            status=ReviewStatus.PENDING,
+            status=ReviewStatus.COMPLETED if feedback else ReviewStatus.PENDING,
+            feedback=feedback,
             ip_address=ip_address,
             user_id=user_id,
             user_email=user_email,
-            created_at=datetime.utcnow()
+            created_at=now,
+            completed_at=now if feedback else None,
+            processing_time=time.time() - start_time if feedback else None,
+            deferred=submission.deferred and not feedback,
+            priority=submission.priority
         )
         
         db = get_database()
+        result = await db.reviews.insert_one(review.dict())
+        review.id = str(result.inserted_id)
+        
+        if not feedback and not submission.deferred:
+            await self._admit(review.id, review)
+        
+        return review
+    
+    async def submit_diff_review(
+        self,
+        parent_review_id: str,
+        submission: DiffSubmission,
+        ip_address: str,
+        user_id: Optional[str] = None,
+        user_email: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Submit a new version of previously reviewed code, given as a unified diff or
+        the full new code. Returns None when the prior review does not exist.
+        """
+        if not await check_rate_limit(ip_address):
+            raise Exception("Rate limit exceeded. Please try again later.")
+        
+        if not ObjectId.is_valid(parent_review_id):
+            return None
+        
+        db = get_database()
+        parent = await db.reviews.find_one(
+            {"_id": ObjectId(parent_review_id)},
+            {"code": 1, "language": 1, "description": 1, "status": 1, "user_id": 1}
+        )
+        
+        if not parent or (user_id and parent.get("user_id") != user_id):
+            return None
+        
+        if parent["status"] != ReviewStatus.COMPLETED:
+            raise ValueError("The prior review has not completed yet")
+        
+        code = apply_unified_diff(parent["code"], submission.diff) if submission.diff else submission.code
+        if len(code) > settings.MAX_CODE_LENGTH:
+            raise ValueError(f"The new code exceeds {settings.MAX_CODE_LENGTH} characters")
+        
+        review = Review(
+            code=code,
+            language=parent["language"],
+            description=submission.description or parent.get("description"),
+            status=ReviewStatus.PENDING,
+            ip_address=ip_address,
+            user_id=user_id,
+            user_email=user_email,
+            created_at=datetime.utcnow(),
+            parent_review_id=parent_review_id
+        )
+        
         result = await db.reviews.insert_one(review.dict())
         review_id = str(result.inserted_id)
         
-        asyncio.create_task(self._process_review(review_id))
+        await self._admit(review_id, review)
         
         return review_id
     
-    async def _process_review(self, review_id: str):
+    async def submit_batch(
+        self,
+        submission: BatchSubmission,
+        ip_address: str,
+        user_id: Optional[str] = None,
+        user_email: Optional[str] = None
+    ) -> BatchStatusResponse:
         """
-        Process review in background
+        Submit many files at once: one rate-limit pass, one cache lookup and one
+        insert for the whole batch. Cached files complete immediately; only the
+        misses are queued for review.
+        """
+        start_time = time.time()
+        cost = math.ceil(len(submission.files) / max(1, settings.BATCH_FILES_PER_REQUEST))
+        if not await check_rate_limit(ip_address, cost=cost):
+            raise Exception("Rate limit exceeded. Please try again later.")
+        
+        cached = await ai_service.get_cached_reviews(
+            [(item.code, item.language, item.description) for item in submission.files]
+        )
+        hit_indexes = [index for index, feedback in enumerate(cached) if feedback]
+        analyzed = await asyncio.gather(*[
+            self._with_static_analysis(cached[index], submission.files[index].code, submission.files[index].language)
+            for index in hit_indexes
+        ])
+        finished = dict(zip(hit_indexes, analyzed))
+        
+        batch_id = ObjectId()
+        now = datetime.utcnow()
+        processing_time = time.time() - start_time
+        reviews = []
+        for index, item in enumerate(submission.files):
+            feedback = finished.get(index)
+            reviews.append(Review(
+                code=item.code,
+                language=item.language,
+                description=item.description,
+                status=ReviewStatus.COMPLETED if feedback else ReviewStatus.PENDING,
+                feedback=feedback,
+                ip_address=ip_address,
+                user_id=user_id,
+                user_email=user_email,
+                created_at=now,
+                completed_at=now if feedback else None,
+                processing_time=processing_time if feedback else None,
+                priority=submission.priority,
+                submission_batch_id=str(batch_id),
+                path=item.path
+            ))
+        
+        db = get_database()
+        result = await db.reviews.insert_many([review.dict() for review in reviews])
+        review_ids = [str(inserted_id) for inserted_id in result.inserted_ids]
+        
+        await db.submission_batches.insert_one({
+            "_id": batch_id,
+            "review_ids": review_ids,
+            "total": len(reviews),
+            "cache_hits": len(finished),
+            "priority": submission.priority,
+            "ip_address": ip_address,
+            "user_id": user_id,
+            "created_at": now
+        })
+        
+        misses = [(review_id, self._job_payload(review)) for review_id, review in zip(review_ids, reviews) if not review.feedback]
+        await self._admit_many(misses, submission.priority, user_id, ip_address)
+        
+        return BatchStatusResponse(
+            batch_id=str(batch_id),
+            status=ReviewStatus.COMPLETED if not misses else ReviewStatus.PENDING,
+            total=len(reviews),
+            pending=len(misses),
+            completed=len(finished),
+            cache_hits=len(finished),
+            reviews=[
+                BatchReviewItem(id=review_id, path=review.path, status=review.status)
+                for review_id, review in zip(review_ids, reviews)
+            ],
+            created_at=now
+        )
+    
+    async def _with_static_analysis(self, feedback: ReviewFeedback, code: str, language: ProgrammingLanguage) -> ReviewFeedback:
+        """
+        Combine cached AI feedback with local analysis, as _process_review does
+        """
+        analysis = await analysis_service.analyze(code, language)
+        if not analysis.syntax_ok:
+            return analysis_service.syntax_error_feedback(analysis)
+        return analysis_service.merge(feedback, analysis)
+    
+    @staticmethod
+    def _job_payload(review: Review) -> Dict[str, Any]:
+        """
+        Submission fields handed to the worker with the job
+        """
+        document = {**review.dict(), "language": review.language.value}
+        return {name: document[name] for name in REVIEW_PAYLOAD_FIELDS if document.get(name) is not None}
+    
+    async def _review_against_parent(self, review_doc: Dict[str, Any]) -> Optional[ReviewFeedback]:
+        """
+        Review only what changed since the parent review, or None when the parent
+        is gone and a full review is needed
+        """
+        db = get_database()
+        parent = await db.reviews.find_one(
+            {"_id": ObjectId(review_doc["parent_review_id"])},
+            {"code": 1, "feedback": 1}
+        )
+        if not parent or not parent.get("feedback"):
+            return None
+        
+        return await ai_service.review_changes(
+            old_code=parent["code"],
+            new_code=review_doc["code"],
+            language=review_doc["language"],
+            prior=ReviewFeedback(**parent["feedback"]),
+            description=review_doc.get("description")
+        )
+    
+    async def _admit(self, review_id: str, review: Review):
+        """
+        Queue a new submission behind the fair-share scheduler, so one user/IP
+        submitting many files cannot hold up everyone else
+        """
+        await self._admit_many(
+            [(review_id, self._job_payload(review))], review.priority, review.user_id, review.ip_address
+        )
+    
+    async def _admit_many(
+        self,
+        jobs: List[Tuple[str, Dict[str, Any]]],
+        priority: ReviewPriority,
+        user_id: Optional[str],
+        ip_address: Optional[str]
+    ):
+        """
+        Queue submissions from one user/IP in one scheduler round trip, falling
+        back to the plain queue when the scheduler is off or Redis is unavailable
+        """
+        if not jobs:
+            return
+        if settings.REVIEW_QUEUE_ENABLED and settings.REVIEW_SCHEDULER_ENABLED:
+            if await review_scheduler.submit_many(jobs, priority, user_id, ip_address):
+                return
+        for review_id, payload in jobs:
+            await self._schedule(review_id, payload=payload)
+    
+    async def _schedule(
+        self,
+        review_id: str,
+        deferrals: int = 0,
+        delay: float = 0.0,
+        payload: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Hand a review to the durable queue, or process it in this process when
+        the queue is disabled or Redis is unavailable
+        """
+        if settings.REVIEW_QUEUE_ENABLED and await review_queue.enqueue(review_id, deferrals, delay, payload):
+            return
+        
+        if delay:
+            asyncio.create_task(self._process_review_later(review_id, delay, deferrals, payload))
+        else:
+            asyncio.create_task(self._process_review(review_id, deferrals, payload))
+    
+    async def start_workers(self, concurrency: int):
+        """
+        Consume review jobs from the queue in this process
+        """
+        if settings.REVIEW_QUEUE_ENABLED:
+            refill = review_scheduler.dispatch if settings.REVIEW_SCHEDULER_ENABLED else None
+            await review_queue.start(self._process_review, self._fail_dead_lettered, concurrency, refill)
+    
+    async def close_workers(self):
+        await review_queue.close()
+    
+    async def _fail_dead_lettered(self, review_id: str, deliveries: int):
+        await self._mark_failed(
+            review_id, f"Review could not be processed after {deliveries} attempts", unfinished_only=True
+        )
+    
+    async def _process_review(self, review_id: str, deferrals: int = 0, payload: Optional[Dict[str, Any]] = None):
+        """
+        Process review in background. The submission payload (code, language,
+        description) normally travels with the job so the document is not re-read.
         """
         db = get_database()
         start_time = time.time()
+        status_updates = db.reviews.with_options(write_concern=write_concern(settings.MONGO_STATUS_WRITE_CONCERN))
         
         try:
-            await db.reviews.update_one(
-                {"_id": ObjectId(review_id)},
-                {"$set": {"status": ReviewStatus.IN_PROGRESS}}
-            )
+            claim_filter = {"_id": ObjectId(review_id), "status": {"$in": [ReviewStatus.PENDING, ReviewStatus.IN_PROGRESS]}}
+            claim_update = {"$set": {"status": ReviewStatus.IN_PROGRESS}}
+            
+            if payload and payload.get("code"):
+                claimed = await status_updates.update_one(claim_filter, claim_update)
+                review_doc = payload if claimed.matched_count else None
+            else:
+                review_doc = await status_updates.find_one_and_update(
+                    claim_filter, claim_update, projection=list(REVIEW_PAYLOAD_FIELDS)
+                )
             
-            review_doc = await db.reviews.find_one({"_id": ObjectId(review_id)})
             if not review_doc:
-                raise Exception("Review not found")
+                # Already finished (a redelivered job) or deleted
+                return
+            await review_events.publish(review_id, "status", status=ReviewStatus.IN_PROGRESS)
             
-            feedback = await ai_service.review_code(
-                code=review_doc["code"],
-                language=review_doc["language"],
-                description=review_doc.get("description")
-            )
+            partial_updates = db.reviews.with_options(write_concern=write_concern(settings.MONGO_PARTIAL_WRITE_CONCERN))
+            
+            async def store_section(section: str, value: Any):
+                await partial_updates.update_one(
+                    {"_id": ObjectId(review_id)},
+                    {"$set": {f"partial_feedback.{section}": value}}
+                )
+                await review_events.publish(review_id, "section", section=section, value=value)
+            
+            analysis = await analysis_service.analyze(review_doc["code"], review_doc["language"])
+            
+            if analysis.syntax_ok:
+                feedback = None
+                if review_doc.get("parent_review_id"):
+                    feedback = await self._review_against_parent(review_doc)
+                if feedback is None:
+                    feedback = await ai_service.review_code(
+                        code=review_doc["code"],
+                        language=review_doc["language"],
+                        description=review_doc.get("description"),
+                        on_section=store_section
+                    )
+                feedback = analysis_service.merge(feedback, analysis)
+            else:
+                feedback = analysis_service.syntax_error_feedback(analysis)
             
             processing_time = time.time() - start_time
+            completed_at = datetime.utcnow()
             
-            await db.reviews.update_one(
+            await status_updates.update_one(
                 {"_id": ObjectId(review_id)},
                 {
                     "$set": {
                         "status": ReviewStatus.COMPLETED,
                         "feedback": feedback.dict(),
-                        "completed_at": datetime.utcnow(),
+                        "completed_at": completed_at,
                         "processing_time": processing_time
-                    }
+                    },
+                    "$unset": {"partial_feedback": ""}
                 }
             )
+            await review_events.publish(
+                review_id, "completed",
+                status=ReviewStatus.COMPLETED,
+                feedback=feedback.dict(),
+                completed_at=completed_at.isoformat(),
+                processing_time=processing_time
+            )
+            
+        except CircuitOpenError as e:
+            if deferrals < settings.AI_CIRCUIT_MAX_DEFERRALS:
+                await db.reviews.update_one(
+                    {"_id": ObjectId(review_id)},
+                    {"$set": {"status": ReviewStatus.PENDING}}
+                )
+                await review_events.publish(review_id, "status", status=ReviewStatus.PENDING)
+                await self._schedule(review_id, deferrals + 1, max(e.retry_in, 1.0), payload)
+                return
+            
+            await self._mark_failed(review_id, f"AI service temporarily unavailable: {e}")
             
         except Exception as e:
-            await db.reviews.update_one(
-                {"_id": ObjectId(review_id)},
-                {
-                    "$set": {
-                        "status": ReviewStatus.FAILED,
-                        "error_message": str(e),
-                        "completed_at": datetime.utcnow()
-                    }
+            await self._mark_failed(review_id, str(e))
+    
+    async def _mark_failed(self, review_id: str, error_message: str, unfinished_only: bool = False):
+        """
+        Record a failed review and tell anyone watching it
+        """
+        db = get_database()
+        query: Dict[str, Any] = {"_id": ObjectId(review_id)}
+        if unfinished_only:
+            query["status"] = {"$in": [ReviewStatus.PENDING, ReviewStatus.IN_PROGRESS]}
+        
+        completed_at = datetime.utcnow()
+        result = await db.reviews.update_one(
+            query,
+            {
+                "$set": {
+                    "status": ReviewStatus.FAILED,
+                    "error_message": error_message,
+                    "completed_at": completed_at
                 }
+            }
+        )
+        if result.matched_count:
+            await review_events.publish(
+                review_id, "failed",
+                status=ReviewStatus.FAILED,
+                error_message=error_message,
+                completed_at=completed_at.isoformat()
             )
     
-    async def get_review(self, review_id: str) -> Optional[Review]:
+    async def _process_review_later(
+        self, review_id: str, delay: float, deferrals: int, payload: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Re-run a review deferred while the AI circuit breaker was open
+        """
+        await asyncio.sleep(delay)
+        await self._process_review(review_id, deferrals=deferrals, payload=payload)
+    
+    async def get_review(self, review_id: str, wait: float = 0.0, user_id: Optional[str] = None) -> Optional[Review]:
         """
-        Get specific review
+        Get specific review. With wait, a pending or in-progress review is held
+        until its completion event arrives or wait seconds pass; the final state
+        comes from the event, so a long poll costs a single read. Without Redis
+        pub/sub the current state is returned at once.
         """
+        queue = None
         try:
+            if wait > 0 and ObjectId.is_valid(review_id):
+                # Watch before reading so a completion in between is not missed
+                queue = await review_events.watch(review_id)
+            
             db = get_database()
             review_doc = await db.reviews.find_one({"_id": ObjectId(review_id)})
             
@@ -110,11 +458,201 @@ class ReviewService:
             review_doc["id"] = str(review_doc["_id"])
             del review_doc["_id"]
             
+            unfinished = review_doc["status"] in (ReviewStatus.PENDING, ReviewStatus.IN_PROGRESS)
+            if queue is not None and unfinished and not (user_id and review_doc.get("user_id") != user_id):
+                event = await self._wait_for_result(queue, wait)
+                if event:
+                    review_doc.update({
+                        field: event[field]
+                        for field in ("status", "feedback", "completed_at", "processing_time", "error_message")
+                        if field in event
+                    })
+                    review_doc.pop("partial_feedback", None)
+            
             return Review(**review_doc)
             
         except Exception as e:
             print(f"Error fetching review: {e}")
             return None
+        finally:
+            if queue is not None:
+                await review_events.unwatch(review_id, queue)
+    
+    @staticmethod
+    async def _wait_for_result(queue: asyncio.Queue, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Next completed/failed event from a review's event queue, or None on timeout
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                event = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                return None
+            if event.get("type") in ("completed", "failed"):
+                return event
+    
+    async def get_partial_review(self, review_id: str, user_id: Optional[str] = None) -> Optional[PartialReviewResponse]:
+        """
+        Get the feedback sections generated so far, without loading the code
+        """
+        try:
+            db = get_database()
+            review_doc = await db.reviews.find_one(
+                {"_id": ObjectId(review_id)},
+                {"status": 1, "partial_feedback": 1, "feedback": 1, "user_id": 1}
+            )
+            
+            if not review_doc:
+                return None
+            
+            if user_id and review_doc.get("user_id") != user_id:
+                return None
+            
+            feedback = review_doc.get("feedback")
+            
+            return PartialReviewResponse(
+                id=str(review_doc["_id"]),
+                status=review_doc["status"],
+                sections=feedback or review_doc.get("partial_feedback") or {},
+                feedback=ReviewFeedback(**feedback) if feedback else None
+            )
+            
+        except Exception as e:
+            print(f"Error fetching partial review: {e}")
+            return None
+    
+    async def watch_review(self, review_id: str, user_id: Optional[str] = None) -> Optional[AsyncIterator[str]]:
+        """
+        Server-Sent Events for a review: its current status, then each transition
+        (with streamed sections and the final feedback) until it finishes.
+        Returns None when the review does not exist.
+        """
+        if not ObjectId.is_valid(review_id):
+            return None
+        
+        # Subscribe before reading the stored state so no transition falls in between
+        queue = await review_events.watch(review_id)
+        review_doc = await self._event_state(review_id)
+        
+        if not review_doc or (user_id and review_doc.get("user_id") != user_id):
+            if queue is not None:
+                await review_events.unwatch(review_id, queue)
+            return None
+        
+        return self._event_stream(review_id, review_doc, queue)
+    
+    async def _event_state(self, review_id: str) -> Optional[Dict[str, Any]]:
+        db = get_database()
+        return await db.reviews.find_one(
+            {"_id": ObjectId(review_id)},
+            {"status": 1, "feedback": 1, "error_message": 1, "completed_at": 1, "processing_time": 1, "user_id": 1}
+        )
+    
+    @staticmethod
+    def _state_event(review_id: str, review_doc: Dict[str, Any]) -> Dict[str, Any]:
+        status = review_doc["status"]
+        event = {"type": "status", "review_id": review_id, "status": status}
+        if status == ReviewStatus.COMPLETED:
+            event.update(
+                type="completed",
+                feedback=review_doc.get("feedback"),
+                completed_at=review_doc.get("completed_at"),
+                processing_time=review_doc.get("processing_time")
+            )
+        elif status == ReviewStatus.FAILED:
+            event.update(type="failed", error_message=review_doc.get("error_message"), completed_at=review_doc.get("completed_at"))
+        return event
+    
+    async def _event_stream(
+        self,
+        review_id: str,
+        review_doc: Dict[str, Any],
+        queue: Optional[asyncio.Queue]
+    ) -> AsyncIterator[str]:
+        try:
+            event = self._state_event(review_id, review_doc)
+            yield format_event(event)
+            
+            deadline = time.monotonic() + settings.REVIEW_EVENTS_MAX_SECONDS
+            while event["type"] not in ("completed", "failed"):
+                if time.monotonic() > deadline:
+                    yield format_event({"type": "timeout", "review_id": review_id})
+                    return
+                
+                if queue is None:
+                    # No pub/sub (Upstash REST): poll the status instead
+                    await asyncio.sleep(settings.REVIEW_EVENTS_POLL_SECONDS)
+                    review_doc = await self._event_state(review_id)
+                    if not review_doc:
+                        return
+                    if review_doc["status"] == event["status"]:
+                        yield ": keepalive\n\n"
+                        continue
+                    event = self._state_event(review_id, review_doc)
+                else:
+                    try:
+                        event = await asyncio.wait_for(queue.get(), settings.REVIEW_EVENTS_KEEPALIVE_SECONDS)
+                    except asyncio.TimeoutError:
+                        yield ": keepalive\n\n"
+                        continue
+                
+                yield format_event(event)
+        finally:
+            if queue is not None:
+                await review_events.unwatch(review_id, queue)
+    
+    async def get_batch(self, batch_id: str, user_id: Optional[str] = None) -> Optional[BatchStatusResponse]:
+        """
+        Aggregate status of a bulk submission, from one query over its reviews
+        """
+        try:
+            if not ObjectId.is_valid(batch_id):
+                return None
+            
+            db = get_database()
+            batch = await db.submission_batches.find_one({"_id": ObjectId(batch_id)})
+            
+            if not batch or (user_id and batch.get("user_id") != user_id):
+                return None
+            
+            cursor = db.reviews.find({"submission_batch_id": batch_id}, {"status": 1, "path": 1})
+            docs = {str(doc["_id"]): doc async for doc in cursor}
+            
+            reviews = [
+                BatchReviewItem(id=review_id, path=docs[review_id].get("path"), status=docs[review_id]["status"])
+                for review_id in batch["review_ids"] if review_id in docs
+            ]
+            counts = {status: 0 for status in ReviewStatus}
+            for review in reviews:
+                counts[review.status] += 1
+            
+            if counts[ReviewStatus.PENDING] + counts[ReviewStatus.IN_PROGRESS] == 0:
+                status = ReviewStatus.COMPLETED
+            elif counts[ReviewStatus.PENDING] == len(reviews):
+                status = ReviewStatus.PENDING
+            else:
+                status = ReviewStatus.IN_PROGRESS
+            
+            return BatchStatusResponse(
+                batch_id=batch_id,
+                status=status,
+                total=batch["total"],
+                pending=counts[ReviewStatus.PENDING],
+                in_progress=counts[ReviewStatus.IN_PROGRESS],
+                completed=counts[ReviewStatus.COMPLETED],
+                failed=counts[ReviewStatus.FAILED],
+                cache_hits=batch.get("cache_hits", 0),
+                reviews=reviews,
+                created_at=batch.get("created_at")
+            )
+            
+        except Exception as e:
+            print(f"Error fetching batch: {e}")
+            return None
     
     async def list_reviews(
         self, 
@@ -6,10 +6,13 @@ from pymongo import DESCENDING
 
 from ..core.database import get_database
 from ..models.review import ReviewStatus
-from ..models.stats import StatsResponse, LanguageStats, DailyStats, CommonIssue
+from ..models.stats import StatsResponse, LanguageStats, DailyStats, CommonIssue, CostBreakdown
 
 logger = logging.getLogger(__name__)
 
+# cost_info sources of reviews answered without calling the AI provider
+NO_UPSTREAM_SOURCES = ("cache", "carried_forward")
+
 
 class StatsService:
     def __init__(self):
@@ -53,6 +56,8 @@ class StatsService:
             
             score_distribution = await self._get_score_distribution(user_id=user_id)
             
+            cost_stats = await self._get_cost_stats(user_id=user_id)
+            
             return StatsResponse(
                 total_reviews=total_reviews,
                 total_completed=total_completed,
@@ -62,7 +67,8 @@ class StatsService:
                 language_stats=language_stats,
                 daily_stats=daily_stats,
                 common_issues=common_issues,
-                score_distribution=score_distribution
+                score_distribution=score_distribution,
+                **cost_stats
             )
             
         except Exception as e:
@@ -196,6 +202,92 @@ class StatsService:
             print(f"Error getting common issues: {e}")
             return []
     
+    async def _get_cost_stats(self, user_id: str = None) -> Dict[str, Any]:
+        """
+        Get token usage, cost and upstream latency totals with per-language,
+        per-day and (system-wide only) per-user breakdowns
+        """
+        try:
+            db = get_database()
+            
+            match_filter = {"status": ReviewStatus.COMPLETED, "feedback.cost_info": {"$type": "object"}}
+            if user_id:
+                match_filter["user_id"] = user_id
+            
+            sums = {
+                "reviews": {"$sum": 1},
+                "prompt_tokens": {"$sum": {"$ifNull": ["$feedback.cost_info.prompt_tokens", 0]}},
+                "completion_tokens": {"$sum": {"$ifNull": ["$feedback.cost_info.completion_tokens", 0]}},
+                "cached_tokens": {"$sum": {"$ifNull": ["$feedback.cost_info.cached_tokens", 0]}},
+                "cost_usd": {"$sum": {"$ifNull": ["$feedback.cost_info.cost_usd", 0]}},
+                # Reviews answered without an upstream call record 0 ms; $avg skips the nulls
+                "avg_latency": {"$avg": {"$cond": [
+                    {"$in": ["$feedback.cost_info.source", list(NO_UPSTREAM_SOURCES)]},
+                    None,
+                    "$feedback.cost_info.upstream_latency_ms"
+                ]}}
+            }
+            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+            
+            facets = {
+                "totals": [{"$group": {
+                    "_id": None,
+                    **sums,
+                    "cache_served": {"$sum": {"$cond": [{"$eq": ["$feedback.cost_info.source", "cache"]}, 1, 0]}}
+                }}],
+                "by_language": [
+                    {"$group": {"_id": "$language", **sums}},
+                    {"$sort": {"cost_usd": -1}},
+                    {"$limit": 10}
+                ],
+                "by_day": [
+                    {"$match": {"created_at": {"$gte": thirty_days_ago}}},
+                    {"$group": {"_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}}, **sums}},
+                    {"$sort": {"_id": 1}}
+                ]
+            }
+            if not user_id:
+                facets["by_user"] = [
+                    {"$group": {"_id": "$user_id", **sums}},
+                    {"$sort": {"cost_usd": -1}},
+                    {"$limit": 10}
+                ]
+            
+            results = await db.reviews.aggregate([{"$match": match_filter}, {"$facet": facets}]).to_list(length=1)
+            result = results[0] if results else {}
+            
+            totals = (result.get("totals") or [{}])[0]
+            
+            def breakdown(rows: List[Dict[str, Any]]) -> List[CostBreakdown]:
+                return [
+                    CostBreakdown(
+                        key=str(row["_id"] or "anonymous"),
+                        reviews=row["reviews"],
+                        prompt_tokens=row["prompt_tokens"],
+                        completion_tokens=row["completion_tokens"],
+                        cached_tokens=row["cached_tokens"],
+                        cost_usd=round(row["cost_usd"], 6),
+                        avg_upstream_latency_ms=round(row["avg_latency"], 1) if row.get("avg_latency") is not None else None
+                    )
+                    for row in rows
+                ]
+            
+            return {
+                "total_cost_usd": round(totals.get("cost_usd", 0.0), 6),
+                "total_prompt_tokens": totals.get("prompt_tokens", 0),
+                "total_completion_tokens": totals.get("completion_tokens", 0),
+                "total_cached_tokens": totals.get("cached_tokens", 0),
+                "average_upstream_latency_ms": round(totals.get("avg_latency") or 0.0, 1),
+                "cache_served_reviews": totals.get("cache_served", 0),
+                "cost_by_language": breakdown(result.get("by_language", [])),
+                "cost_by_day": breakdown(result.get("by_day", [])),
+                "cost_by_user": breakdown(result.get("by_user", []))
+            }
+            
+        except Exception as e:
+            logger.error(f"Error getting cost stats: {e}")
+            return {}
+    
     async def _get_score_distribution(self, user_id: str = None) -> Dict[str, int]:
         """
         Get score distribution
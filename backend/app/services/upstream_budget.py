@@ -0,0 +1,197 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from ..core.config import settings
+from ..core.redis_client import redis_client
+
+# Two token buckets (requests and tokens per minute) refilled continuously from
+# the Redis clock. A grant is all or nothing; a refusal returns the wait until
+# the request would fit. Zero capacity disables that dimension.
+TOKEN_BUCKET_SCRIPT = """
+local rpm = tonumber(ARGV[1])
+local tpm = tonumber(ARGV[2])
+local want_requests = tonumber(ARGV[3])
+local want_tokens = tonumber(ARGV[4])
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'requests', 'tokens', 'updated')
+local requests = tonumber(state[1]) or rpm
+local tokens = tonumber(state[2]) or tpm
+local elapsed = math.max(0, now - (tonumber(state[3]) or now))
+
+requests = math.min(rpm, requests + elapsed * rpm / 60)
+tokens = math.min(tpm, tokens + elapsed * tpm / 60)
+
+local granted = 0
+local wait = 0
+local requests_ok = rpm <= 0 or requests >= want_requests
+local tokens_ok = tpm <= 0 or tokens >= want_tokens
+
+if requests_ok and tokens_ok then
+    granted = 1
+    if rpm > 0 then requests = requests - want_requests end
+    if tpm > 0 then tokens = tokens - want_tokens end
+else
+    if not requests_ok then wait = math.max(wait, (want_requests - requests) * 60 / rpm) end
+    if not tokens_ok then wait = math.max(wait, (want_tokens - tokens) * 60 / tpm) end
+end
+
+redis.call('HSET', KEYS[1], 'requests', tostring(requests), 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], 120)
+return {granted, tostring(wait), tostring(requests), tostring(tokens)}
+"""
+
+
+class UpstreamBudget:
+    """
+    Cluster-wide requests/tokens-per-minute budget for one AI backend, shared by
+    every worker through a Redis token bucket.
+    
+    Permits are taken from Redis in small batches and spent locally, so most
+    calls do not pay a Redis round trip. When Redis is unreachable the budget
+    fails open and the per-process adaptive concurrency limit still applies.
+    """
+    
+    def __init__(self, name: str, rpm: int = 0, tpm: int = 0):
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.key = f"ai_budget:{name}"
+        
+        self.local_requests = 0
+        self.local_tokens = 0
+        self._lock: Optional[asyncio.Lock] = None
+        
+        self.acquired = 0
+        self.local_hits = 0
+        self.redis_calls = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.fail_open = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.rpm > 0 or self.tpm > 0
+    
+    @property
+    def lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+    
+    def _take_local(self, tokens: int) -> bool:
+        if (self.rpm <= 0 or self.local_requests >= 1) and (self.tpm <= 0 or self.local_tokens >= tokens):
+            self.local_requests -= 1 if self.rpm > 0 else 0
+            self.local_tokens -= tokens if self.tpm > 0 else 0
+            return True
+        return False
+    
+    def _prefetch_amounts(self, tokens: int) -> Tuple[int, int]:
+        """
+        Permits to take from Redis: a few calls' worth, bounded to 5% of the
+        per-minute capacity so idle workers cannot hoard the budget
+        """
+        batch = settings.AI_BUDGET_PREFETCH_REQUESTS
+        want_requests = max(0, max(1, min(batch, self.rpm // 20)) - self.local_requests) if self.rpm > 0 else 0
+        want_tokens = 0
+        if self.tpm > 0:
+            needed = max(0, tokens - self.local_tokens)
+            want_tokens = max(needed, min(tokens * batch - self.local_tokens, self.tpm // 20))
+        return want_requests, want_tokens
+    
+    def _exact_amounts(self, tokens: int) -> Tuple[int, int]:
+        return (
+            max(0, 1 - self.local_requests) if self.rpm > 0 else 0,
+            max(0, tokens - self.local_tokens) if self.tpm > 0 else 0
+        )
+    
+    async def _reserve(self, requests: int, tokens: int) -> Optional[Tuple[bool, float, float, float]]:
+        self.redis_calls += 1
+        result = await redis_client.eval(TOKEN_BUCKET_SCRIPT, [self.key], [self.rpm, self.tpm, requests, tokens])
+        if not result:
+            return None
+        return int(result[0]) == 1, float(result[1]), float(result[2]), float(result[3])
+    
+    async def acquire(self, tokens: int):
+        """
+        Wait until the shared budget covers one request of `tokens` tokens
+        """
+        if not self.enabled:
+            return
+        
+        self.acquired += 1
+        if self._take_local(tokens):
+            self.local_hits += 1
+            return
+        
+        deadline = time.monotonic() + settings.AI_BUDGET_MAX_WAIT
+        async with self.lock:
+            # Another caller may have refilled while this one waited for the lock
+            if self._take_local(tokens):
+                self.local_hits += 1
+                return
+            
+            while True:
+                want_requests, want_tokens = self._prefetch_amounts(tokens)
+                reservation = await self._reserve(want_requests, want_tokens)
+                if reservation is not None and not reservation[0]:
+                    # The batch does not fit; try for exactly this call
+                    exact = self._exact_amounts(tokens)
+                    if exact != (want_requests, want_tokens):
+                        want_requests, want_tokens = exact
+                        reservation = await self._reserve(want_requests, want_tokens)
+                
+                if reservation is None:
+                    self.fail_open += 1
+                    return
+                
+                granted, wait, _, _ = reservation
+                if granted:
+                    self.local_requests += want_requests
+                    self.local_tokens += want_tokens
+                    self._take_local(tokens)
+                    return
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print(f"Upstream budget for {self.name} still exhausted after {settings.AI_BUDGET_MAX_WAIT}s - calling anyway")
+                    return
+                
+                delay = min(max(wait, 0.05), remaining)
+                self.waits += 1
+                self.wait_seconds += delay
+                await asyncio.sleep(delay)
+    
+    async def snapshot(self) -> Dict[str, Any]:
+        """
+        Budget utilization: shared bucket levels plus this worker's prefetch statistics
+        """
+        snapshot: Dict[str, Any] = {
+            "name": self.name,
+            "enabled": self.enabled,
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "local_requests": self.local_requests,
+            "local_tokens": self.local_tokens,
+            "acquired": self.acquired,
+            "local_hit_rate_percent": round(self.local_hits / self.acquired * 100, 2) if self.acquired else 0,
+            "redis_calls": self.redis_calls,
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 2),
+            "fail_open": self.fail_open
+        }
+        
+        if self.enabled:
+            reservation = await self._reserve(0, 0)
+            self.redis_calls -= 1
+            if reservation is not None:
+                _, _, requests, tokens = reservation
+                snapshot["requests_available"] = round(requests, 1) if self.rpm else None
+                snapshot["tokens_available"] = round(tokens) if self.tpm else None
+                snapshot["request_utilization_percent"] = round((1 - requests / self.rpm) * 100, 2) if self.rpm else None
+                snapshot["token_utilization_percent"] = round((1 - tokens / self.tpm) * 100, 2) if self.tpm else None
+        
+        return snapshot
@@ -0,0 +1,354 @@
+"""
+Local OpenAI-compatible chat-completions simulator for development and load testing.
+
+Point the backend at it with OPENAI_BASE_URL=http://localhost:9000/v1 and run:
+
+    uvicorn app.simulator:app --port 9000
+    # or
+    python -m app.simulator --port 9000
+
+Behaviour is configured with SIMULATOR_* environment variables and can be
+changed at runtime through GET/PUT /simulator/config.
+"""
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+import uuid
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from fastapi import FastAPI, File, Form, Request, UploadFile
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, BaseSettings
+
+from .utils.token_estimator import estimate_message_tokens, estimate_tokens
+
+
+class SimulatorConfig(BaseSettings):
+    latency_median_ms: float = 800.0
+    latency_p99_ms: float = 4000.0
+    tokens_per_second: float = 150.0
+    stream_chunk_chars: int = 12
+    error_rate: float = 0.0
+    rate_limit_rpm: int = 0
+    rate_limit_tpm: int = 0
+    prefix_cache_min_tokens: int = 1024
+    batch_completion_seconds: float = 5.0
+    seed: Optional[int] = None
+
+    class Config:
+        env_prefix = "SIMULATOR_"
+
+
+class SimulatorConfigUpdate(BaseModel):
+    latency_median_ms: Optional[float] = None
+    latency_p99_ms: Optional[float] = None
+    tokens_per_second: Optional[float] = None
+    stream_chunk_chars: Optional[int] = None
+    error_rate: Optional[float] = None
+    rate_limit_rpm: Optional[int] = None
+    rate_limit_tpm: Optional[int] = None
+    prefix_cache_min_tokens: Optional[int] = None
+    batch_completion_seconds: Optional[float] = None
+
+
+# 99th percentile of the standard normal distribution
+Z_99 = 2.326
+
+
+class UpstreamSimulator:
+    def __init__(self, config: Optional[SimulatorConfig] = None):
+        self.config = config or SimulatorConfig()
+        self.random = random.Random(self.config.seed)
+        self._window: Deque[Tuple[float, int]] = deque()
+        self._seen_prefixes: set = set()
+        self.request_count = 0
+        self.files: Dict[str, bytes] = {}
+        self.batches: Dict[str, dict] = {}
+
+    def sample_latency(self) -> float:
+        """
+        Sample time-to-first-token in seconds from a log-normal distribution
+        """
+        median = max(self.config.latency_median_ms, 1.0)
+        p99 = max(self.config.latency_p99_ms, median)
+        mu = math.log(median)
+        sigma = (math.log(p99) - mu) / Z_99
+        return self.random.lognormvariate(mu, sigma) / 1000
+
+    def _trim_window(self, now: float):
+        while self._window and self._window[0][0] <= now - 60:
+            self._window.popleft()
+
+    def check_rate_limit(self, tokens: int) -> Tuple[bool, dict]:
+        """
+        Sliding one-minute window over requests and tokens, returning OpenAI-style headers
+        """
+        now = time.time()
+        self._trim_window(now)
+
+        used_requests = len(self._window)
+        used_tokens = sum(count for _, count in self._window)
+        rpm = self.config.rate_limit_rpm
+        tpm = self.config.rate_limit_tpm
+
+        reset_seconds = 60 - (now - self._window[0][0]) if self._window else 0.0
+        allowed = (not rpm or used_requests < rpm) and (not tpm or used_tokens + tokens <= tpm)
+
+        if allowed:
+            self._window.append((now, tokens))
+            used_requests += 1
+            used_tokens += tokens
+
+        headers = {
+            "x-ratelimit-limit-requests": str(rpm or 1_000_000),
+            "x-ratelimit-remaining-requests": str(max(0, rpm - used_requests) if rpm else 1_000_000),
+            "x-ratelimit-reset-requests": f"{reset_seconds:.3f}s",
+            "x-ratelimit-limit-tokens": str(tpm or 100_000_000),
+            "x-ratelimit-remaining-tokens": str(max(0, tpm - used_tokens) if tpm else 100_000_000),
+            "x-ratelimit-reset-tokens": f"{reset_seconds:.3f}s",
+        }
+        if not allowed:
+            headers["retry-after"] = str(max(1, math.ceil(reset_seconds)))
+
+        return allowed, headers
+
+    def cached_prompt_tokens(self, messages: list) -> int:
+        """
+        Emulate provider prefix caching: the leading messages except the last one
+        count as cached once the same prefix has been seen before
+        """
+        prefix = messages[:-1]
+        prefix_tokens = estimate_message_tokens(prefix) if prefix else 0
+        if prefix_tokens < self.config.prefix_cache_min_tokens:
+            return 0
+
+        key = hashlib.sha256(json.dumps(prefix, sort_keys=True).encode("utf-8")).hexdigest()
+        if key in self._seen_prefixes:
+            return prefix_tokens
+        self._seen_prefixes.add(key)
+        return 0
+
+    def build_review(self, messages: list) -> str:
+        """
+        Deterministic fake review for the submitted code
+        """
+        content = messages[-1].get("content", "") if messages else ""
+        digest = int(hashlib.sha256(content.encode("utf-8")).hexdigest(), 16)
+        lines = content.count("\n") + 1
+
+        return json.dumps({
+            "quality_score": 3 + digest % 7,
+            "issues": [f"Simulated issue #{digest % 97} in a {lines}-line submission"],
+            "suggestions": ["Add docstrings to public functions", "Add unit tests for edge cases"],
+            "security_concerns": [] if digest % 3 else ["Validate external input before use"],
+            "performance_recommendations": ["Avoid repeated work inside loops"],
+            "positive_aspects": ["Readable structure"]
+        })
+
+    def complete_batch(self, batch: dict):
+        """
+        Run every request of a batch and store the output file
+        """
+        output_lines = []
+        for line in self.files[batch["input_file_id"]].decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            messages = request["body"].get("messages", [])
+            completion = self.build_review(messages)
+            output_lines.append(json.dumps({
+                "id": f"batch_req_{uuid.uuid4().hex[:12]}",
+                "custom_id": request["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "body": {
+                        "object": "chat.completion",
+                        "model": request["body"].get("model"),
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": completion}, "finish_reason": "stop"}],
+                        "usage": self.usage(messages, completion)
+                    }
+                },
+                "error": None
+            }))
+
+        output_file_id = f"file-sim-{uuid.uuid4().hex[:12]}"
+        self.files[output_file_id] = "\n".join(output_lines).encode("utf-8")
+        batch.update({
+            "status": "completed",
+            "output_file_id": output_file_id,
+            "completed_at": int(time.time()),
+            "request_counts": {"total": len(output_lines), "completed": len(output_lines), "failed": 0}
+        })
+
+    def usage(self, messages: list, completion: str) -> dict:
+        prompt_tokens = estimate_message_tokens(messages)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": estimate_tokens(completion),
+            "total_tokens": prompt_tokens + estimate_tokens(completion),
+            "prompt_tokens_details": {"cached_tokens": self.cached_prompt_tokens(messages)}
+        }
+
+
+simulator = UpstreamSimulator()
+
+app = FastAPI(title="OpenAI Simulator", description="Local stand-in for the OpenAI chat-completions API")
+
+
+def _error(status: int, message: str, error_type: str, headers: Optional[dict] = None) -> JSONResponse:
+    return JSONResponse(
+        status_code=status,
+        content={"error": {"message": message, "type": error_type}},
+        headers=headers
+    )
+
+
+@app.get("/v1/models")
+async def list_models():
+    return {"object": "list", "data": [{"id": "gpt-4.1-mini", "object": "model"}]}
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    messages = body.get("messages", [])
+    model = body.get("model", "gpt-4.1-mini")
+    simulator.request_count += 1
+
+    requested_tokens = estimate_message_tokens(messages) + int(body.get("max_completion_tokens") or 0)
+    allowed, headers = simulator.check_rate_limit(requested_tokens)
+    if not allowed:
+        return _error(429, "Rate limit reached (simulated)", "rate_limit_exceeded", headers)
+
+    await asyncio.sleep(simulator.sample_latency())
+
+    if simulator.random.random() < simulator.config.error_rate:
+        return _error(500, "Internal server error (simulated)", "server_error", headers)
+
+    completion = simulator.build_review(messages)
+    usage = simulator.usage(messages, completion)
+    completion_id = f"chatcmpl-sim-{uuid.uuid4().hex[:12]}"
+    created = int(time.time())
+
+    if not body.get("stream"):
+        return JSONResponse(content={
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": completion},
+                "finish_reason": "stop"
+            }],
+            "usage": usage
+        }, headers=headers)
+
+    include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+    chunk_chars = max(1, simulator.config.stream_chunk_chars)
+    chunk_delay = estimate_tokens(completion[:chunk_chars]) / max(simulator.config.tokens_per_second, 1.0)
+
+    async def events():
+        def event(choices: list, extra: Optional[dict] = None) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": choices,
+                **(extra or {})
+            }
+            return f"data: {json.dumps(payload)}\n\n"
+
+        for start in range(0, len(completion), chunk_chars):
+            yield event([{"index": 0, "delta": {"content": completion[start:start + chunk_chars]}, "finish_reason": None}])
+            await asyncio.sleep(chunk_delay)
+
+        yield event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if include_usage:
+            yield event([], {"usage": usage})
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
+
+
+@app.post("/v1/files")
+async def upload_file(file: UploadFile = File(...), purpose: str = Form(...)):
+    content = await file.read()
+    file_id = f"file-sim-{uuid.uuid4().hex[:12]}"
+    simulator.files[file_id] = content
+    return {"id": file_id, "object": "file", "bytes": len(content), "filename": file.filename, "purpose": purpose}
+
+
+@app.get("/v1/files/{file_id}/content")
+async def file_content(file_id: str):
+    if file_id not in simulator.files:
+        return _error(404, f"No such file: {file_id}", "invalid_request_error")
+    return PlainTextResponse(simulator.files[file_id].decode("utf-8"))
+
+
+@app.post("/v1/batches")
+async def create_batch(request: Request):
+    body = await request.json()
+    if body.get("input_file_id") not in simulator.files:
+        return _error(400, "Unknown input_file_id", "invalid_request_error")
+
+    batch_id = f"batch_sim_{uuid.uuid4().hex[:12]}"
+    simulator.batches[batch_id] = {
+        "id": batch_id,
+        "object": "batch",
+        "endpoint": body.get("endpoint"),
+        "input_file_id": body["input_file_id"],
+        "completion_window": body.get("completion_window", "24h"),
+        "status": "in_progress",
+        "output_file_id": None,
+        "error_file_id": None,
+        "created_at": int(time.time())
+    }
+    return simulator.batches[batch_id]
+
+
+@app.get("/v1/batches/{batch_id}")
+async def get_batch(batch_id: str):
+    batch = simulator.batches.get(batch_id)
+    if not batch:
+        return _error(404, f"No such batch: {batch_id}", "invalid_request_error")
+
+    if batch["status"] == "in_progress" and time.time() - batch["created_at"] >= simulator.config.batch_completion_seconds:
+        simulator.complete_batch(batch)
+    return batch
+
+
+@app.get("/simulator/config", response_model=SimulatorConfig)
+async def get_config():
+    return simulator.config
+
+
+@app.put("/simulator/config", response_model=SimulatorConfig)
+async def update_config(update: SimulatorConfigUpdate):
+    simulator.config = simulator.config.copy(update=update.dict(exclude_none=True))
+    return simulator.config
+
+
+@app.get("/simulator/stats")
+async def get_stats():
+    return {
+        "requests": simulator.request_count,
+        "requests_last_minute": len(simulator._window)
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the local OpenAI simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    args = parser.parse_args()
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,189 @@
+import asyncio
+import re
+import time
+from typing import Any, Dict, Optional
+
+from ..core.config import settings
+
+DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+DURATION_SECONDS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds until a rate-limit window resets ("1s", "6m0s", "20ms" or plain seconds)
+    """
+    if not value:
+        return None
+
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    parts = DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * DURATION_SECONDS[unit] for amount, unit in parts)
+
+
+def _header_int(headers, name: str) -> Optional[int]:
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit for upstream calls.
+
+    Each success raises the limit by 1/limit (about +1 per round trip at full
+    concurrency); a 429/503 or a latency far above the no-load baseline cuts it
+    multiplicatively, at most once per round trip so a burst of errors from the
+    same window counts once. When the x-ratelimit-remaining-* headers show the
+    provider's quota will not cover the calls already in flight, new calls are
+    held until the window resets. Calls over the limit wait in FIFO order.
+    """
+
+    def __init__(
+        self,
+        name: str = "upstream",
+        initial_limit: Optional[int] = None,
+        min_limit: Optional[int] = None,
+        max_limit: Optional[int] = None
+    ):
+        self.name = name
+        self.min_limit = min_limit or settings.AI_CONCURRENCY_MIN
+        self.max_limit = max_limit or settings.AI_CONCURRENCY_MAX
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial_limit or settings.AI_CONCURRENCY_INITIAL)))
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.paused_until = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+
+        self.baseline_latency: Optional[float] = None
+        self.ewma_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self.tokens_per_request: Optional[float] = None
+
+        self.remaining_requests: Optional[int] = None
+        self.remaining_tokens: Optional[int] = None
+        self.decreases = 0
+        self.pauses = 0
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    @property
+    def effective_limit(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    async def acquire(self):
+        """
+        Wait for a free slot (and for any rate-limit pause to end)
+        """
+        self.waiting += 1
+        try:
+            async with self.condition:
+                while True:
+                    pause = self.paused_until - time.monotonic()
+                    if pause > 0:
+                        try:
+                            await asyncio.wait_for(self.condition.wait(), pause)
+                        except asyncio.TimeoutError:
+                            pass
+                        continue
+                    if self.in_flight < self.effective_limit:
+                        break
+                    await self.condition.wait()
+                self.in_flight += 1
+        finally:
+            self.waiting -= 1
+
+    async def release(self):
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify(max(1, self.effective_limit - self.in_flight))
+
+    def record_success(self, latency: float):
+        alpha = settings.ROUTER_EWMA_ALPHA
+        self.ewma_latency = latency if self.ewma_latency is None else (1 - alpha) * self.ewma_latency + alpha * latency
+
+        # Baseline follows drops at once and rises slowly, approximating the no-load latency
+        if self.baseline_latency is None or latency < self.baseline_latency:
+            self.baseline_latency = latency
+        else:
+            self.baseline_latency += 0.01 * (latency - self.baseline_latency)
+
+        if latency > settings.AI_CONCURRENCY_LATENCY_TOLERANCE * self.baseline_latency:
+            self._decrease(0.9, "latency")
+        elif self.in_flight >= self.effective_limit - 1:
+            # Only grow while the limit is actually the constraint
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def record_overload(self, retry_after: Optional[float] = None):
+        """
+        The provider rejected a call for capacity (429/503)
+        """
+        self._decrease(settings.AI_CONCURRENCY_BACKOFF, "overload")
+        if retry_after:
+            self._pause(retry_after)
+
+    def observe_headers(self, headers, tokens: Optional[int] = None):
+        """
+        Read x-ratelimit-remaining-*/reset-* and hold new calls when the remaining
+        quota will be used up by the calls already in flight
+        """
+        if tokens:
+            self.tokens_per_request = tokens if self.tokens_per_request is None else 0.8 * self.tokens_per_request + 0.2 * tokens
+
+        remaining_requests = _header_int(headers, "x-ratelimit-remaining-requests")
+        remaining_tokens = _header_int(headers, "x-ratelimit-remaining-tokens")
+        others_in_flight = max(0, self.in_flight - 1)
+
+        if remaining_requests is not None:
+            self.remaining_requests = remaining_requests
+            if remaining_requests <= others_in_flight:
+                self._pause(parse_reset_duration(headers.get("x-ratelimit-reset-requests")))
+
+        if remaining_tokens is not None:
+            self.remaining_tokens = remaining_tokens
+            if self.tokens_per_request and remaining_tokens < self.tokens_per_request * (others_in_flight + 1):
+                self._pause(parse_reset_duration(headers.get("x-ratelimit-reset-tokens")))
+
+    def _decrease(self, factor: float, reason: str):
+        now = time.monotonic()
+        if now - self._last_decrease < (self.ewma_latency or 0.0):
+            return
+        self._last_decrease = now
+        self.decreases += 1
+        self.limit = max(float(self.min_limit), self.limit * factor)
+        print(f"{self.name} concurrency limit lowered to {self.effective_limit} ({reason})")
+
+    def _pause(self, seconds: Optional[float]):
+        if not seconds:
+            return
+        until = time.monotonic() + min(seconds, settings.AI_RETRY_MAX_DELAY)
+        if until > self.paused_until:
+            self.paused_until = until
+            self.pauses += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": self.effective_limit,
+            "limit_exact": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "paused_for_seconds": round(max(0.0, self.paused_until - time.monotonic()), 2),
+            "baseline_latency_ms": round(self.baseline_latency * 1000, 1) if self.baseline_latency is not None else None,
+            "ewma_latency_ms": round(self.ewma_latency * 1000, 1) if self.ewma_latency is not None else None,
+            "remaining_requests": self.remaining_requests,
+            "remaining_tokens": self.remaining_tokens,
+            "decreases": self.decreases,
+            "pauses": self.pauses
+        }
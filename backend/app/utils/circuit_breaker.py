@@ -0,0 +1,113 @@
+import time
+from typing import Any, Dict, Optional
+
+from ..core.config import settings
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling upstream while the circuit is open
+    """
+
+    def __init__(self, name: str, retry_in: float):
+        self.retry_in = retry_in
+        super().__init__(f"{name} circuit is open - retry in {retry_in:.0f}s")
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed:    calls flow; failure_threshold consecutive failures open the circuit.
+    open:      calls fail fast until recovery_timeout has elapsed.
+    half_open: a limited number of probe calls are let through; a success closes
+               the circuit, a failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str = "upstream",
+        failure_threshold: Optional[int] = None,
+        recovery_timeout: Optional[float] = None,
+        half_open_max_calls: int = 1
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.AI_CIRCUIT_FAILURE_THRESHOLD
+        self.recovery_timeout = recovery_timeout or settings.AI_CIRCUIT_RECOVERY_SECONDS
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self.total_failures = 0
+        self.total_rejections = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def retry_in(self) -> float:
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+
+    def before_call(self):
+        """
+        Raise CircuitOpenError if a call is not allowed right now
+        """
+        state = self.state
+
+        if state == self.OPEN:
+            self.total_rejections += 1
+            raise CircuitOpenError(self.name, self.retry_in())
+
+        if state == self.HALF_OPEN:
+            if self._half_open_calls >= self.half_open_max_calls:
+                self.total_rejections += 1
+                raise CircuitOpenError(self.name, self.recovery_timeout)
+            self._half_open_calls += 1
+
+    def release(self):
+        """
+        Return the probe slot of a call that ended without an outcome
+        """
+        if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def record_success(self):
+        self._consecutive_failures = 0
+        if self._state != self.CLOSED:
+            print(f"{self.name} circuit closed")
+        self._state = self.CLOSED
+
+    def record_failure(self):
+        self.total_failures += 1
+        self._consecutive_failures += 1
+
+        if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self.times_opened += 1
+                print(f"{self.name} circuit opened after {self._consecutive_failures} consecutive failures")
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "recovery_timeout_seconds": self.recovery_timeout,
+            "retry_in_seconds": round(self.retry_in(), 1),
+            "total_failures": self.total_failures,
+            "total_rejections": self.total_rejections,
+            "times_opened": self.times_opened
+        }
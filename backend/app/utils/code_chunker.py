@@ -0,0 +1,160 @@
+import re
+from dataclasses import dataclass
+from typing import List
+
+from ..models.review import ProgrammingLanguage
+
+
+@dataclass
+class CodeChunk:
+    start_line: int
+    end_line: int
+    text: str
+
+
+# Languages where top-level units are recognised by their first line
+HEADER_PATTERNS = {
+    "python": re.compile(r"^(@|def\s|async\s+def\s|class\s)"),
+    "ruby": re.compile(r"^(def\s|class\s|module\s)"),
+}
+
+# Brace languages: the depth at which top-level units (functions, classes, methods) close
+BRACE_UNIT_DEPTH = {
+    "javascript": 0,
+    "typescript": 0,
+    "go": 0,
+    "rust": 0,
+    "cpp": 0,
+    "php": 0,
+    "java": 1,
+    "csharp": 1,
+}
+
+STRING_OR_COMMENT = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|`[^`]*`|//.*$|#.*$')
+
+
+def _language_value(language: ProgrammingLanguage) -> str:
+    return language if isinstance(language, str) else language.value
+
+
+def _split_by_headers(lines: List[str], pattern: re.Pattern) -> List[int]:
+    """
+    Return start indexes of units whose header line matches pattern at column 0
+    """
+    starts = [0]
+    previous_is_decorator = False
+
+    for index, line in enumerate(lines):
+        is_header = bool(pattern.match(line))
+        if is_header and index > 0 and not previous_is_decorator:
+            starts.append(index)
+        if line.strip():
+            previous_is_decorator = line.startswith("@")
+
+    return starts
+
+
+def _split_by_braces(lines: List[str], unit_depth: int) -> List[int]:
+    """
+    Return start indexes of units that end where brace depth drops back to unit_depth
+    """
+    starts = [0]
+    depth = 0
+
+    for index, line in enumerate(lines):
+        stripped = STRING_OR_COMMENT.sub("", line)
+        before = depth
+        depth += stripped.count("{") - stripped.count("}")
+
+        if before > unit_depth and depth <= unit_depth and index + 1 < len(lines):
+            starts.append(index + 1)
+
+    return starts
+
+
+def split_units(code: str, language: ProgrammingLanguage) -> List[CodeChunk]:
+    """
+    Split code into top-level units (functions, classes, methods) on language-aware boundaries
+    """
+    lines = code.splitlines(keepends=True)
+    if not lines:
+        return []
+
+    language_str = _language_value(language)
+
+    if language_str in HEADER_PATTERNS:
+        starts = _split_by_headers(lines, HEADER_PATTERNS[language_str])
+    elif language_str in BRACE_UNIT_DEPTH:
+        starts = _split_by_braces(lines, BRACE_UNIT_DEPTH[language_str])
+    else:
+        starts = [0]
+
+    units = []
+    for position, start in enumerate(starts):
+        end = starts[position + 1] if position + 1 < len(starts) else len(lines)
+        units.append(CodeChunk(start_line=start + 1, end_line=end, text="".join(lines[start:end])))
+
+    return units
+
+
+def _split_oversized(unit: CodeChunk, max_chars: int) -> List[CodeChunk]:
+    pieces = []
+    current: List[str] = []
+    start_line = unit.start_line
+
+    for offset, line in enumerate(unit.text.splitlines(keepends=True)):
+        if current and sum(len(part) for part in current) + len(line) > max_chars:
+            pieces.append(CodeChunk(start_line, unit.start_line + offset - 1, "".join(current)))
+            current = []
+            start_line = unit.start_line + offset
+        current.append(line)
+
+    if current:
+        pieces.append(CodeChunk(start_line, unit.end_line, "".join(current)))
+
+    return pieces
+
+
+def split_code(code: str, language: ProgrammingLanguage, max_chunk_chars: int) -> List[CodeChunk]:
+    """
+    Pack adjacent top-level units into chunks of at most max_chunk_chars.
+    Units larger than the limit are split on line boundaries.
+    """
+    chunks: List[CodeChunk] = []
+
+    for unit in split_units(code, language):
+        pieces = _split_oversized(unit, max_chunk_chars) if len(unit.text) > max_chunk_chars else [unit]
+
+        for piece in pieces:
+            if chunks and len(chunks[-1].text) + len(piece.text) <= max_chunk_chars:
+                last = chunks[-1]
+                chunks[-1] = CodeChunk(last.start_line, piece.end_line, last.text + piece.text)
+            else:
+                chunks.append(piece)
+
+    return chunks
+
+
+def split_review_units(code: str, language: ProgrammingLanguage, min_chars: int, max_chars: int) -> List[CodeChunk]:
+    """
+    Top-level units for per-unit review and caching. A unit smaller than min_chars
+    is merged with the one after it, and units larger than max_chars are split on
+    line boundaries, so editing one function only changes the units it touches.
+    """
+    units: List[CodeChunk] = []
+
+    for unit in split_units(code, language):
+        pieces = _split_oversized(unit, max_chars) if len(unit.text) > max_chars else [unit]
+
+        for piece in pieces:
+            if units and len(units[-1].text) < min_chars and len(units[-1].text) + len(piece.text) <= max_chars:
+                last = units[-1]
+                units[-1] = CodeChunk(last.start_line, piece.end_line, last.text + piece.text)
+            else:
+                units.append(piece)
+
+    if len(units) > 1 and len(units[-1].text) < min_chars and len(units[-2].text) + len(units[-1].text) <= max_chars:
+        last = units.pop()
+        units[-1] = CodeChunk(units[-1].start_line, last.end_line, units[-1].text + last.text)
+
+    return units
@@ -0,0 +1,146 @@
+import difflib
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+LINE_REFERENCE = re.compile(r"\b[Ll]ines? (\d+)(?:\s*[-–]\s*(\d+))?")
+IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]{2,}")
+
+
+@dataclass
+class ChangedRegion:
+    start_line: int
+    end_line: int
+
+
+class DiffApplyError(ValueError):
+    """
+    The unified diff does not apply to the reviewed code
+    """
+
+
+def apply_unified_diff(original: str, diff: str) -> str:
+    """
+    Apply a unified diff (as produced by git diff / diff -u) to the original text
+    """
+    source = original.split("\n")
+    result: List[str] = []
+    position = 0
+    hunks = 0
+    lines = diff.replace("\r\n", "\n").split("\n")
+    index = 0
+
+    while index < len(lines):
+        header = HUNK_HEADER.match(lines[index])
+        index += 1
+        if not header:
+            continue
+
+        hunks += 1
+        old_count = int(header.group(2) or 1)
+        new_count = int(header.group(4) or 1)
+        start = int(header.group(1)) - 1 if old_count else int(header.group(1))
+        if start < position or start > len(source):
+            raise DiffApplyError(f"Hunk {hunks} starts at line {start + 1}, outside the reviewed code")
+        result.extend(source[position:start])
+        position = start
+
+        while (old_count or new_count) and index < len(lines):
+            line = lines[index]
+            index += 1
+            if line.startswith("\\"):
+                continue
+            marker, text = (line[:1], line[1:]) if line else (" ", "")
+            if marker in (" ", "-"):
+                if position >= len(source) or source[position] != text:
+                    raise DiffApplyError(f"Hunk {hunks} does not match the reviewed code at line {position + 1}")
+                position += 1
+                old_count -= 1
+                if marker == " ":
+                    result.append(text)
+                    new_count -= 1
+            elif marker == "+":
+                result.append(text)
+                new_count -= 1
+            else:
+                raise DiffApplyError(f"Hunk {hunks} is truncated")
+
+    if not hunks:
+        raise DiffApplyError("No hunks found in the diff")
+
+    result.extend(source[position:])
+    return "\n".join(result)
+
+
+def _opcodes(old_code: str, new_code: str) -> List[Tuple[str, int, int, int, int]]:
+    matcher = difflib.SequenceMatcher(None, old_code.split("\n"), new_code.split("\n"), autojunk=False)
+    return matcher.get_opcodes()
+
+
+def changed_regions(old_code: str, new_code: str, context: int = 3) -> List[ChangedRegion]:
+    """
+    1-based line ranges of the new code that were added or modified, widened by
+    `context` lines on each side and merged where they overlap. Pure deletions
+    yield the lines around the removal.
+    """
+    total = new_code.count("\n") + 1
+    regions: List[ChangedRegion] = []
+
+    for tag, _, _, new_start, new_end in _opcodes(old_code, new_code):
+        if tag == "equal":
+            continue
+        start = max(1, new_start + 1 - context)
+        end = min(total, max(new_end, new_start + 1) + context)
+        if regions and start <= regions[-1].end_line + 1:
+            regions[-1].end_line = max(regions[-1].end_line, end)
+        else:
+            regions.append(ChangedRegion(start, end))
+
+    return regions
+
+
+def unchanged_line_map(old_code: str, new_code: str) -> Dict[int, int]:
+    """
+    Map of 1-based old line numbers to their new line numbers, for lines kept verbatim
+    """
+    mapping = {}
+    for tag, old_start, old_end, new_start, _ in _opcodes(old_code, new_code):
+        if tag == "equal":
+            for offset in range(old_end - old_start):
+                mapping[old_start + offset + 1] = new_start + offset + 1
+    return mapping
+
+
+def removed_identifiers(old_code: str, new_code: str) -> Set[str]:
+    """
+    Identifiers of the old code that no longer appear anywhere in the new code
+    """
+    return set(IDENTIFIER.findall(old_code)) - set(IDENTIFIER.findall(new_code))
+
+
+def carry_forward_entry(entry: str, line_map: Dict[int, int], removed: Set[str]) -> Optional[str]:
+    """
+    Prior feedback entry rewritten for the new code, or None when it no longer
+    applies: it cites a changed line or names an identifier that was removed
+    """
+    references = list(LINE_REFERENCE.finditer(entry))
+    for reference in references:
+        first = int(reference.group(1))
+        last = int(reference.group(2) or first)
+        if last < first or any(line not in line_map for line in range(first, last + 1)):
+            return None
+
+    if removed and any(name in removed for name in IDENTIFIER.findall(entry)):
+        return None
+
+    def renumber(reference: re.Match) -> str:
+        text = reference.group(0)
+        offset = reference.start()
+        for group in (2, 1):
+            if reference.group(group):
+                start, end = reference.start(group) - offset, reference.end(group) - offset
+                text = text[:start] + str(line_map[int(reference.group(group))]) + text[end:]
+        return text
+
+    return LINE_REFERENCE.sub(renumber, entry)
@@ -0,0 +1,239 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..models.review import ProgrammingLanguage
+
+
+@dataclass(frozen=True)
+class LexerSpec:
+    string_patterns: Tuple[str, ...]
+    line_comments: Tuple[str, ...] = ()
+    block_comments: Tuple[Tuple[str, str], ...] = ()
+    # Newlines end statements (ASI, Go semicolon insertion, Ruby, preprocessor)
+    newline_significant: bool = True
+    # Leading whitespace is syntax (Python)
+    indentation_significant: bool = False
+    # Slash-delimited regex literals (JS/TS/Ruby) and Ruby %-literals are not lexed;
+    # code that may contain them is only normalized if none can be present
+    regex_literals: bool = False
+    percent_literals: bool = False
+
+
+DOUBLE_QUOTED = r'"(?:\\.|[^"\\\n])*"'
+SINGLE_QUOTED = r"'(?:\\.|[^'\\\n])*'"
+CHAR_LITERAL = r"'(?:\\.|[^'\\\n])'"
+BACKTICK = r"`(?:\\.|[^`\\])*`"
+TRIPLE_DOUBLE = r'"""(?:\\.|[^\\])*?"""'
+TRIPLE_SINGLE = r"'''(?:\\.|[^\\])*?'''"
+PYTHON_PREFIX = r"(?:\b[rRbBuUfF]{1,2})?"
+
+# Line comment markers are regular expressions; block comment delimiters are literal
+C_COMMENTS = {"line_comments": ("//",), "block_comments": (("/*", "*/"),)}
+
+LEXERS: Dict[str, LexerSpec] = {
+    "python": LexerSpec(
+        string_patterns=(
+            PYTHON_PREFIX + TRIPLE_DOUBLE,
+            PYTHON_PREFIX + TRIPLE_SINGLE,
+            PYTHON_PREFIX + DOUBLE_QUOTED,
+            PYTHON_PREFIX + SINGLE_QUOTED,
+        ),
+        line_comments=("#",),
+        indentation_significant=True
+    ),
+    "ruby": LexerSpec(
+        string_patterns=(DOUBLE_QUOTED, SINGLE_QUOTED, BACKTICK),
+        line_comments=("#",),
+        block_comments=(("=begin", "=end"),),
+        regex_literals=True,
+        percent_literals=True
+    ),
+    "javascript": LexerSpec(string_patterns=(DOUBLE_QUOTED, SINGLE_QUOTED, BACKTICK), regex_literals=True, **C_COMMENTS),
+    "typescript": LexerSpec(string_patterns=(DOUBLE_QUOTED, SINGLE_QUOTED, BACKTICK), regex_literals=True, **C_COMMENTS),
+    "go": LexerSpec(string_patterns=(DOUBLE_QUOTED, CHAR_LITERAL, BACKTICK), **C_COMMENTS),
+    "cpp": LexerSpec(string_patterns=(r'R"\((?:.|\n)*?\)"', DOUBLE_QUOTED, SINGLE_QUOTED), **C_COMMENTS),
+    "php": LexerSpec(
+        string_patterns=(DOUBLE_QUOTED, SINGLE_QUOTED, BACKTICK),
+        # '#[' opens a PHP 8 attribute, not a comment
+        line_comments=("//", r"#(?!\[)"),
+        block_comments=(("/*", "*/"),)
+    ),
+    "java": LexerSpec(
+        string_patterns=(TRIPLE_DOUBLE, DOUBLE_QUOTED, CHAR_LITERAL),
+        newline_significant=False,
+        **C_COMMENTS
+    ),
+    "csharp": LexerSpec(
+        string_patterns=(r'@"(?:[^"]|"")*"', r"\$?" + DOUBLE_QUOTED, CHAR_LITERAL),
+        newline_significant=False,
+        **C_COMMENTS
+    ),
+    "rust": LexerSpec(
+        # Single quotes are char literals only, so lifetimes ('a) stay punctuation
+        string_patterns=(r'r(?P<hashes>#*)"(?:.|\n)*?"(?P=hashes)', r"b?" + DOUBLE_QUOTED, r"b?" + CHAR_LITERAL),
+        newline_significant=False,
+        **C_COMMENTS
+    ),
+}
+
+WORD = r"[A-Za-z_$][\w$]*|\d\w*(?:\.\d\w*)*"
+PUNCTUATION_CHAR = r"[^\w\s\"'`$]"
+
+_compiled: Dict[str, re.Pattern] = {}
+
+
+def _token_pattern(language: str, spec: LexerSpec) -> re.Pattern:
+    if language not in _compiled:
+        comment_starts = list(spec.line_comments) + [re.escape(start) for start, _ in spec.block_comments]
+        comments = [marker + r"[^\n]*" for marker in spec.line_comments]
+        comments += [
+            re.escape(start) + r"(?:.|\n)*?" + re.escape(end)
+            for start, end in spec.block_comments
+        ]
+
+        # Operator runs are kept whole (a++b is not a+ +b) but stop before a comment
+        stop = f"(?!{'|'.join(comment_starts)})" if comment_starts else ""
+        punctuation = f"(?:{stop}{PUNCTUATION_CHAR})+|[\"'`$]"
+
+        alternatives = [
+            f"(?P<string>{'|'.join(spec.string_patterns)})",
+            *([f"(?P<comment>{'|'.join(comments)})"] if comments else []),
+            r"(?P<newline>\n[ \t]*)",
+            r"(?P<space>[ \t\r\f\v]+)",
+            f"(?P<word>{WORD})",
+            f"(?P<punct>{punctuation})",
+        ]
+        _compiled[language] = re.compile("|".join(alternatives))
+    return _compiled[language]
+
+
+def scan(code: str, language: ProgrammingLanguage) -> Iterator[Tuple[str, str, int]]:
+    """
+    Yield (kind, text, line) for every lexeme, including comments and spaces.
+    Kinds: string, comment, newline, space, word, punct. Yields nothing for
+    languages without a lexer.
+    """
+    language_str = language if isinstance(language, str) else language.value
+    spec = LEXERS.get(language_str)
+    if spec is None:
+        return
+
+    line = 1
+    for match in _token_pattern(language_str, spec).finditer(code.replace("\r\n", "\n")):
+        text = match.group(match.lastgroup)
+        yield match.lastgroup, text, line
+        line += text.count("\n")
+
+
+# Words after which a '/' starts an operand (a regex literal), not a division
+REGEX_PRECEDING_WORDS = {
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void", "throw", "case", "do",
+    "else", "yield", "await", "and", "or", "not", "if", "elsif", "unless", "when", "while", "until"
+}
+# Keywords whose parenthesized condition can be followed by a regex: if (x) /re/.test(s)
+CONDITION_WORDS = {"if", "while", "for", "with"}
+
+
+def _may_hide_literals(code: str, language: str, spec: LexerSpec) -> bool:
+    """
+    Whether a regex literal (or Ruby %-literal) could start anywhere in the code.
+    The lexer does not know them, so their spaces and any '//' or '#' inside would
+    be mistaken for formatting and comments. Errs on the side of True: a '/' only
+    counts as division right after an operand.
+    """
+    code = code.replace("\r\n", "\n")
+    position = 0
+    previous = ""           # last significant lexeme; "operand" after a value
+    spaced = False
+    conditions: List[bool] = []
+
+    for kind, text, _ in scan(code, language):
+        start, position = position, position + len(text)
+
+        if kind == "comment":
+            # A comment marker glued to code may sit inside a literal: ?#, /[^#]/, %w[a#b]
+            if start > 0 and not code[start - 1].isspace():
+                return True
+            continue
+        if kind in ("space", "newline"):
+            spaced = True
+            continue
+
+        if kind == "string":
+            previous = "operand"
+        elif kind == "word":
+            previous = text if text in REGEX_PRECEDING_WORDS or text in CONDITION_WORDS else "operand"
+        else:
+            for offset, char in enumerate(text):
+                if char == "/" or (char == "%" and spec.percent_literals):
+                    following = code[start + offset + 1:start + offset + 2]
+                    if previous != "operand":
+                        return True
+                    # Ruby reads `puts /x/` and `puts %w[x]` as a call with a literal argument
+                    if spec.percent_literals and spaced and offset == 0 and following.strip() and following != "=":
+                        return True
+                if char == "(":
+                    conditions.append(previous in CONDITION_WORDS)
+                if char == ")":
+                    previous = "condition" if conditions and conditions.pop() else "operand"
+                elif char == "]":
+                    previous = "operand"
+                else:
+                    previous = char
+        spaced = False
+
+    return False
+
+
+def tokenize(code: str, language: ProgrammingLanguage) -> Optional[List[str]]:
+    """
+    Split code into tokens with comments removed. Newline tokens carry the
+    following line's indentation. Returns None for languages without a lexer.
+    """
+    language_str = language if isinstance(language, str) else language.value
+    if language_str not in LEXERS:
+        return None
+
+    return [text for kind, text, _ in scan(code, language_str) if kind not in ("comment", "space")]
+
+
+def normalize_code(code: str, language: ProgrammingLanguage) -> str:
+    """
+    Canonical form of code for cache keys: comments stripped, string literals and
+    identifier case kept verbatim, tokens separated by single spaces. Line breaks
+    are kept where the language gives them meaning and indentation where it is
+    syntax (Python); blank lines are dropped. Code that may contain a regex
+    literal is returned unchanged.
+    """
+    language_str = language if isinstance(language, str) else language.value
+    spec = LEXERS.get(language_str)
+    if spec is not None and spec.regex_literals and _may_hide_literals(code, language_str, spec):
+        # Even blank lines can be data (template literals, heredocs): keep the code as is
+        return code
+
+    tokens = tokenize(code, language_str)
+
+    if tokens is None:
+        lines = [line.rstrip() for line in code.replace("\r\n", "\n").split("\n")]
+        return "\n".join(line for line in lines if line)
+
+    lines: List[str] = []
+    current: List[str] = []
+    indent = ""
+
+    for token in tokens:
+        if token[0] != "\n":
+            current.append(token)
+            continue
+        if not spec.newline_significant:
+            continue
+        if current:
+            lines.append(indent + " ".join(current))
+            current = []
+        indent = token[1:] if spec.indentation_significant else ""
+
+    if current:
+        lines.append(indent + " ".join(current))
+
+    return "\n".join(lines)
@@ -52,6 +52,12 @@ class CSVExporter:
         writer.writerow(["Total Failed", stats_data.get("total_failed", 0)])
         writer.writerow(["Average Quality Score", stats_data.get("average_quality_score", 0)])
         writer.writerow(["Average Processing Time", stats_data.get("average_processing_time", 0)])
+        writer.writerow(["Total Cost (USD)", stats_data.get("total_cost_usd", 0)])
+        writer.writerow(["Total Prompt Tokens", stats_data.get("total_prompt_tokens", 0)])
+        writer.writerow(["Total Completion Tokens", stats_data.get("total_completion_tokens", 0)])
+        writer.writerow(["Total Cached Tokens", stats_data.get("total_cached_tokens", 0)])
+        writer.writerow(["Average Upstream Latency (ms)", stats_data.get("average_upstream_latency_ms", 0)])
+        writer.writerow(["Reviews Served From Cache", stats_data.get("cache_served_reviews", 0)])
         
         writer.writerow([])
         
@@ -76,6 +82,33 @@ class CSVExporter:
                 issue["count"]
             ])
         
+        for title, section in (
+            ("Cost By Language", "cost_by_language"),
+            ("Cost By Day", "cost_by_day"),
+            ("Cost By User", "cost_by_user")
+        ):
+            rows = stats_data.get(section, [])
+            if not rows:
+                continue
+            
+            writer.writerow([])
+            
+            writer.writerow([title])
+            writer.writerow([
+                "Key", "Reviews", "Prompt Tokens", "Completion Tokens", "Cached Tokens", "Cost (USD)", "Avg Upstream Latency (ms)"
+            ])
+            
+            for row in rows:
+                writer.writerow([
+                    row["key"],
+                    row["reviews"],
+                    row["prompt_tokens"],
+                    row["completion_tokens"],
+                    row["cached_tokens"],
+                    row["cost_usd"],
+                    row.get("avg_upstream_latency_ms")
+                ])
+        
         csv_content = output.getvalue()
         output.close()
         
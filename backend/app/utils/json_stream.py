@@ -0,0 +1,74 @@
+import json
+from typing import Any, List, Tuple
+
+
+class IncrementalJSONObjectParser:
+    """
+    Incrementally parse a streamed JSON object and emit each top-level member
+    as soon as its value is complete.
+
+    Only the top-level object is tracked; nested values are returned whole once
+    their closing bracket arrives. Input is scanned once, so feeding n characters
+    costs O(n) overall.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = None
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Add a chunk of text and return the (key, value) members completed by it
+        """
+        self.buffer += chunk
+        completed = []
+
+        while self._pos < len(self.buffer) and not self.done:
+            char = self.buffer[self._pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 1 and char == "{":
+                    self._member_start = self._pos + 1
+            elif char in "}]":
+                if self._depth == 1:
+                    member = self._parse_member(self._member_start, self._pos)
+                    if member:
+                        completed.append(member)
+                    self.done = True
+                self._depth -= 1
+            elif char == "," and self._depth == 1:
+                member = self._parse_member(self._member_start, self._pos)
+                if member:
+                    completed.append(member)
+                self._member_start = self._pos + 1
+
+            self._pos += 1
+
+        return completed
+
+    def _parse_member(self, start: int, end: int):
+        text = self.buffer[start:end].strip()
+        if not text:
+            return None
+
+        try:
+            parsed = json.loads("{" + text + "}")
+        except json.JSONDecodeError:
+            return None
+
+        return next(iter(parsed.items()), None)
@@ -0,0 +1,116 @@
+import hashlib
+import random
+import re
+from typing import List, Set
+
+# String literals, numbers, identifiers, then single non-space characters
+TOKEN_PATTERN = re.compile(
+    r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`(?:\\.|[^`\\])*`'
+    r"|\d[\w.]*"
+    r"|[A-Za-z_$][\w$]*"
+    r"|\S"
+)
+
+# Keywords of the supported languages; they stay verbatim in shingles while
+# other identifiers are abstracted so renames barely change the signature
+KEYWORDS = {
+    "abstract", "and", "as", "async", "await", "break", "case", "catch", "class", "const",
+    "continue", "def", "default", "defer", "del", "do", "elif", "else", "elsif", "end",
+    "enum", "except", "export", "extends", "false", "final", "finally", "fn", "for",
+    "foreach", "from", "func", "function", "go", "if", "impl", "implements", "import",
+    "in", "interface", "is", "lambda", "let", "loop", "match", "mod", "module", "mut",
+    "new", "nil", "none", "not", "null", "or", "package", "private", "protected", "pub",
+    "public", "raise", "range", "return", "select", "self", "static", "struct", "super",
+    "switch", "this", "throw", "throws", "trait", "true", "try", "type", "typeof", "unless",
+    "until", "use", "using", "var", "virtual", "void", "while", "with", "yield"
+}
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+def tokenize(code: str) -> List[str]:
+    return TOKEN_PATTERN.findall(code)
+
+
+def shingles(code: str, size: int = 4) -> Set[str]:
+    """
+    Feature set of a snippet: shingles over the token stream with literals and
+    identifiers abstracted (structure), plus the identifier vocabulary itself
+    """
+    abstract = []
+    features = set()
+
+    for token in tokenize(code):
+        first = token[0]
+        if first in "\"'`":
+            abstract.append("STR")
+        elif first.isdigit():
+            abstract.append("NUM")
+        elif first.isalpha() or first in "_$":
+            if token.lower() in KEYWORDS:
+                abstract.append(token)
+            else:
+                abstract.append("ID")
+                features.add(f"id:{token}")
+        else:
+            abstract.append(token)
+
+    if len(abstract) < size:
+        if abstract:
+            features.add(" ".join(abstract))
+        return features
+
+    for index in range(len(abstract) - size + 1):
+        features.add(" ".join(abstract[index:index + size]))
+    return features
+
+
+class MinHasher:
+    """
+    MinHash signatures (estimate Jaccard similarity) with banded LSH keys
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, features: Set[str]) -> List[int]:
+        if not features:
+            return [MAX_HASH] * self.num_perm
+
+        hashes = [
+            int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+            for feature in features
+        ]
+        return [
+            min(((a * value + b) % MERSENNE_PRIME) & MAX_HASH for value in hashes)
+            for a, b in self._permutations
+        ]
+
+    def band_keys(self, signature: List[int]) -> List[str]:
+        """
+        One key per band; snippets sharing any band key are near-duplicate candidates
+        """
+        keys = []
+        for band in range(self.bands):
+            rows = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(",".join(map(str, rows)).encode("utf-8"), digest_size=8).hexdigest()
+            keys.append(f"{band}:{digest}")
+        return keys
+
+    @staticmethod
+    def similarity(first: List[int], second: List[int]) -> float:
+        if not first or len(first) != len(second):
+            return 0.0
+        return sum(1 for a, b in zip(first, second) if a == b) / len(first)
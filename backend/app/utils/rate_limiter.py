@@ -11,9 +11,9 @@ class RateLimiter:
         self._cache: Dict[str, list] = {}
         self._lock = asyncio.Lock()
     
-    async def check_rate_limit(self, ip_address: str) -> bool:
+    async def check_rate_limit(self, ip_address: str, cost: int = 1) -> bool:
         """
-        Check if IP is within rate limit
+        Check if IP is within rate limit, counting `cost` requests at once
         Returns True if allowed, False if exceeded
         """
         try:
@@ -31,12 +31,12 @@ class RateLimiter:
                 
                 current_requests = len(self._cache[ip_address])
                 
-                if current_requests >= settings.RATE_LIMIT_PER_HOUR:
+                if current_requests + cost > settings.RATE_LIMIT_PER_HOUR:
                     return False
                 
-                self._cache[ip_address].append(now)
+                self._cache[ip_address].extend([now] * cost)
                 
-                await self._log_request(ip_address, now)
+                await self._log_request(ip_address, now, cost)
                 
                 return True
                 
@@ -44,7 +44,7 @@ class RateLimiter:
             print(f"Rate limiter error: {e}")
             return True
     
-    async def _log_request(self, ip_address: str, timestamp: datetime):
+    async def _log_request(self, ip_address: str, timestamp: datetime, count: int = 1):
         """
         Log request to MongoDB for analytics
         """
@@ -56,6 +56,7 @@ class RateLimiter:
             await db.rate_limit_logs.insert_one({
                 "ip_address": ip_address,
                 "timestamp": timestamp,
+                "count": count,
                 "created_at": timestamp
             })
             
@@ -95,8 +96,8 @@ class RateLimiter:
 rate_limiter = RateLimiter()
 
 
-async def check_rate_limit(ip_address: str) -> bool:
+async def check_rate_limit(ip_address: str, cost: int = 1) -> bool:
     """
     Convenience function to check rate limit
     """
-    return await rate_limiter.check_rate_limit(ip_address)
+    return await rate_limiter.check_rate_limit(ip_address, cost)
@@ -0,0 +1,101 @@
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..core.config import settings
+from ..core.redis_client import redis_client
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into a single execution.
+
+    Inside one process, callers share the in-flight future of the first caller.
+    Across workers, a short Redis lease elects a leader; followers poll for the
+    leader's result instead of running the call themselves.
+    """
+
+    def __init__(
+        self,
+        lock_prefix: str = "singleflight",
+        lease_seconds: Optional[int] = None,
+        wait_timeout: Optional[float] = None,
+        poll_interval: Optional[float] = None
+    ):
+        self.lock_prefix = lock_prefix
+        self.lease_seconds = lease_seconds or settings.SINGLE_FLIGHT_LEASE_SECONDS
+        self.wait_timeout = wait_timeout or settings.SINGLE_FLIGHT_WAIT_SECONDS
+        self.poll_interval = poll_interval or settings.SINGLE_FLIGHT_POLL_INTERVAL
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        fetch_result: Callable[[], Awaitable[Optional[Any]]]
+    ) -> Any:
+        """
+        Run fn once per key; fetch_result reads the shared result written by another worker
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[key] = future
+
+        try:
+            result = await self._run_across_workers(key, fn, fetch_result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def _run_across_workers(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        fetch_result: Callable[[], Awaitable[Optional[Any]]]
+    ) -> Any:
+        lock_key = f"{self.lock_prefix}:{key}"
+        token = uuid.uuid4().hex
+
+        if await redis_client.set(lock_key, token, ex=self.lease_seconds, nx=True):
+            try:
+                return await fn()
+            finally:
+                await self._release(lock_key, token)
+
+        if not await redis_client.exists(lock_key):
+            return await fn()
+
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+
+            result = await fetch_result()
+            if result is not None:
+                return result
+
+            if not await redis_client.exists(lock_key):
+                result = await fetch_result()
+                if result is not None:
+                    return result
+                break
+
+        return await fn()
+
+    async def _release(self, lock_key: str, token: str):
+        try:
+            if await redis_client.get(lock_key) == token:
+                await redis_client.delete(lock_key)
+        except Exception as e:
+            print(f"Error releasing single-flight lease: {e}")
+
+    def in_flight_count(self) -> int:
+        return len(self._in_flight)
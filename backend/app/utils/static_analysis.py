@@ -0,0 +1,270 @@
+"""
+Fast local analyzers that run before the AI review.
+
+Analyzers are plain top-level functions registered per language with
+@register_analyzer so they can be executed in a worker process.
+"""
+import ast
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+
+from ..core.config import settings
+from .code_normalizer import scan
+
+
+@dataclass
+class AnalysisResult:
+    # False only on an authoritative parser failure: the AI review is skipped
+    syntax_ok: bool = True
+    # False when the code could not be parsed here without that proving it invalid
+    parsed: bool = True
+    issues: List[str] = field(default_factory=list)
+    suggestions: List[str] = field(default_factory=list)
+    security_concerns: List[str] = field(default_factory=list)
+    performance_recommendations: List[str] = field(default_factory=list)
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    analyzers: List[str] = field(default_factory=list)
+
+
+Analyzer = Callable[[str, str, AnalysisResult], None]
+
+ANALYZERS: Dict[str, List[Analyzer]] = {}
+
+
+def register_analyzer(*languages: str):
+    """
+    Register an analyzer for one or more languages. Analyzers run in order and
+    may stop the chain by setting result.syntax_ok or result.parsed to False.
+    """
+    def decorator(analyzer: Analyzer) -> Analyzer:
+        for language in languages:
+            ANALYZERS.setdefault(language, []).append(analyzer)
+        return analyzer
+    return decorator
+
+
+def run_analyzers(code: str, language: str) -> AnalysisResult:
+    """
+    Run every analyzer registered for the language (executed in a worker process)
+    """
+    result = AnalysisResult()
+    result.metrics["lines"] = code.count("\n") + 1
+
+    for analyzer in ANALYZERS.get(language, []):
+        try:
+            analyzer(code, language, result)
+        except Exception as e:
+            result.metrics.setdefault("analyzer_errors", []).append(f"{analyzer.__name__}: {e}")
+            continue
+        result.analyzers.append(analyzer.__name__)
+        if not result.syntax_ok or not result.parsed:
+            break
+
+    return result
+
+
+# Python
+
+BRANCH_NODES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.ExceptHandler, ast.With, ast.AsyncWith, ast.IfExp, ast.comprehension)
+MAX_FUNCTION_LINES = 60
+MAX_COMPLEXITY = 10
+MAX_NESTING = 4
+
+
+# Errors no later grammar can fix: indentation and unbalanced brackets outside f-strings
+# (PEP 701 f-strings make quotes nested in replacement fields look like unbalanced brackets)
+VERSION_INDEPENDENT_ERRORS = re.compile(r"was never closed|^unmatched|does not match opening")
+FSTRING_PREFIX = re.compile(r"(?<![\w])(?:[fF][rR]?|[rR][fF])[\"']")
+
+
+def _target_python_version() -> Tuple[int, ...]:
+    return tuple(int(part) for part in settings.STATIC_ANALYSIS_PYTHON_VERSION.split(".")[:2])
+
+
+def _is_authoritative(error: SyntaxError, code: str) -> bool:
+    """
+    Whether the error also holds for the target Python version
+    """
+    if sys.version_info[:2] >= _target_python_version():
+        return True
+    if isinstance(error, IndentationError):
+        return True
+    if not VERSION_INDEPENDENT_ERRORS.search(error.msg or ""):
+        return False
+    line = code.splitlines()[error.lineno - 1] if error.lineno and error.lineno <= len(code.splitlines()) else ""
+    return not FSTRING_PREFIX.search(line)
+
+
+@register_analyzer("python")
+def python_syntax(code: str, language: str, result: AnalysisResult):
+    try:
+        compile(code, "<submission>", "exec", ast.PyCF_ONLY_AST, dont_inherit=True)
+    except SyntaxError as e:
+        location = f"Line {e.lineno}: " if e.lineno else ""
+        if _is_authoritative(e, code):
+            result.syntax_ok = False
+            result.issues.append(f"{location}Syntax error - {e.msg}")
+        else:
+            result.parsed = False
+            result.metrics["parse_error"] = (
+                f"{location}{e.msg} (Python {sys.version_info[0]}.{sys.version_info[1]} parser; "
+                f"the code may use newer syntax)"
+            )
+
+
+def _complexity(node: ast.AST) -> int:
+    complexity = 1
+    for child in ast.walk(node):
+        if isinstance(child, BRANCH_NODES):
+            complexity += 1
+        elif isinstance(child, ast.BoolOp):
+            complexity += len(child.values) - 1
+    return complexity
+
+
+def _nesting(node: ast.AST, depth: int = 0) -> int:
+    deepest = depth
+    for child in ast.iter_child_nodes(node):
+        child_depth = depth + 1 if isinstance(child, (ast.If, ast.For, ast.AsyncFor, ast.While, ast.With, ast.AsyncWith, ast.Try)) else depth
+        deepest = max(deepest, _nesting(child, child_depth))
+    return deepest
+
+
+@register_analyzer("python")
+def python_metrics(code: str, language: str, result: AnalysisResult):
+    tree = ast.parse(code)
+    functions = [node for node in ast.walk(tree) if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
+
+    complexities = {}
+    for function in functions:
+        complexity = _complexity(function)
+        complexities[function.name] = complexity
+        length = (function.end_lineno or function.lineno) - function.lineno + 1
+
+        if complexity > MAX_COMPLEXITY:
+            result.suggestions.append(
+                f"Line {function.lineno}: '{function.name}' has cyclomatic complexity {complexity}; split it into smaller functions"
+            )
+        if length > MAX_FUNCTION_LINES:
+            result.suggestions.append(f"Line {function.lineno}: '{function.name}' is {length} lines long")
+        if _nesting(function) > MAX_NESTING:
+            result.suggestions.append(f"Line {function.lineno}: '{function.name}' nests blocks more than {MAX_NESTING} levels deep")
+
+    result.metrics.update({
+        "functions": len(functions),
+        "classes": sum(1 for node in ast.walk(tree) if isinstance(node, ast.ClassDef)),
+        "max_complexity": max(complexities.values(), default=0),
+        "average_complexity": round(sum(complexities.values()) / len(complexities), 2) if complexities else 0
+    })
+
+
+@register_analyzer("python")
+def python_lint(code: str, language: str, result: AnalysisResult):
+    tree = ast.parse(code)
+
+    imported = {}
+    used_names = set()
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ExceptHandler) and node.type is None:
+            result.issues.append(f"Line {node.lineno}: bare 'except:' also catches KeyboardInterrupt and SystemExit")
+
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for default in node.args.defaults + node.args.kw_defaults:
+                if isinstance(default, (ast.List, ast.Dict, ast.Set)):
+                    result.issues.append(f"Line {node.lineno}: mutable default argument in '{node.name}' is shared between calls")
+
+        elif isinstance(node, ast.Compare):
+            for operator, comparator in zip(node.ops, node.comparators):
+                if isinstance(operator, (ast.Eq, ast.NotEq)) and isinstance(comparator, ast.Constant) and comparator.value is None:
+                    result.suggestions.append(f"Line {node.lineno}: compare to None with 'is' / 'is not'")
+
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            if node.func.id in ("eval", "exec"):
+                result.security_concerns.append(f"Line {node.lineno}: {node.func.id}() executes arbitrary code")
+
+        elif isinstance(node, ast.ImportFrom) and any(alias.name == "*" for alias in node.names):
+            result.suggestions.append(f"Line {node.lineno}: avoid wildcard import from {node.module}")
+
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name != "*":
+                    imported[(alias.asname or alias.name).split(".")[0]] = node.lineno
+        elif isinstance(node, ast.Name):
+            used_names.add(node.id)
+        elif isinstance(node, ast.Attribute):
+            root = node
+            while isinstance(root, ast.Attribute):
+                root = root.value
+            if isinstance(root, ast.Name):
+                used_names.add(root.id)
+
+    for name, lineno in sorted(imported.items(), key=lambda item: item[1]):
+        if name not in used_names and name != "__future__":
+            result.issues.append(f"Line {lineno}: '{name}' is imported but unused")
+
+
+# Brace languages
+
+BRACKETS = {"(": ")", "[": "]", "{": "}"}
+PHP_CODE = re.compile(r"<\?(?:php\b|=)?(.*?)(?:\?>|\Z)", re.DOTALL | re.IGNORECASE)
+
+
+def _check_brackets(code: str, language: str, pairs: Dict[str, str], result: AnalysisResult):
+    """
+    Bracket balance over tokens (string literals and comments already removed).
+    The lexers are approximate, so findings are reported as issues rather than
+    as syntax errors.
+    """
+    closers = {closer: opener for opener, closer in pairs.items()}
+    stack = []
+
+    for kind, token, line in scan(code, language):
+        if kind != "punct":
+            continue
+
+        for char in token:
+            if char in pairs:
+                stack.append((char, line))
+            elif char in closers:
+                if not stack or stack[-1][0] != closers[char]:
+                    result.issues.append(f"Line {line}: unexpected '{char}' - brackets may be unbalanced")
+                    return
+                stack.pop()
+
+    if stack:
+        opener, opened_at = stack[-1]
+        result.issues.append(f"Line {opened_at}: '{opener}' does not appear to be closed")
+
+
+def _php_code(code: str) -> str:
+    """
+    Only the PHP blocks of a file; template text in between keeps just its
+    newlines, so line numbers still match
+    """
+    if "<?" not in code:
+        return code
+
+    parts = []
+    position = 0
+    for match in PHP_CODE.finditer(code):
+        parts.append("\n" * code.count("\n", position, match.start(1)))
+        parts.append(match.group(1))
+        position = match.end(1)
+    parts.append("\n" * code.count("\n", position))
+    return "".join(parts)
+
+
+@register_analyzer("java", "cpp", "csharp", "go", "rust", "php")
+def bracket_balance(code: str, language: str, result: AnalysisResult):
+    if language == "php":
+        code = _php_code(code)
+    _check_brackets(code, language, BRACKETS, result)
+
+
+@register_analyzer("javascript", "typescript")
+def brace_balance(code: str, language: str, result: AnalysisResult):
+    # Regex literals are not lexed, so only braces are checked (a regex can contain a lone '(' or '[')
+    _check_brackets(code, language, {"{": "}"}, result)
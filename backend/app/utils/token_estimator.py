@@ -0,0 +1,42 @@
+import math
+import re
+from typing import Dict, List
+
+# Approximates BPE tokenizers (cl100k/o200k): common words up to ~8 letters are
+# one token, numbers split into groups of up to 3 digits, symbol runs merge in
+# pairs and single spaces merge into the following word.
+TOKEN_PIECES = re.compile(r"[A-Za-z]+|\d{1,3}|\s+|[^\sA-Za-z\d]+")
+
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_PRIMING_TOKENS = 3
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in text without calling a tokenizer
+    """
+    if not text:
+        return 0
+
+    tokens = 0
+    for piece in TOKEN_PIECES.findall(text):
+        if piece[0].isalpha():
+            tokens += math.ceil(len(piece) / 8)
+        elif piece[0].isspace():
+            tokens += 0 if piece == " " else 1
+        elif piece[0].isdigit():
+            tokens += 1
+        else:
+            tokens += math.ceil(len(piece) / 2)
+
+    return tokens
+
+
+def estimate_message_tokens(messages: List[Dict[str, str]]) -> int:
+    """
+    Estimate prompt tokens for a chat-completions message list
+    """
+    return sum(
+        estimate_tokens(message.get("content", "")) + MESSAGE_OVERHEAD_TOKENS
+        for message in messages
+    ) + REPLY_PRIMING_TOKENS
@@ -0,0 +1,58 @@
+"""
+Standalone review worker: consumes review jobs from the Redis stream queue so
+AI work scales independently of the API processes.
+
+Usage:
+    cd backend
+    python -m app.worker --concurrency 8
+
+Run the API with REVIEW_API_WORKER_CONCURRENCY=0 to leave all reviews to workers.
+"""
+import argparse
+import asyncio
+import signal
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from .core.config import settings  # noqa: E402
+from .core.database import connect_to_mongo, close_mongo_connection  # noqa: E402
+from .core.redis_client import redis_client  # noqa: E402
+from .services.ai_service import ai_service  # noqa: E402
+from .services.analysis_service import analysis_service  # noqa: E402
+from .services.review_service import review_service  # noqa: E402
+
+
+async def run(concurrency: int):
+    await connect_to_mongo()
+    await redis_client.connect()
+    await ai_service.start()
+    await analysis_service.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await review_service.start_workers(concurrency)
+    print(f"Review worker running with {concurrency} consumers")
+    await stop.wait()
+
+    print("Shutting down review worker...")
+    await review_service.close_workers()
+    await analysis_service.close()
+    await ai_service.close()
+    await close_mongo_connection()
+    await redis_client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a review queue worker")
+    parser.add_argument("--concurrency", type=int, default=settings.REVIEW_WORKER_CONCURRENCY)
+    args = parser.parse_args()
+
+    if not settings.REVIEW_QUEUE_ENABLED:
+        raise SystemExit("REVIEW_QUEUE_ENABLED is false - nothing to consume")
+
+    asyncio.run(run(args.concurrency))
@@ -0,0 +1,206 @@
+"""
+Benchmark: cache-key hit rate of the language-aware normalizer against the old
+whitespace-collapse + lowercase key on a corpus of edits.
+
+Each corpus entry is a (before, after) pair labelled equivalent (a resubmission
+that should hit the cache: comment, blank-line or formatting edits) or not
+(a real change that must miss). The built-in corpus applies the kinds of edits
+seen when users resubmit code to a set of snippets; pass --corpus with a JSONL
+file of {"language", "before", "after", "equivalent"} lines, e.g. extracted
+from commit history, to measure on your own edits.
+
+Usage:
+    cd backend
+    python -m benchmarks.bench_cache_normalization
+    python -m benchmarks.bench_cache_normalization --corpus edits.jsonl
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.cache_service import CodeCacheService  # noqa: E402
+
+
+SNIPPETS = {
+    "python": '''import os
+
+
+def load_config(path):
+    """Read KEY=VALUE pairs."""
+    config = {}
+    with open(path) as handle:
+        for line in handle:
+            if "=" in line:
+                key, value = line.strip().split("=", 1)
+                config[key] = value
+    return config
+''',
+    "javascript": '''async function fetchUser(id) {
+  const response = await fetch(`/api/users/${id}`);
+  if (!response.ok) {
+    throw new Error("Request failed: " + response.status);
+  }
+  return response.json();
+}
+''',
+    "java": '''public class Counter {
+    private int count = 0;
+
+    public synchronized void increment() {
+        count++;
+    }
+
+    public int getCount() {
+        return count;
+    }
+}
+''',
+    "go": '''func Sum(values []int) int {
+	total := 0
+	for _, v := range values {
+		total += v
+	}
+	return total
+}
+''',
+    "ruby": '''class Greeter
+  def initialize(name)
+    @name = name
+  end
+
+  def greet
+    puts "Hello, #{@name}!"
+  end
+end
+''',
+}
+
+COMMENT_MARKERS = {"python": "#", "ruby": "#", "javascript": "//", "java": "//", "go": "//"}
+
+
+def add_comment_line(language: str, code: str) -> str:
+    lines = code.split("\n")
+    indent = re.match(r"\s*", lines[1]).group()
+    lines.insert(1, f"{indent}{COMMENT_MARKERS[language]} TODO: review this")
+    return "\n".join(lines)
+
+
+def add_trailing_comment(language: str, code: str) -> str:
+    lines = code.rstrip("\n").split("\n")
+    lines[-2] += f"  {COMMENT_MARKERS[language]} end"
+    return "\n".join(lines) + "\n"
+
+
+def add_blank_lines(language: str, code: str) -> str:
+    return "\n\n" + code.replace("\n", "\n\n", 2) + "\n\n"
+
+
+def trailing_whitespace(language: str, code: str) -> str:
+    return "\n".join(line + "   " for line in code.split("\n"))
+
+
+def crlf_line_endings(language: str, code: str) -> str:
+    return code.replace("\n", "\r\n")
+
+
+def operator_spacing(language: str, code: str) -> str:
+    return "\n".join(
+        line if '"' in line else re.sub(r"\s*(=|\+=|:=)\s*", r" \1  ", line)
+        for line in code.split("\n")
+    )
+
+
+def rename_case(language: str, code: str) -> str:
+    for name in ("config", "response", "count", "total", "name"):
+        if name in code:
+            return code.replace(name, name.capitalize())
+    return code + "x"
+
+
+def change_literal(language: str, code: str) -> str:
+    if '"' in code:
+        return re.sub(r'"([^"\n]*)"', lambda match: f'"{match.group(1).upper()}!"', code, count=1)
+    return re.sub(r"\b0\b", "1", code, count=1)
+
+
+def change_operator(language: str, code: str) -> str:
+    for old, new in (("+=", "-="), ("++", "--"), ("==", "!="), (" = ", " == "), ("!", "")):
+        if old in code:
+            return code.replace(old, new, 1)
+    return code + "x"
+
+
+def uncomment_line(language: str, code: str) -> str:
+    marker = COMMENT_MARKERS[language]
+    lines = code.split("\n")
+    lines.insert(1, f"{marker} debug(){';' if marker == '//' else ''}")
+    commented = "\n".join(lines)
+    return commented.replace(f"{marker} debug()", "debug()")
+
+
+EQUIVALENT_EDITS: List[Callable[[str, str], str]] = [
+    add_comment_line, add_trailing_comment, add_blank_lines, trailing_whitespace,
+    crlf_line_endings, operator_spacing
+]
+SEMANTIC_EDITS: List[Callable[[str, str], str]] = [rename_case, change_literal, change_operator]
+
+
+def builtin_corpus() -> List[Tuple[str, str, str, bool]]:
+    corpus = []
+    for language, code in SNIPPETS.items():
+        for edit in EQUIVALENT_EDITS:
+            corpus.append((language, code, edit(language, code), True))
+        for edit in SEMANTIC_EDITS:
+            corpus.append((language, code, edit(language, code), False))
+        # A real change made while also reformatting
+        corpus.append((language, add_comment_line(language, code), uncomment_line(language, code), False))
+    return corpus
+
+
+def load_corpus(path: str) -> List[Tuple[str, str, str, bool]]:
+    with open(path) as handle:
+        entries = [json.loads(line) for line in handle if line.strip()]
+    return [(entry["language"], entry["before"], entry["after"], bool(entry["equivalent"])) for entry in entries]
+
+
+def legacy_key(code: str, language: str) -> str:
+    normalized_code = ' '.join(code.strip().split()).lower()
+    return hashlib.sha256(f"{normalized_code}|{language}|".encode('utf-8')).hexdigest()
+
+
+def evaluate(name: str, key: Callable[[str, str], str], corpus: List[Tuple[str, str, str, bool]]):
+    equivalent = [entry for entry in corpus if entry[3]]
+    different = [entry for entry in corpus if not entry[3]]
+
+    started = time.perf_counter()
+    hits = sum(1 for language, before, after, _ in equivalent if key(before, language) == key(after, language))
+    collisions = sum(1 for language, before, after, _ in different if key(before, language) == key(after, language))
+    elapsed_ms = (time.perf_counter() - started) * 1000 / (2 * len(corpus))
+
+    hit_rate = hits / len(equivalent) * 100 if equivalent else 0
+    print(f"{name:<12} hit rate {hit_rate:5.1f}% ({hits}/{len(equivalent)})  "
+          f"false hits {collisions}/{len(different)}  {elapsed_ms:.3f} ms/key")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="JSONL file of {language, before, after, equivalent}")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else builtin_corpus()
+    service = CodeCacheService()
+
+    print(f"{len(corpus)} edit pairs ({sum(1 for entry in corpus if entry[3])} equivalent)")
+    evaluate("legacy", legacy_key, corpus)
+    evaluate("normalized", lambda code, language: service._generate_code_hash(code, language), corpus)
+
+
+if __name__ == "__main__":
+    main()
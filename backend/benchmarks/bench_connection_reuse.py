@@ -0,0 +1,128 @@
+"""
+Benchmark: per-call latency of chat-completion requests with and without connection reuse.
+
+Starts a local stand-in for the OpenAI chat-completions endpoint and compares
+a fresh httpx.AsyncClient per call (old AIService behaviour) against the
+app-lifetime pooled client owned by AIService.
+
+Usage:
+    cd backend
+    python -m benchmarks.bench_connection_reuse --calls 200
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+import httpx
+import uvicorn
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.ai_service import AIService  # noqa: E402
+
+
+COMPLETION_BODY = (
+    b'{"choices": [{"message": {"content": "{\\"quality_score\\": 7}"}}],'
+    b' "usage": {"prompt_tokens": 120, "completion_tokens": 20}}'
+)
+
+
+async def stand_in_app(scope, receive, send):
+    """
+    Minimal ASGI stand-in that answers any request with a fixed chat completion
+    """
+    if scope["type"] != "http":
+        return
+
+    more_body = True
+    while more_body:
+        message = await receive()
+        more_body = message.get("more_body", False)
+
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json")]
+    })
+    await send({"type": "http.response.body", "body": COMPLETION_BODY})
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_stand_in(port: int) -> uvicorn.Server:
+    config = uvicorn.Config(stand_in_app, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def run_without_reuse(url: str, calls: int) -> list:
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        async with httpx.AsyncClient() as client:
+            response = await client.post(url, json={"model": "bench"})
+            response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def run_with_reuse(service: AIService, url: str, calls: int) -> list:
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        response = await service.client.post(url, json={"model": "bench"})
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(label: str, latencies: list):
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<22} mean={statistics.mean(ordered):7.3f}ms "
+        f"p50={statistics.median(ordered):7.3f}ms p95={p95:7.3f}ms"
+    )
+
+
+async def main(calls: int):
+    port = _free_port()
+    server = start_stand_in(port)
+    url = f"http://127.0.0.1:{port}/v1/chat/completions"
+
+    service = AIService()
+
+    try:
+        await run_with_reuse(service, url, 5)
+
+        without_reuse = await run_without_reuse(url, calls)
+        with_reuse = await run_with_reuse(service, url, calls)
+
+        print(f"{calls} sequential calls against {url}")
+        summarize("new client per call", without_reuse)
+        summarize("pooled client", with_reuse)
+        print(f"speedup (mean): {statistics.mean(without_reuse) / statistics.mean(with_reuse):.2f}x")
+    finally:
+        await service.close()
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls))
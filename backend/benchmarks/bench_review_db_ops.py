@@ -0,0 +1,125 @@
+"""
+Benchmark: MongoDB commands and latency per completed review.
+
+Runs the submit -> _process_review path against a real MongoDB (MONGODB_URI)
+with the AI call stubbed, counting every command the driver sends through a
+pymongo CommandListener. Two modes are compared:
+
+  payload  the submission travels with the job (the normal queue path)
+  reload   the worker has no payload and claims + loads the review with a
+           single find_one_and_update (old queue entries, manual re-runs)
+
+Streamed partial sections are simulated so their unacknowledged writes show up
+in the counts.
+
+Usage:
+    cd backend
+    python -m benchmarks.bench_review_db_ops --reviews 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+from unittest.mock import patch
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.config import settings  # noqa: E402
+from app.models.review import ProgrammingLanguage, Review, ReviewFeedback  # noqa: E402
+from app.services.review_service import ReviewService  # noqa: E402
+
+
+SNIPPET = "def add(a, b):\n    return a + b\n"
+
+
+class CommandCounter(monitoring.CommandListener):
+    """
+    Counts commands by name and collection; unacknowledged (w=0) writes report
+    success like any other command
+    """
+
+    def __init__(self):
+        self.commands = Counter()
+        self.enabled = False
+
+    def started(self, event):
+        if not self.enabled or event.command_name in ("hello", "isMaster", "ping", "endSessions"):
+            return
+        collection = event.command.get(event.command_name)
+        self.commands[(event.command_name, collection if isinstance(collection, str) else "-")] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def fake_review_code(code, language, description=None, on_section=None):
+    if on_section:
+        for section in ("issues", "suggestions", "positive_aspects"):
+            await on_section(section, [f"{section} for {language}"])
+    return ReviewFeedback(quality_score=8, cost_info={"source": "benchmark"})
+
+
+async def run_mode(db, counter: CommandCounter, mode: str, reviews: int) -> dict:
+    service = ReviewService()
+    latencies = []
+
+    counter.commands.clear()
+    for _ in range(reviews):
+        start = time.perf_counter()
+        counter.enabled = True
+
+        review = Review(code=SNIPPET, language=ProgrammingLanguage.PYTHON)
+        result = await db.reviews.insert_one(review.dict())
+        payload = service._job_payload(review) if mode == "payload" else None
+        await service._process_review(str(result.inserted_id), payload=payload)
+
+        counter.enabled = False
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "mode": mode,
+        "commands": dict(counter.commands),
+        "per_review": sum(counter.commands.values()) / reviews,
+        "mean_ms": statistics.mean(latencies),
+        "p95_ms": sorted(latencies)[int(len(latencies) * 0.95) - 1]
+    }
+
+
+async def main(args):
+    counter = CommandCounter()
+    client = AsyncIOMotorClient(settings.MONGODB_URI, event_listeners=[counter])
+    db = client[args.database]
+    await db.reviews.delete_many({})
+
+    with patch('app.services.review_service.get_database', return_value=db), \
+         patch('app.services.review_service.ai_service.review_code', fake_review_code):
+        # Warm up the connection pool before measuring
+        await run_mode(db, counter, "payload", 5)
+        results = [await run_mode(db, counter, mode, args.reviews) for mode in ("reload", "payload")]
+
+    await client.drop_database(args.database)
+    client.close()
+
+    print(f"MongoDB commands and latency per completed review ({args.reviews} reviews)")
+    print(f"status write concern: w={settings.MONGO_STATUS_WRITE_CONCERN}, partial: w={settings.MONGO_PARTIAL_WRITE_CONCERN}")
+    for result in results:
+        print(f"\n{result['mode']:<8} {result['per_review']:.2f} commands/review  "
+              f"mean {result['mean_ms']:.2f} ms  p95 {result['p95_ms']:.2f} ms")
+        for (command, collection), count in sorted(result["commands"].items()):
+            print(f"    {command:<16} {collection:<12} {count / args.reviews:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reviews", type=int, default=200)
+    parser.add_argument("--database", default="codereviewer_bench")
+    asyncio.run(main(parser.parse_args()))
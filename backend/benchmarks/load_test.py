@@ -0,0 +1,97 @@
+"""
+Load test for the submit -> _process_review -> cache path, fully offline.
+
+1. Start the simulator:   python -m app.simulator --port 9000
+2. Start the API against it (MongoDB and Redis running locally):
+       OPENAI_BASE_URL=http://127.0.0.1:9000/v1 OPENAI_API_KEY=sim RATE_LIMIT_PER_HOUR=100000 \
+       uvicorn main:app --port 8000 --workers 4
+3. Run:  python -m benchmarks.load_test --reviews 500 --concurrency 50 --unique 100
+
+--unique controls how many distinct snippets are submitted, so the rest exercise
+the cache and single-flight paths.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+
+def make_snippet(index: int) -> str:
+    return (
+        f"def handler_{index}(request):\n"
+        f"    payload = request.json()\n"
+        f"    total = 0\n"
+        f"    for item in payload['items']:\n"
+        f"        total += item['price'] * {index % 10 + 1}\n"
+        f"    return total\n"
+    )
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run_review(client: httpx.AsyncClient, index: int, poll_interval: float) -> dict:
+    start = time.perf_counter()
+    response = await client.post("/api/reviews", json={"code": make_snippet(index), "language": "python"})
+    if response.status_code != 200:
+        return {"status": f"http_{response.status_code}", "latency": time.perf_counter() - start}
+
+    body = response.json()
+    if body["status"] == "completed":
+        # Cache hit answered inline by the POST
+        return {"status": "completed", "latency": time.perf_counter() - start}
+
+    review_id = body["id"]
+    while True:
+        review = (await client.get(f"/api/reviews/{review_id}")).json()
+        if review["status"] in ("completed", "failed"):
+            return {"status": review["status"], "latency": time.perf_counter() - start}
+        await asyncio.sleep(poll_interval)
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    indexes = [random.randrange(args.unique) for _ in range(args.reviews)]
+
+    async with httpx.AsyncClient(base_url=args.api, limits=limits, timeout=120.0) as client:
+        async def bounded(index: int) -> dict:
+            async with semaphore:
+                return await run_review(client, index, args.poll_interval)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*[bounded(index) for index in indexes])
+        elapsed = time.perf_counter() - started
+
+        cache_stats = (await client.get("/api/cache/stats")).json() if args.cache_stats else None
+
+    latencies = [result["latency"] * 1000 for result in results if result["status"] == "completed"]
+    statuses = {}
+    for result in results:
+        statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+
+    print(f"{args.reviews} reviews, {args.unique} unique, concurrency {args.concurrency}: {elapsed:.1f}s "
+          f"({args.reviews / elapsed:.1f} reviews/s)")
+    print(f"statuses: {statuses}")
+    if latencies:
+        print(f"end-to-end latency ms: mean={statistics.mean(latencies):.0f} p50={percentile(latencies, 50):.0f} "
+              f"p95={percentile(latencies, 95):.0f} p99={percentile(latencies, 99):.0f}")
+    if cache_stats:
+        print(f"cache: {cache_stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--api", default="http://127.0.0.1:8000")
+    parser.add_argument("--reviews", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--unique", type=int, default=50)
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--cache-stats", action="store_true", help="Fetch /api/cache/stats at the end")
+    args = parser.parse_args()
+    asyncio.run(main(args))
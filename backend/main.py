@@ -8,7 +8,7 @@ import os
 
 from app.core.config import settings
 from app.core.database import connect_to_mongo, close_mongo_connection
-from app.api import reviews, stats, health, auth, cache
+from app.api import reviews, stats, health, auth, cache, metrics
 
 load_dotenv()
 
@@ -20,8 +20,26 @@ async def lifespan(app: FastAPI):
     from app.core.redis_client import redis_client
     await redis_client.connect()
     
+    from app.services.ai_service import ai_service
+    await ai_service.start()
+    
+    from app.services.analysis_service import analysis_service
+    await analysis_service.start()
+    
+    from app.services.batch_service import batch_service
+    await batch_service.start()
+    
+    from app.services.review_service import review_service
+    from app.services.review_events import review_events
+    await review_service.start_workers(settings.REVIEW_API_WORKER_CONCURRENCY)
+    
     yield
     
+    await review_service.close_workers()
+    await review_events.close()
+    await batch_service.close()
+    await analysis_service.close()
+    await ai_service.close()
     await close_mongo_connection()
     await redis_client.close()
 
@@ -46,6 +64,7 @@ app.include_router(reviews.router, prefix="/api")
 app.include_router(stats.router, prefix="/api")
 app.include_router(health.router, prefix="/api")
 app.include_router(cache.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api")
 
 static_dir = "../frontend/build/static"
 if os.path.exists(static_dir):
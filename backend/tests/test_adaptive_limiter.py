@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+
+from app.utils.adaptive_limiter import AdaptiveConcurrencyLimiter, parse_reset_duration
+
+
+class TestAdaptiveLimiter:
+    
+    def test_parse_reset_duration(self):
+        assert parse_reset_duration("1s") == 1
+        assert parse_reset_duration("6m0s") == 360
+        assert parse_reset_duration("20ms") == pytest.approx(0.02)
+        assert parse_reset_duration("2.5") == 2.5
+        assert parse_reset_duration(None) is None
+    
+    @pytest.mark.asyncio
+    async def test_calls_over_the_limit_wait_in_queue(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=1, max_limit=10)
+        
+        await limiter.acquire()
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.01)
+        
+        assert limiter.snapshot()["queue_depth"] == 1
+        assert not waiter.done()
+        
+        await limiter.release()
+        await asyncio.wait_for(waiter, 1)
+        assert limiter.in_flight == 2 and limiter.waiting == 0
+    
+    def test_additive_increase_and_multiplicative_decrease(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, min_limit=1, max_limit=10)
+        limiter.in_flight = 4
+        
+        for _ in range(8):
+            limiter.record_success(0.1)
+        assert limiter.effective_limit == 5
+        
+        limiter.record_overload()
+        assert limiter.effective_limit == 2
+        
+        # A second rejection from the same round trip does not cut the limit again
+        limiter.record_overload()
+        assert limiter.effective_limit == 2
+    
+    def test_latency_far_above_baseline_lowers_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, min_limit=1, max_limit=20)
+        limiter.record_success(0.1)
+        limiter._last_decrease = -100
+        limiter.ewma_latency = 0
+        
+        limiter.record_success(1.0)
+        
+        assert limiter.effective_limit == 9
+        assert limiter.decreases == 1
+    
+    @pytest.mark.asyncio
+    async def test_exhausted_quota_holds_new_calls_until_reset(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=5, min_limit=1, max_limit=10)
+        await limiter.acquire()
+        await limiter.acquire()
+        
+        limiter.observe_headers({"x-ratelimit-remaining-requests": "1", "x-ratelimit-reset-requests": "50ms"})
+        assert limiter.remaining_requests == 1
+        assert limiter.snapshot()["paused_for_seconds"] > 0
+        
+        started = asyncio.get_running_loop().time()
+        await limiter.acquire()
+        assert asyncio.get_running_loop().time() - started >= 0.04
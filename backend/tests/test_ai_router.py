@@ -0,0 +1,96 @@
+import pytest
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.ai_router import AIBackend, BackendRouter
+
+
+def make_router(count: int = 3) -> BackendRouter:
+    return BackendRouter([
+        AIBackend(f"b{index}", f"http://127.0.0.1:{9000 + index}/v1", "sim", "gpt-4.1-mini")
+        for index in range(count)
+    ])
+
+
+class TestBackendRouter:
+    
+    def test_prefers_lower_latency_backend(self):
+        router = make_router(2)
+        fast, slow = router.backends
+        for _ in range(3):
+            router.record(fast, 0.2, success=True)
+            router.record(slow, 0.5, success=True)
+        
+        choices = [router.select() for _ in range(50)]
+        
+        assert all(choice is fast for choice in choices)
+        assert router.decisions == 50
+        assert fast.selected == 50
+    
+    def test_consecutive_failures_eject_backend(self):
+        router = make_router(2)
+        failing = router.backends[0]
+        
+        for _ in range(3):
+            router.record(failing, 1.0, success=False)
+        
+        assert failing.ejected
+        assert all(router.select() is router.backends[1] for _ in range(20))
+    
+    def test_latency_outlier_is_ejected(self):
+        router = make_router(3)
+        for backend in router.backends[1:]:
+            router.record(backend, 0.5, success=True)
+        
+        outlier = router.backends[0]
+        for _ in range(5):
+            router.record(outlier, 5.0, success=True)
+        
+        assert outlier.ejected
+        assert outlier.snapshot()["times_ejected"] == 1
+    
+    def test_last_healthy_backend_is_never_ejected(self):
+        router = make_router(1)
+        only = router.backends[0]
+        
+        for _ in range(10):
+            router.record(only, 1.0, success=False)
+        
+        assert not only.ejected
+        assert router.select() is only
+    
+    def test_retry_excludes_failed_backend(self):
+        router = make_router(2)
+        first = router.select()
+        
+        assert router.select(exclude=first) is not first
+
+
+class TestMultiBackendFailover:
+    
+    @pytest.mark.asyncio
+    async def test_retry_fails_over_to_another_backend(self):
+        import httpx
+        from app.services.ai_service import AIService
+        
+        def handler(request):
+            if request.url.port == 9000:
+                return httpx.Response(503, headers={"retry-after": "30"}, text="unavailable")
+            return httpx.Response(200, json={"choices": [{"message": {"content": '{"quality_score": 6}'}}]})
+        
+        service = AIService()
+        service.router = make_router(2)
+        service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        
+        with patch('app.services.ai_service.settings.AI_RETRY_BASE_DELAY', 0.01), \
+                patch.object(service.router, 'select', side_effect=[service.router.backends[0], service.router.backends[1]]):
+            (data, usage), backend = await service._call_with_retry(lambda backend: service._complete(backend, {}))
+        await service.close()
+        
+        assert data["quality_score"] == 6
+        assert backend.name == "b1"
+        assert service.router.backends[0].errors == 1
+        assert service.router.backends[0].in_flight == 0
@@ -1,6 +1,7 @@
 import pytest
 import os
 import sys
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
@@ -30,4 +31,302 @@ class TestAIService:
         prompt = service._build_review_prompt("print('hello')", ProgrammingLanguage.PYTHON, "Test script")
         
         assert "python" in prompt.lower()
-        assert "print('hello')" in prompt
\ No newline at end of file
+        assert "print('hello')" in prompt
+    
+    @pytest.mark.asyncio
+    async def test_shared_client_is_reused_and_closed(self):
+        from app.services.ai_service import AIService
+        
+        service = AIService()
+        client = service.client
+        
+        assert service.client is client
+        
+        await service.close()
+        assert client.is_closed
+        assert service._client is None
+    
+    @pytest.mark.asyncio
+    async def test_streaming_completion_reports_sections(self):
+        import httpx
+        import json
+        from app.services.ai_service import AIService
+        
+        content = json.dumps({"quality_score": 8, "issues": ["x"], "suggestions": []})
+        events = "".join(
+            f"data: {json.dumps({'choices': [{'delta': {'content': content[i:i + 7]}}]})}\n\n"
+            for i in range(0, len(content), 7)
+        ) + "data: [DONE]\n\n"
+        
+        service = AIService()
+        service._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, text=events))
+        )
+        
+        sections = []
+        
+        async def on_section(key, value):
+            sections.append(key)
+        
+        result, usage = await service._complete_streaming(service.router.primary, {"messages": []}, on_section)
+        await service.close()
+        
+        assert result["quality_score"] == 8
+        assert sections == ["quality_score", "issues", "suggestions"]
+    
+    def test_merge_feedback_dedupes_and_weights_scores(self):
+        from app.services.ai_service import AIService
+        from app.models.review import ReviewFeedback
+        from app.utils.code_chunker import CodeChunk
+        
+        service = AIService()
+        chunks = [CodeChunk(1, 10, "x" * 300), CodeChunk(11, 12, "y" * 100)]
+        results = [
+            ReviewFeedback(quality_score=8, issues=["Missing error handling."]),
+            ReviewFeedback(quality_score=4, issues=["missing error handling", "Unused import"])
+        ]
+        
+        merged = service._merge_feedback(chunks, results)
+        
+        assert merged.quality_score == 7
+        assert merged.issues == ["Missing error handling.", "Unused import"]
+    
+    def test_completion_budget_scales_with_input(self):
+        from app.services.ai_service import AIService
+        from app.models.review import ProgrammingLanguage
+        from app.core.config import settings
+        
+        service = AIService()
+        small = service._estimate_prompt_tokens("x = 1", ProgrammingLanguage.PYTHON, None)
+        large = service._estimate_prompt_tokens("value = compute(x)\n" * 400, ProgrammingLanguage.PYTHON, None)
+        
+        assert small < large
+        assert service._completion_budget(small) < service._completion_budget(large)
+        assert service._completion_budget(large) == settings.COMPLETION_TOKENS_MAX
+        assert service._completion_budget(0) == settings.COMPLETION_TOKENS_MIN
+    
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors_honouring_retry_after(self):
+        import httpx
+        from app.services.ai_service import AIService
+        
+        responses = iter([
+            httpx.Response(429, headers={"retry-after-ms": "10"}, text="slow down"),
+            httpx.Response(503, text="unavailable"),
+            httpx.Response(200, json={"choices": [{"message": {"content": '{"quality_score": 9}'}}]})
+        ])
+        
+        service = AIService()
+        service._client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: next(responses)))
+        
+        with patch('app.services.ai_service.settings.AI_RETRY_BASE_DELAY', 0.01):
+            (data, usage), backend = await service._call_with_retry(lambda backend: service._complete(backend, {}))
+        await service.close()
+        
+        assert data["quality_score"] == 9
+        assert service.circuit_breaker.state == "closed"
+    
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self):
+        import httpx
+        from app.services.ai_service import AIService, UpstreamError
+        
+        calls = []
+        
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(400, text="bad request")
+        
+        service = AIService()
+        service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        
+        with pytest.raises(UpstreamError):
+            await service._call_with_retry(lambda backend: service._complete(backend, {}))
+        await service.close()
+        
+        assert len(calls) == 1
+    
+    @pytest.mark.asyncio
+    async def test_half_open_probe_is_settled_on_every_exit(self):
+        import asyncio
+        import httpx
+        from app.services.ai_service import AIService, UpstreamError
+        
+        def half_open(service):
+            service.circuit_breaker._state = service.circuit_breaker.HALF_OPEN
+            service.circuit_breaker._half_open_calls = 0
+        
+        service = AIService()
+        service._client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(400, text="bad")))
+        
+        half_open(service)
+        with pytest.raises(UpstreamError):
+            await service._call_with_retry(lambda backend: service._complete(backend, {}))
+        assert service.circuit_breaker.state == "closed"
+        
+        async def cancelled(backend):
+            raise asyncio.CancelledError()
+        
+        half_open(service)
+        with pytest.raises(asyncio.CancelledError):
+            await service._call_with_retry(cancelled)
+        assert service.circuit_breaker.state == "half_open"
+        service.circuit_breaker.before_call()
+        await service.close()
+    
+    def test_static_prefix_is_stable_and_code_comes_last(self):
+        from app.services.ai_service import AIService
+        from app.models.review import ProgrammingLanguage
+        
+        service = AIService()
+        first = service._build_messages("a = 1", ProgrammingLanguage.PYTHON, None)
+        second = service._build_messages("b = 2", ProgrammingLanguage.PYTHON, "Other context")
+        
+        assert first[0] == second[0]
+        assert "PEP 8" in first[0]["content"]
+        assert "quality_score" in first[0]["content"]
+        assert first[-1]["role"] == "user"
+        assert "a = 1" in first[-1]["content"]
+        assert "a = 1" not in first[0]["content"]
+    
+    
+    def test_compute_cost_discounts_cached_and_batch_tokens(self):
+        from app.services.ai_service import AIService
+        from app.core.config import settings
+        
+        service = AIService()
+        full = service.compute_cost(1_000_000, 0, 0)
+        cached = service.compute_cost(1_000_000, 1_000_000, 0)
+        
+        assert full == pytest.approx(settings.OPENAI_PRICE_INPUT_PER_1M)
+        assert cached == pytest.approx(settings.OPENAI_PRICE_CACHED_INPUT_PER_1M)
+        assert service.compute_cost(0, 0, 1000, batch=True) == pytest.approx(
+            service.compute_cost(0, 0, 1000) * settings.OPENAI_BATCH_DISCOUNT
+        )
+    
+    
+    def test_cache_hits_report_zero_cost(self):
+        from app.services.ai_service import AIService
+        from app.models.review import ReviewFeedback
+        
+        service = AIService()
+        original = ReviewFeedback(quality_score=7, cost_info={
+            "source": "upstream", "model": "gpt-4.1-mini", "prompt_tokens": 900, "cost_usd": 0.0004
+        })
+        
+        hit = service._as_cache_hit(original)
+        
+        assert hit.cost_info["source"] == "cache"
+        assert hit.cost_info["cost_usd"] == 0.0
+        assert hit.cost_info["saved_cost_usd"] == 0.0004
+        assert original.cost_info["source"] == "upstream"
+        assert service._as_cache_hit(hit) is hit
+    
+    @pytest.mark.asyncio
+    async def test_incremental_review_only_sends_changed_units(self):
+        import time
+        from unittest.mock import AsyncMock
+        from app.services.ai_service import AIService
+        from app.models.review import ReviewFeedback, ProgrammingLanguage
+        from app.utils.code_chunker import CodeChunk
+        
+        units = [CodeChunk(1, 3, "def a():\n    return 1\n\n"), CodeChunk(4, 5, "def b():\n    return 2\n")]
+        cached_unit = ReviewFeedback(quality_score=9, issues=["a is fine"], cost_info={"model": "m", "cost_usd": 0.001})
+        fresh_unit = ReviewFeedback(quality_score=5, issues=["b is odd"], cost_info={"model": "m", "cost_usd": 0.002})
+        
+        service = AIService()
+        generate = AsyncMock(return_value=fresh_unit)
+        
+        with patch('app.services.ai_service.cache_service.get_cached_unit_feedback',
+                   AsyncMock(side_effect=[cached_unit, None])), \
+             patch('app.services.ai_service.cache_service.cache_unit_feedback', AsyncMock(return_value=True)) as cache_unit, \
+             patch('app.services.ai_service.cache_service.cache_feedback', AsyncMock(return_value=True)), \
+             patch.object(service, '_generate_feedback', generate):
+            feedback = await service._review_incremental(
+                "".join(unit.text for unit in units), ProgrammingLanguage.PYTHON, None, time.time(), units
+            )
+        
+        generate.assert_awaited_once()
+        assert generate.call_args.args[0] == units[1].text
+        cache_unit.assert_awaited_once()
+        assert feedback.issues == ["a is fine", "b is odd"]
+        assert feedback.cost_info["source"] == "incremental"
+        assert feedback.cost_info["units_cached"] == 1
+        assert feedback.cost_info["cost_usd"] == 0.002
+    
+    @pytest.mark.asyncio
+    async def test_units_are_reviewed_separately_only_when_some_are_cached(self):
+        from unittest.mock import AsyncMock
+        from app.services.ai_service import AIService
+        from app.models.review import ReviewFeedback, ProgrammingLanguage
+        
+        code = "\n\n".join(f"def f{i}(items):\n" + "    total = sum(items)\n" * 20 + "    return total\n" for i in range(3))
+        feedback = ReviewFeedback(quality_score=7)
+        on_section = AsyncMock()
+        
+        async def review(unit_hits):
+            service = AIService()
+            with patch('app.services.ai_service.cache_service.get_cached_feedback', AsyncMock(return_value=None)), \
+                 patch('app.services.ai_service.cache_service.get_near_duplicate_feedback', AsyncMock(return_value=None)), \
+                 patch('app.services.ai_service.cache_service.get_cached_unit_feedback', AsyncMock(side_effect=unit_hits)), \
+                 patch.object(service, '_review_uncached', AsyncMock(return_value=feedback)) as uncached, \
+                 patch.object(service, '_review_incremental', AsyncMock(return_value=feedback)) as incremental:
+                await service.review_code(code, ProgrammingLanguage.PYTHON, on_section=on_section)
+            return uncached, incremental
+        
+        uncached, incremental = await review([None, None, None])
+        incremental.assert_not_awaited()
+        assert uncached.call_args.args[-1] is on_section
+        
+        uncached, incremental = await review([feedback, None, None])
+        uncached.assert_not_awaited()
+        assert incremental.call_args.args[-1] == [feedback, None, None]
+    
+    @pytest.mark.asyncio
+    async def test_full_file_fallback_errors_are_not_wrapped_twice(self):
+        from unittest.mock import AsyncMock
+        from app.services.ai_service import AIService
+        from app.models.review import ReviewFeedback, ProgrammingLanguage
+        
+        service = AIService()
+        
+        with patch('app.services.ai_service.cache_service.get_cached_feedback', AsyncMock(return_value=None)), \
+             patch('app.services.ai_service.cache_service.get_near_duplicate_feedback', AsyncMock(return_value=None)), \
+             patch.object(service, '_review_uncached', AsyncMock(side_effect=RuntimeError("boom"))), \
+             pytest.raises(Exception) as exc_info:
+            await service.review_changes("a = 1\n", "b = 2\n", ProgrammingLanguage.PYTHON, ReviewFeedback(quality_score=5))
+        
+        assert str(exc_info.value) == "Error in code review: boom"
+    
+    @pytest.mark.asyncio
+    async def test_diff_review_sends_changed_regions_and_carries_forward(self):
+        from unittest.mock import AsyncMock
+        from app.services.ai_service import AIService
+        from app.models.review import ReviewFeedback, ProgrammingLanguage
+        
+        old_code = "\n".join(f"value_{i} = compute({i})" for i in range(1, 41))
+        new_code = old_code.replace("value_30 = compute(30)", "value_30 = compute(30) / 0")
+        prior = ReviewFeedback(
+            quality_score=8,
+            issues=["Line 5: value_5 shadows a builtin", "Line 30: result is discarded"],
+            suggestions=["Batch the compute calls"]
+        )
+        fresh = ReviewFeedback(quality_score=3, issues=["Line 30: division by zero"], cost_info={"model": "m", "cost_usd": 0.001})
+        
+        service = AIService()
+        generate = AsyncMock(return_value=fresh)
+        
+        with patch('app.services.ai_service.cache_service.get_cached_feedback', AsyncMock(return_value=None)), \
+             patch('app.services.ai_service.cache_service.cache_feedback', AsyncMock(return_value=True)), \
+             patch.object(service, '_generate_feedback', generate):
+            feedback = await service.review_changes(old_code, new_code, ProgrammingLanguage.PYTHON, prior)
+        
+        excerpt = generate.call_args.args[0]
+        assert "value_30 = compute(30) / 0" in excerpt
+        assert "value_1 = " not in excerpt and len(excerpt.split("\n")) == 7
+        assert "Changed lines 27-33" in generate.call_args.args[2]
+        assert feedback.issues == ["Line 30: division by zero", "Line 5: value_5 shadows a builtin"]
+        assert feedback.suggestions == ["Batch the compute calls"]
+        assert feedback.cost_info["source"] == "diff"
+        assert feedback.cost_info["reviewed_lines"] == 7
+        assert feedback.cost_info["carried_forward"] == 2
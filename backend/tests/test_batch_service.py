@@ -0,0 +1,73 @@
+import pytest
+import json
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from bson import ObjectId
+
+from app.services.batch_service import BatchService
+
+
+class TestBatchService:
+    
+    @pytest.fixture
+    def mock_db(self):
+        db = MagicMock()
+        db.reviews.update_one = AsyncMock()
+        db.reviews.update_many = AsyncMock()
+        db.reviews.find_one = AsyncMock(side_effect=lambda query: {
+            "_id": query["_id"],
+            "code": "x = 1",
+            "language": "python",
+            "created_at": datetime.utcnow()
+        })
+        return db
+    
+    @pytest.mark.asyncio
+    async def test_results_fan_out_to_reviews_and_cache(self, mock_db):
+        service = BatchService()
+        done_id, failed_id, missing_id = ObjectId(), ObjectId(), ObjectId()
+        content = json.dumps({"quality_score": 8, "issues": ["a"]})
+        output = [
+            {"custom_id": str(done_id), "response": {"status_code": 200, "body": {
+                "choices": [{"message": {"content": content}}],
+                "usage": {"prompt_tokens": 100, "completion_tokens": 20}
+            }}},
+            {"custom_id": str(failed_id), "response": {"status_code": 500, "body": {"error": "boom"}}}
+        ]
+        record = {"batch_id": "batch_1", "review_ids": [done_id, failed_id, missing_id]}
+        cache_feedback = AsyncMock(return_value=True)
+        publish = AsyncMock()
+        
+        with patch('app.services.batch_service.get_database', return_value=mock_db), \
+             patch.object(service, '_read_jsonl', AsyncMock(return_value=output)), \
+             patch('app.services.batch_service.cache_service.cache_feedback', cache_feedback), \
+             patch('app.services.batch_service.review_events.publish', publish):
+            await service._collect_results(record, {"status": "expired", "output_file_id": "file_1"})
+        
+        updates = {call.args[0]["_id"]: call.args[1]["$set"] for call in mock_db.reviews.update_one.call_args_list}
+        assert updates[done_id]["status"] == "completed"
+        assert updates[done_id]["feedback"]["cost_info"]["batch_id"] == "batch_1"
+        assert updates[failed_id]["status"] == "failed"
+        cache_feedback.assert_awaited_once()
+        
+        requeued = mock_db.reviews.update_many.call_args.args
+        assert requeued[0]["_id"]["$in"] == [missing_id]
+        assert requeued[1]["$set"]["batch_id"] is None
+        
+        events = {call.args[0]: call.args[1] for call in publish.await_args_list}
+        assert events == {str(done_id): "completed", str(failed_id): "failed", str(missing_id): "status"}
+    
+    @pytest.mark.asyncio
+    async def test_cycle_is_skipped_without_the_lease(self):
+        service = BatchService()
+        redis = MagicMock()
+        redis.set = AsyncMock(return_value=False)
+        redis.exists = AsyncMock(return_value=False)
+        
+        with patch('app.services.batch_service.redis_client', redis), \
+             patch.object(service, 'submit_pending', AsyncMock()) as submit_pending, \
+             patch.object(service, 'poll_batches', AsyncMock()) as poll_batches:
+            await service.run_once()
+        
+        submit_pending.assert_not_awaited()
+        poll_batches.assert_not_awaited()
@@ -63,6 +63,25 @@ class TestCacheService:
             assert result.quality_score == 8
             assert "Consider adding error handling" in result.issues
     
+    @pytest.mark.asyncio
+    async def test_batch_lookup_uses_one_mget(self, cache_service, sample_feedback):
+        """Batch lookups read every key in one MGET and keep the input order"""
+        mock_redis = MagicMock()
+        mock_redis.mget = AsyncMock(return_value=[None, '{"feedback": %s}' % sample_feedback.json()])
+        mock_redis.incrby = AsyncMock(return_value=1)
+        mock_redis.get = AsyncMock(return_value="1")
+        mock_redis.set = AsyncMock(return_value=True)
+        
+        with patch('app.services.cache_service.redis_client', mock_redis):
+            results = await cache_service.get_cached_feedback_many([
+                ("def a(): pass", ProgrammingLanguage.PYTHON, None),
+                ("def b(): pass", ProgrammingLanguage.PYTHON, None)
+            ])
+        
+        mock_redis.mget.assert_awaited_once()
+        assert results[0] is None
+        assert results[1].quality_score == 8
+    
     @pytest.mark.asyncio
     async def test_cache_storage_with_mock_redis(self, cache_service, sample_feedback):
         """Test cache storage with mocked Redis"""
@@ -96,4 +115,110 @@ class TestCacheService:
         """Test cache clear when Redis is not available"""
         with patch('app.services.cache_service.redis_client', None):
             deleted_count = await cache_service.clear_cache()
-            assert deleted_count == 0
\ No newline at end of file
+            assert deleted_count == 0
+
+class InMemoryRedis:
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+        self.round_trips = 0
+    
+    async def get(self, key):
+        return self.values.get(key)
+    
+    async def set(self, key, value, ex=None, nx=False):
+        self.values[key] = value
+        return True
+    
+    async def incr(self, key):
+        self.values[key] = str(int(self.values.get(key) or 0) + 1)
+        return int(self.values[key])
+    
+    async def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+        return len(members)
+    
+    async def smembers(self, key):
+        return set(self.sets.get(key, set()))
+    
+    async def sunion(self, keys):
+        self.round_trips += 1
+        return set().union(*[self.sets.get(key, set()) for key in keys])
+    
+    async def mget(self, keys):
+        self.round_trips += 1
+        return [self.values.get(key) for key in keys]
+    
+    async def expire(self, key, seconds):
+        return True
+    
+    async def eval(self, script, keys, args):
+        # INDEX_NEAR_DUPLICATE_SCRIPT
+        self.round_trips += 1
+        self.values[keys[0]] = args[1]
+        for bucket in keys[1:]:
+            self.sets.setdefault(bucket, set()).add(args[0])
+        return 1
+
+
+NEAR_DUPLICATE_CODE = """
+def calculate_invoice_total(order, tax_rate):
+    subtotal = 0
+    for line in order.lines:
+        if line.quantity <= 0:
+            raise ValueError("Invalid quantity for line")
+        subtotal += line.unit_price * line.quantity
+    discount = order.discount or 0
+    taxed = (subtotal - discount) * (1 + tax_rate)
+    return round(taxed, 2)
+"""
+
+
+class TestNearDuplicateCache:
+    
+    @pytest.mark.asyncio
+    async def test_renamed_variable_is_served_as_approximate(self):
+        service = CodeCacheService()
+        redis = InMemoryRedis()
+        feedback = ReviewFeedback(quality_score=7, issues=["No currency rounding policy"])
+        renamed = NEAR_DUPLICATE_CODE.replace("subtotal", "running_total").replace("Invalid quantity", "Bad quantity")
+        
+        with patch('app.services.cache_service.redis_client', redis):
+            await service.cache_feedback(NEAR_DUPLICATE_CODE, ProgrammingLanguage.PYTHON, feedback)
+            assert redis.round_trips == 1
+            exact = await service.get_cached_feedback(renamed, ProgrammingLanguage.PYTHON)
+            near = await service.get_near_duplicate_feedback(renamed, ProgrammingLanguage.PYTHON)
+        
+        # One scripted index write; one SUNION over the bands and one MGET of the candidates
+        assert redis.round_trips == 3
+        assert exact is None
+        assert near is not None
+        assert near.approximate
+        assert near.similarity >= 0.9
+        assert near.issues == feedback.issues
+    
+    @pytest.mark.asyncio
+    async def test_different_code_or_language_is_not_reused(self):
+        service = CodeCacheService()
+        redis = InMemoryRedis()
+        feedback = ReviewFeedback(quality_score=7)
+        different = """
+class RateLimiter:
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self.calls = {}
+
+    def allow(self, client_id, now):
+        recent = [t for t in self.calls.get(client_id, []) if now - t < self.window]
+        self.calls[client_id] = recent + [now]
+        return len(recent) < self.limit
+"""
+        
+        with patch('app.services.cache_service.redis_client', redis):
+            await service.cache_feedback(NEAR_DUPLICATE_CODE, ProgrammingLanguage.PYTHON, feedback)
+            other_code = await service.get_near_duplicate_feedback(different, ProgrammingLanguage.PYTHON)
+            other_language = await service.get_near_duplicate_feedback(NEAR_DUPLICATE_CODE, ProgrammingLanguage.RUBY)
+        
+        assert other_code is None
+        assert other_language is None
@@ -0,0 +1,56 @@
+import pytest
+import time
+
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class TestCircuitBreaker:
+    
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=30)
+        
+        for _ in range(3):
+            breaker.before_call()
+            breaker.record_failure()
+        
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError) as exc_info:
+            breaker.before_call()
+        assert exc_info.value.retry_in > 0
+    
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30)
+        
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        
+        assert breaker.state == CircuitBreaker.CLOSED
+    
+    def test_half_open_probe_closes_or_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        
+        time.sleep(0.02)
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+    
+    def test_release_returns_the_probe_slot(self):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        
+        breaker.before_call()
+        breaker.release()
+        breaker.before_call()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
@@ -0,0 +1,79 @@
+import pytest
+
+from app.models.review import ProgrammingLanguage
+from app.utils.code_chunker import split_code, split_review_units, split_units
+
+
+PYTHON_CODE = '''import os
+
+
+@decorator
+def first():
+    return 1
+
+
+class Second:
+    def method(self):
+        return 2
+
+
+async def third():
+    return 3
+'''
+
+JAVA_CODE = '''public class Example {
+    private int value;
+
+    public int first() {
+        return value;
+    }
+
+    public void second() {
+        String brace = "}";
+    }
+}
+'''
+
+
+class TestCodeChunker:
+    
+    def test_python_units_follow_top_level_definitions(self):
+        units = split_units(PYTHON_CODE, ProgrammingLanguage.PYTHON)
+        
+        assert [unit.text.split("\n")[0] for unit in units] == [
+            "import os", "@decorator", "class Second:", "async def third():"
+        ]
+        assert "".join(unit.text for unit in units) == PYTHON_CODE
+    
+    def test_java_units_split_on_method_boundaries(self):
+        units = split_units(JAVA_CODE, ProgrammingLanguage.JAVA)
+        
+        assert len(units) == 3
+        assert "first()" in units[0].text
+        assert "second()" in units[1].text
+        assert "".join(unit.text for unit in units) == JAVA_CODE
+    
+    def test_chunks_respect_size_limit_and_line_numbers(self):
+        code = "\n".join(f"def f{i}():\n    return {i}\n" for i in range(50))
+        chunks = split_code(code, ProgrammingLanguage.PYTHON, max_chunk_chars=200)
+        
+        assert len(chunks) > 1
+        assert all(len(chunk.text) <= 200 for chunk in chunks)
+        assert "".join(chunk.text for chunk in chunks) == code
+        assert chunks[0].start_line == 1
+        assert chunks[1].start_line == chunks[0].end_line + 1
+    
+    def test_review_units_merge_small_units_and_isolate_edits(self):
+        code = "import os\n\n" + "".join(
+            f"def handler_{i}(request):\n" + "".join(f"    step_{j} = request.get('{j}')\n" for j in range(8)) + "\n"
+            for i in range(3)
+        )
+        edited = code.replace("step_3 = request.get('3')", "step_3 = request.get('three')", 1)
+        
+        units = split_review_units(code, ProgrammingLanguage.PYTHON, min_chars=100, max_chars=2000)
+        edited_units = split_review_units(edited, ProgrammingLanguage.PYTHON, min_chars=100, max_chars=2000)
+        
+        assert len(units) == 3
+        assert units[0].text.startswith("import os")
+        assert "".join(unit.text for unit in units) == code
+        assert [a.text == b.text for a, b in zip(units, edited_units)] == [False, True, True]
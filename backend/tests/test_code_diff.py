@@ -0,0 +1,53 @@
+import pytest
+
+from app.utils.code_diff import (
+    DiffApplyError, apply_unified_diff, carry_forward_entry, changed_regions,
+    removed_identifiers, unchanged_line_map
+)
+
+
+OLD_CODE = "\n".join(f"line_{i} = {i}" for i in range(1, 21)) + "\n"
+
+
+class TestCodeDiff:
+    
+    def test_apply_unified_diff(self):
+        diff = """--- a/app.py
++++ b/app.py
+@@ -4,3 +4,4 @@
+ line_4 = 4
+-line_5 = 5
++line_5 = 50
++extra = 1
+ line_6 = 6
+"""
+        new_code = apply_unified_diff(OLD_CODE, diff)
+        
+        assert new_code.split("\n")[3:7] == ["line_4 = 4", "line_5 = 50", "extra = 1", "line_6 = 6"]
+        assert new_code.count("\n") == OLD_CODE.count("\n") + 1
+    
+    def test_apply_unified_diff_rejects_mismatched_context(self):
+        with pytest.raises(DiffApplyError):
+            apply_unified_diff(OLD_CODE, "@@ -4,1 +4,1 @@\n-line_4 = 40\n+line_4 = 4\n")
+        with pytest.raises(DiffApplyError):
+            apply_unified_diff(OLD_CODE, "not a diff")
+    
+    def test_changed_regions_include_context_and_merge(self):
+        new_code = OLD_CODE.replace("line_5 = 5", "line_5 = 50").replace("line_8 = 8", "line_8 = 80")
+        
+        regions = changed_regions(OLD_CODE, new_code, context=2)
+        
+        assert [(region.start_line, region.end_line) for region in regions] == [(3, 10)]
+        assert changed_regions(OLD_CODE, OLD_CODE) == []
+    
+    def test_carry_forward_remaps_or_drops_entries(self):
+        new_code = "header = 0\n" + OLD_CODE.replace("line_5 = 5\n", "")
+        line_map = unchanged_line_map(OLD_CODE, new_code)
+        removed = removed_identifiers(OLD_CODE, new_code)
+        
+        assert line_map[10] == 10 and line_map[3] == 4
+        assert carry_forward_entry("Line 3: magic number", line_map, removed) == "Line 4: magic number"
+        assert carry_forward_entry("Lines 10-12 repeat a pattern", line_map, removed) == "Lines 10-12 repeat a pattern"
+        assert carry_forward_entry("Line 5: unused variable", line_map, removed) is None
+        assert carry_forward_entry("line_5 is never read", line_map, removed) is None
+        assert carry_forward_entry("Consistent naming", line_map, removed) == "Consistent naming"
@@ -0,0 +1,79 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.models.review import ProgrammingLanguage
+from app.services.cache_service import CodeCacheService
+from app.utils.code_normalizer import normalize_code
+
+
+EQUIVALENT = [
+    (ProgrammingLanguage.PYTHON, "def f(x):\n    return x+1\n", "def f(x):  # add one\n\n    return x + 1   \n"),
+    (ProgrammingLanguage.PYTHON, "s = 'a'\n", "s = 'a'  # type: str\n"),
+    (ProgrammingLanguage.JAVASCRIPT, "const a = b + c;\n", "/* sum */ const a=b+c; // done\n"),
+    (ProgrammingLanguage.JAVA, "class A {\n  int x = 1;\n}", "class A { int x = 1; } // one line"),
+    (ProgrammingLanguage.GO, "x := y\n", "x  :=  y // assign\n"),
+    (ProgrammingLanguage.RUBY, "puts x\n", "=begin\nprint it\n=end\nputs x # out\n"),
+    (ProgrammingLanguage.PHP, "$a = 1;\n", "# set\n$a = 1; // one\n"),
+    (ProgrammingLanguage.RUST, "fn f<'a>(x: &'a str) {}", "fn f<'a>(x: &'a str) {} // lifetime"),
+    # Division after an operand is not mistaken for a regex literal
+    (ProgrammingLanguage.JAVASCRIPT, "const half = total / 2;\n", "const half = total/2; // half\n"),
+    (ProgrammingLanguage.RUBY, "avg = (a + b) / 2\n", "avg = (a+b) / 2 # mean\n"),
+]
+
+DIFFERENT = [
+    # Case matters in every supported language
+    (ProgrammingLanguage.PYTHON, "Value = 1\n", "value = 1\n"),
+    (ProgrammingLanguage.JAVA, "String s = name;", "String s = Name;"),
+    # Whitespace and comment markers inside string literals are data
+    (ProgrammingLanguage.PYTHON, "s = 'a  b'\n", "s = 'a b'\n"),
+    (ProgrammingLanguage.JAVASCRIPT, "const u = 'http://x';\n", "const u = 'http:';\n"),
+    (ProgrammingLanguage.RUBY, 'puts "#{x} # y"\n', 'puts "#{x}"\n'),
+    # Python indentation is syntax
+    (ProgrammingLanguage.PYTHON, "if a:\n    b()\n    c()\n", "if a:\n    b()\nc()\n"),
+    # Newlines end statements in JavaScript and Go
+    (ProgrammingLanguage.JAVASCRIPT, "return\nx;\n", "return x;\n"),
+    (ProgrammingLanguage.GO, "x := y\n-z\n", "x := y -z\n"),
+    # Operator runs are not split or merged
+    (ProgrammingLanguage.CPP, "x = a++ + b;", "x = a + ++b;"),
+    (ProgrammingLanguage.CSHARP, "x = a - -b;", "x = a--b;"),
+    # Commented-out code stays out, uncommented code stays in
+    (ProgrammingLanguage.JAVASCRIPT, "run();\n// stop();\n", "run();\nstop();\n"),
+    # Comment markers and spaces inside regex and %-literals are data
+    (
+        ProgrammingLanguage.JAVASCRIPT,
+        "const ok = /^https?:\\/\\//.test(s) && s.length > 5;",
+        "const ok = /^https?:\\/\\//.test(s) || deleteAll();"
+    ),
+    (
+        ProgrammingLanguage.RUBY,
+        "ok = line =~ /^[^#]+$/ ? keep(line) : drop(line)",
+        "ok = line =~ /^[^#]+$/ ? drop(line) : keep(line)"
+    ),
+    (ProgrammingLanguage.TYPESCRIPT, "if (s) /a b/.test(s);", "if (s) /a  b/.test(s);"),
+    (ProgrammingLanguage.RUBY, "words = %w[a #b]\n", "words = %w[a #c]\n"),
+    # '#[' is a PHP 8 attribute, not a comment
+    (ProgrammingLanguage.PHP, "#[Deprecated]\nfunction f() {}\n", "function f() {}\n"),
+]
+
+
+class TestCodeNormalizer:
+    
+    @pytest.mark.parametrize("language,first,second", EQUIVALENT)
+    def test_formatting_and_comment_changes_normalize_equal(self, language, first, second):
+        assert normalize_code(first, language) == normalize_code(second, language)
+    
+    @pytest.mark.parametrize("language,first,second", DIFFERENT)
+    def test_semantically_different_code_never_collides(self, language, first, second):
+        service = CodeCacheService()
+        
+        assert normalize_code(first, language) != normalize_code(second, language)
+        assert service._generate_code_hash(first, language) != service._generate_code_hash(second, language)
+    
+    def test_unknown_language_only_trims_blank_lines(self):
+        code = "A  =  1   \n\n  b = 2"
+        
+        assert normalize_code(code, ProgrammingLanguage.OTHER) == "A  =  1\n  b = 2"
@@ -0,0 +1,31 @@
+import pytest
+import json
+
+from app.utils.json_stream import IncrementalJSONObjectParser
+
+
+class TestIncrementalJSONObjectParser:
+    
+    def test_members_emitted_as_they_complete(self):
+        parser = IncrementalJSONObjectParser()
+        
+        assert parser.feed('{"quality_score": 7, "iss') == [("quality_score", 7)]
+        assert parser.feed('ues": ["a, b", "c]"]') == []
+        assert parser.feed(', "suggestions": []}') == [("issues", ["a, b", "c]"]), ("suggestions", [])]
+        assert parser.done
+    
+    def test_character_by_character_matches_full_parse(self):
+        document = {
+            "quality_score": 6,
+            "issues": ["Escaped \"quote\" and {brace}"],
+            "security_concerns": [],
+            "positive_aspects": ["nested", {"ok": [1, 2]}]
+        }
+        text = json.dumps(document, indent=2)
+        
+        parser = IncrementalJSONObjectParser()
+        members = []
+        for char in text:
+            members.extend(parser.feed(char))
+        
+        assert dict(members) == document
@@ -0,0 +1,41 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.utils.minhash import MinHasher, shingles
+
+
+class TestMinHash:
+    
+    def test_identical_code_has_identical_signature(self):
+        hasher = MinHasher(num_perm=64, bands=16)
+        code = "for (let i = 0; i < items.length; i++) { total += items[i].price; }"
+        
+        assert hasher.signature(shingles(code)) == hasher.signature(shingles(code))
+        assert MinHasher.similarity(hasher.signature(shingles(code)), hasher.signature(shingles(code))) == 1.0
+    
+    def test_literals_and_identifiers_are_abstracted(self):
+        first = shingles('log("starting job", 10)')
+        second = shingles('log("job started", 25)')
+        
+        assert {feature for feature in first if not feature.startswith("id:")} == \
+            {feature for feature in second if not feature.startswith("id:")}
+    
+    def test_similarity_tracks_jaccard(self):
+        hasher = MinHasher(num_perm=128, bands=32)
+        first = {f"feature-{index}" for index in range(100)}
+        second = {f"feature-{index}" for index in range(50, 150)}
+        
+        estimate = MinHasher.similarity(hasher.signature(first), hasher.signature(second))
+        
+        assert abs(estimate - 1 / 3) < 0.12
+    
+    def test_band_keys_match_for_identical_signatures(self):
+        hasher = MinHasher(num_perm=64, bands=16)
+        signature = hasher.signature({"a", "b", "c"})
+        
+        keys = hasher.band_keys(signature)
+        
+        assert len(keys) == 16
+        assert keys == hasher.band_keys(list(signature))
@@ -0,0 +1,46 @@
+import pytest
+from unittest.mock import patch
+
+from app.services.prompt_cache_stats import RECORD_SCRIPT, STATS_SCRIPT, PromptCacheStats
+
+
+class HashRedis:
+    """
+    Runs the telemetry scripts against in-memory hashes, counting round trips
+    """
+    
+    def __init__(self):
+        self.hashes = {}
+        self.calls = 0
+    
+    async def eval(self, script, keys, args):
+        self.calls += 1
+        if script == RECORD_SCRIPT:
+            counters = self.hashes.setdefault(keys[0], {})
+            for field, amount in zip(args[::2], args[1::2]):
+                counters[field] = str(int(counters.get(field, 0)) + int(amount))
+            return 1
+        if script == STATS_SCRIPT:
+            return [[item for pair in self.hashes.get(key, {}).items() for item in pair] for key in keys]
+
+
+class TestPromptCacheStats:
+    
+    @pytest.mark.asyncio
+    async def test_each_record_and_read_is_one_round_trip(self):
+        stats = PromptCacheStats()
+        redis = HashRedis()
+        
+        with patch('app.services.prompt_cache_stats.redis_client', redis):
+            await stats.record("python", 1000, 800, 0.2)
+            await stats.record("python", 1000, 0, 0.6)
+            assert redis.calls == 2
+            
+            result = await stats.get_stats()
+        
+        assert redis.calls == 3
+        python = result["languages"]["python"]
+        assert python["requests"] == 2 and python["prefix_hit_rate_percent"] == 50.0
+        assert python["cached_token_ratio_percent"] == 40.0
+        assert (python["avg_latency_ms_hit"], python["avg_latency_ms_miss"]) == (200.0, 600.0)
+        assert list(result["languages"]) == ["python"]
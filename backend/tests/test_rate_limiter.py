@@ -27,4 +27,14 @@ class TestRateLimiter:
         
         limiter = RateLimiter()
         result = await limiter.check_rate_limit("192.168.1.1")
-        assert result is True
\ No newline at end of file
+        assert result is True
+    
+    @pytest.mark.asyncio
+    async def test_batch_cost_counts_every_file(self):
+        from app.utils.rate_limiter import RateLimiter
+        from app.core.config import settings
+        
+        limiter = RateLimiter()
+        assert await limiter.check_rate_limit("10.0.0.1", cost=settings.RATE_LIMIT_PER_HOUR + 1) is False
+        assert await limiter.check_rate_limit("10.0.0.1", cost=settings.RATE_LIMIT_PER_HOUR) is True
+        assert await limiter.get_remaining_requests("10.0.0.1") == 0
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import pytest
+from bson import ObjectId
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.review_events import ReviewEventHub, format_event
+
+
+def parse_frames(frames):
+    return [json.loads(frame.split("data: ", 1)[1]) for frame in frames if frame.startswith("event:")]
+
+
+class TestReviewEventHub:
+    
+    @pytest.mark.asyncio
+    async def test_one_subscription_fans_out_to_local_watchers(self):
+        pubsub = MagicMock()
+        pubsub.subscribe = AsyncMock()
+        pubsub.unsubscribe = AsyncMock()
+        pubsub.get_message = AsyncMock(return_value=None)
+        pubsub.reset = AsyncMock()
+        redis = MagicMock()
+        redis.pubsub.return_value = pubsub
+        hub = ReviewEventHub()
+        
+        with patch('app.services.review_events.redis_client', redis):
+            first = await hub.watch("review-1")
+            second = await hub.watch("review-1")
+            hub._deliver(hub.channel("review-1"), json.dumps({"type": "status", "status": "in_progress"}))
+            
+            assert first.get_nowait()["status"] == "in_progress"
+            assert second.get_nowait()["status"] == "in_progress"
+            pubsub.subscribe.assert_awaited_once_with("review_events:review-1")
+            
+            await hub.unwatch("review-1", first)
+            pubsub.unsubscribe.assert_not_awaited()
+            await hub.unwatch("review-1", second)
+            pubsub.unsubscribe.assert_awaited_once_with("review_events:review-1")
+            await hub.close()
+    
+    def test_event_frames_are_named_by_type(self):
+        frame = format_event({"type": "completed", "status": "completed"})
+        assert frame.startswith("event: completed\ndata: ")
+        assert frame.endswith("\n\n")
+
+
+class TestReviewEventStream:
+    
+    @pytest.mark.asyncio
+    async def test_stream_ends_with_the_final_feedback(self):
+        from app.services.review_service import ReviewService
+        
+        review_id = str(ObjectId())
+        queue = asyncio.Queue()
+        queue.put_nowait({"type": "section", "section": "issues", "value": ["Line 1: x"]})
+        queue.put_nowait({"type": "completed", "status": "completed", "feedback": {"quality_score": 8}})
+        service = ReviewService()
+        
+        with patch('app.services.review_service.review_events.watch', AsyncMock(return_value=queue)), \
+             patch('app.services.review_service.review_events.unwatch', AsyncMock()) as unwatch, \
+             patch.object(service, '_event_state', AsyncMock(return_value={"status": "in_progress"})):
+            stream = await service.watch_review(review_id)
+            events = parse_frames([frame async for frame in stream])
+        
+        assert [event["type"] for event in events] == ["status", "section", "completed"]
+        assert events[-1]["feedback"]["quality_score"] == 8
+        unwatch.assert_awaited_once_with(review_id, queue)
+    
+    @pytest.mark.asyncio
+    async def test_foreign_reviews_are_not_streamed(self):
+        from app.services.review_service import ReviewService
+        
+        service = ReviewService()
+        queue = asyncio.Queue()
+        
+        with patch('app.services.review_service.review_events.watch', AsyncMock(return_value=queue)), \
+             patch('app.services.review_service.review_events.unwatch', AsyncMock()) as unwatch, \
+             patch.object(service, '_event_state', AsyncMock(return_value={"status": "pending", "user_id": "other"})):
+            assert await service.watch_review(str(ObjectId()), user_id="me") is None
+        
+        unwatch.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_status_is_polled_without_pubsub(self):
+        from app.services.review_service import ReviewService
+        
+        service = ReviewService()
+        states = [
+            {"status": "pending"},
+            {"status": "pending"},
+            {"status": "failed", "error_message": "boom"}
+        ]
+        
+        with patch('app.services.review_service.review_events.watch', AsyncMock(return_value=None)), \
+             patch('app.services.review_service.settings.REVIEW_EVENTS_POLL_SECONDS', 0), \
+             patch.object(service, '_event_state', AsyncMock(side_effect=states)):
+            stream = await service.watch_review(str(ObjectId()))
+            frames = [frame async for frame in stream]
+        
+        events = parse_frames(frames)
+        assert [event["type"] for event in events] == ["status", "failed"]
+        assert events[-1]["error_message"] == "boom"
+        assert ": keepalive\n\n" in frames
+
+
+class TestLongPoll:
+    
+    @pytest.fixture
+    def pending_db(self):
+        review_id = ObjectId()
+        db = MagicMock()
+        db.reviews.find_one = AsyncMock(return_value={
+            "_id": review_id, "code": "print(1)", "language": "python", "status": "pending"
+        })
+        return review_id, db
+    
+    @pytest.mark.asyncio
+    async def test_wait_returns_on_the_completion_event(self, pending_db):
+        from app.services.review_service import ReviewService
+        
+        review_id, db = pending_db
+        queue = asyncio.Queue()
+        queue.put_nowait({"type": "status", "status": "in_progress"})
+        queue.put_nowait({
+            "type": "completed", "status": "completed", "feedback": {"quality_score": 7},
+            "completed_at": "2026-01-01T00:00:00", "processing_time": 1.5
+        })
+        
+        with patch('app.services.review_service.get_database', return_value=db), \
+             patch('app.services.review_service.review_events.watch', AsyncMock(return_value=queue)), \
+             patch('app.services.review_service.review_events.unwatch', AsyncMock()) as unwatch:
+            review = await ReviewService().get_review(str(review_id), wait=5)
+        
+        assert review.status == "completed" and review.feedback.quality_score == 7
+        db.reviews.find_one.assert_awaited_once()
+        unwatch.assert_awaited_once_with(str(review_id), queue)
+    
+    @pytest.mark.asyncio
+    async def test_wait_times_out_with_the_current_state(self, pending_db):
+        from app.services.review_service import ReviewService
+        
+        review_id, db = pending_db
+        
+        with patch('app.services.review_service.get_database', return_value=db), \
+             patch('app.services.review_service.review_events.watch', AsyncMock(return_value=asyncio.Queue())), \
+             patch('app.services.review_service.review_events.unwatch', AsyncMock()):
+            review = await ReviewService().get_review(str(review_id), wait=0.05)
+        
+        assert review.status == "pending"
@@ -0,0 +1,149 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.review_queue import ReviewQueue
+
+
+class StreamRedis:
+    """
+    Single-group stream semantics: entries, pending list with delivery counts
+    """
+    
+    is_upstash = False
+    
+    def __init__(self):
+        self.entries = {}
+        self.pending = {}
+        self.streams = {}
+        self.sequence = 0
+        self.touched = []
+    
+    async def xgroup_create(self, stream, group, id="0"):
+        return True
+    
+    async def xadd(self, stream, fields, maxlen=None):
+        self.sequence += 1
+        entry_id = f"{self.sequence}-0"
+        self.streams.setdefault(stream, {})[entry_id] = {key: str(value) for key, value in fields.items()}
+        return entry_id
+    
+    async def xreadgroup(self, group, consumer, stream, id=">", count=1, block_ms=None):
+        fresh = [entry_id for entry_id in self.streams.get(stream, {}) if entry_id not in self.pending][:count]
+        for entry_id in fresh:
+            self.pending[entry_id] = 1
+        return [(entry_id, self.streams[stream][entry_id]) for entry_id in fresh]
+    
+    async def xautoclaim(self, stream, group, consumer, min_idle_ms, start_id="0-0", count=10):
+        claimed = [entry_id for entry_id in self.pending if entry_id in self.streams.get(stream, {})]
+        for entry_id in claimed:
+            self.pending[entry_id] += 1
+        return "0-0", [(entry_id, self.streams[stream][entry_id]) for entry_id in claimed]
+    
+    async def xclaim_justid(self, stream, group, consumer, *ids):
+        self.touched.extend(ids)
+        return len(ids)
+    
+    async def xpending_count(self, stream, group, entry_id):
+        return self.pending.get(entry_id, 0)
+    
+    async def xack(self, stream, group, *ids):
+        for entry_id in ids:
+            self.pending.pop(entry_id, None)
+        return len(ids)
+    
+    async def xdel(self, stream, *ids):
+        for entry_id in ids:
+            self.streams.get(stream, {}).pop(entry_id, None)
+        return len(ids)
+
+
+class TestReviewQueue:
+    
+    @pytest.mark.asyncio
+    async def test_processed_jobs_are_acknowledged_and_removed(self):
+        fake = StreamRedis()
+        queue = ReviewQueue()
+        handler = AsyncMock()
+        
+        with patch('app.services.review_queue.redis_client', fake):
+            assert await queue.enqueue("review-1")
+            (entry_id, fields), = await fake.xreadgroup(queue.group, "worker", queue.stream)
+            await queue._run(entry_id, fields, handler, "worker")
+        
+        handler.assert_awaited_once_with("review-1", 0, None)
+        assert fake.pending == {} and fake.streams[queue.stream] == {}
+        assert queue.processed == 1
+    
+    @pytest.mark.asyncio
+    async def test_failed_jobs_stay_pending_and_are_claimed(self):
+        fake = StreamRedis()
+        queue = ReviewQueue()
+        
+        with patch('app.services.review_queue.redis_client', fake):
+            await queue.enqueue("review-1", deferrals=2)
+            (entry_id, fields), = await fake.xreadgroup(queue.group, "worker", queue.stream)
+            await queue._run(entry_id, fields, AsyncMock(side_effect=ConnectionError("mongo down")), "worker")
+            
+            assert entry_id in fake.pending
+            
+            handler = AsyncMock()
+            await queue.claim_stale_once(handler, AsyncMock())
+        
+        handler.assert_awaited_once_with("review-1", 2, None)
+        assert queue.failed == 1 and queue.claimed == 1
+        assert fake.pending == {}
+    
+    @pytest.mark.asyncio
+    async def test_jobs_past_max_deliveries_are_dead_lettered(self):
+        fake = StreamRedis()
+        queue = ReviewQueue()
+        on_dead_letter = AsyncMock()
+        
+        with patch('app.services.review_queue.redis_client', fake), \
+             patch('app.services.review_queue.settings.REVIEW_QUEUE_MAX_DELIVERIES', 1):
+            await queue.enqueue("review-1")
+            await fake.xreadgroup(queue.group, "worker", queue.stream)
+            handler = AsyncMock()
+            await queue.claim_stale_once(handler, on_dead_letter)
+        
+        handler.assert_not_awaited()
+        on_dead_letter.assert_awaited_once_with("review-1", 2)
+        dead_letters = list(fake.streams[queue.dead_letter_stream].values())
+        assert dead_letters[0]["review_id"] == "review-1"
+        assert fake.streams[queue.stream] == {} and fake.pending == {}
+    
+    @pytest.mark.asyncio
+    async def test_submission_payload_travels_with_the_job(self):
+        fake = StreamRedis()
+        queue = ReviewQueue()
+        payload = {"code": "print(1)", "language": "python", "description": None}
+        
+        with patch('app.services.review_queue.redis_client', fake):
+            await queue.enqueue("review-1", payload=payload)
+            [(entry_id, fields)] = await fake.xreadgroup(queue.group, "worker", queue.stream)
+            handler = AsyncMock()
+            await queue._run(entry_id, fields, handler, "worker")
+        
+        assert "description" not in fields
+        handler.assert_awaited_once_with("review-1", 0, {"code": "print(1)", "language": "python"})
+    
+    @pytest.mark.asyncio
+    async def test_running_jobs_keep_their_entry_fresh(self):
+        import asyncio
+        
+        fake = StreamRedis()
+        queue = ReviewQueue()
+        
+        async def slow_review(review_id, deferrals, payload):
+            await asyncio.sleep(0.05)
+        
+        with patch('app.services.review_queue.redis_client', fake), \
+             patch('app.services.review_queue.settings.REVIEW_QUEUE_CLAIM_IDLE_SECONDS', 0.03):
+            await queue.enqueue("review-1")
+            (entry_id, fields), = await fake.xreadgroup(queue.group, "worker", queue.stream)
+            await queue._run(entry_id, fields, slow_review, "worker")
+            touched = len(fake.touched)
+            await asyncio.sleep(0.03)
+        
+        assert touched >= 2 and set(fake.touched) == {entry_id}
+        assert len(fake.touched) == touched
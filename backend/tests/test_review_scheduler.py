@@ -0,0 +1,232 @@
+import json
+import pytest
+from collections import defaultdict
+from unittest.mock import AsyncMock, patch
+
+from app.models.review import ReviewPriority
+from app.services.review_scheduler import DISPATCH_SCRIPT, ENQUEUE_SCRIPT, ReviewScheduler
+
+
+class SchedulerRedis:
+    """
+    Evaluates the scheduler scripts' semantics in Python, on a settable clock
+    """
+    
+    is_upstash = False
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.jobs = defaultdict(list)
+        self.tenants = defaultdict(dict)
+        self.vt = defaultdict(float)
+        self.finish = defaultdict(dict)
+        self.depth = defaultdict(int)
+        self.waits = defaultdict(list)
+        self.stream = []
+        self.delivered = 0
+        self.calls = []
+    
+    async def xgroup_create(self, stream, group, id="0"):
+        return True
+    
+    async def eval(self, script, keys, args):
+        self.calls.append(script)
+        if script == ENQUEUE_SCRIPT:
+            return self._enqueue(*args)
+        if script == DISPATCH_SCRIPT:
+            return self._dispatch(*args)
+        return self._stats(*args)
+    
+    def _enqueue(self, prefix, requested, tenant, threshold, bulk, *encoded):
+        classes = []
+        for raw in encoded:
+            name = requested
+            if threshold > 0 and name != bulk and len(self.jobs[(name, tenant)]) >= threshold:
+                name = bulk
+            job = json.loads(raw)
+            job["enqueued_at"] = self.now
+            self.jobs[(name, tenant)].append(job)
+            self.depth[name] += 1
+            if tenant not in self.tenants[name]:
+                self.tenants[name][tenant] = max(self.vt[name], self.finish[name].pop(tenant, 0))
+            classes.append(name)
+        return classes
+    
+    def _dispatch(self, prefix, stream, group, maxlen, ready_depth, aging, *weights):
+        if ready_depth > 0 and len(self.stream) - self.delivered >= ready_depth:
+            return None
+        
+        best = None
+        for name, weight in zip(weights[::2], weights[1::2]):
+            tags = self.tenants[name]
+            if not tags:
+                continue
+            head = min(tags, key=lambda tenant: (tags[tenant], tenant))
+            priority = weight * (1 + (self.now - self.jobs[(name, head)][0]["enqueued_at"]) / aging)
+            if best is None or priority > best[0]:
+                best = (priority, name, head)
+        if best is None:
+            return None
+        
+        _, name, tenant = best
+        job = self.jobs[(name, tenant)].pop(0)
+        self.depth[name] -= 1
+        start = self.tenants[name][tenant]
+        finish = start + job["cost"] / job["weight"]
+        self.vt[name] = start
+        if self.jobs[(name, tenant)]:
+            self.tenants[name][tenant] = finish
+        else:
+            del self.tenants[name][tenant]
+            self.finish[name][tenant] = finish
+        
+        wait = self.now - job["enqueued_at"]
+        self.waits[name] = [str(wait)] + self.waits[name][:999]
+        self.stream.append(dict(zip(job["fields"][::2], job["fields"][1::2])))
+        return [f"{len(self.stream)}-0", name, str(wait)]
+    
+    def _stats(self, prefix, *names):
+        result = []
+        for name in names:
+            result.extend([self.depth[name], len(self.tenants[name]), list(self.waits[name])])
+        return result
+    
+    def deliver(self) -> str:
+        """
+        Hand the oldest undelivered stream entry to a consumer
+        """
+        self.delivered += 1
+        return self.stream[self.delivered - 1]["review_id"]
+
+
+async def drain(scheduler, fake):
+    """
+    Consume the stream one entry at a time, dispatching after each, and
+    return the review ids in the order workers received them
+    """
+    order = []
+    while fake.delivered < len(fake.stream):
+        order.append(fake.deliver())
+        await scheduler.dispatch()
+    return order
+
+
+def submit(scheduler, review_ids, priority, user_id):
+    return scheduler.submit_many(
+        [(review_id, {"code": "print(1)", "language": "python"}) for review_id in review_ids],
+        priority, user_id, "1.2.3.4"
+    )
+
+
+@pytest.fixture
+def fake():
+    fake = SchedulerRedis()
+    with patch('app.services.review_scheduler.redis_client', fake), \
+         patch('app.services.review_queue.redis_client', fake), \
+         patch.multiple(
+             'app.services.review_scheduler.settings',
+             REVIEW_SCHEDULER_INTERACTIVE_WEIGHT=8.0,
+             REVIEW_SCHEDULER_BULK_WEIGHT=1.0,
+             REVIEW_SCHEDULER_AGING_SECONDS=30.0,
+             REVIEW_SCHEDULER_BULK_THRESHOLD=0,
+             REVIEW_SCHEDULER_USER_WEIGHT=1.0,
+             REVIEW_SCHEDULER_COST_CHARS=4000,
+             REVIEW_SCHEDULER_READY_DEPTH=1
+         ):
+        yield fake
+
+
+class TestReviewScheduler:
+    
+    @pytest.mark.asyncio
+    async def test_submission_is_queued_per_user_and_released(self, fake):
+        scheduler = ReviewScheduler()
+        queued = await scheduler.submit_many(
+            [("review-1", {"code": "x" * 8000, "language": "python"})],
+            ReviewPriority.INTERACTIVE, "user-1", "1.2.3.4"
+        )
+        
+        assert queued == ["interactive"]
+        assert fake.calls == [ENQUEUE_SCRIPT, DISPATCH_SCRIPT]
+        assert fake.stream[0]["review_id"] == "review-1"
+        assert fake.stream[0]["language"] == "python"
+        # Cost is 1 + 8000 / 4000 chars, so the user's next job starts at 3.0
+        assert fake.finish["interactive"]["user:user-1"] == 3.0
+        assert scheduler.submitted == 1 and scheduler.dispatched == 1
+    
+    @pytest.mark.asyncio
+    async def test_light_user_is_served_ahead_of_heavy_backlog(self, fake):
+        scheduler = ReviewScheduler()
+        await submit(scheduler, ["heavy-1", "heavy-2", "heavy-3", "heavy-4"], ReviewPriority.INTERACTIVE, "heavy")
+        await submit(scheduler, ["light-1"], ReviewPriority.INTERACTIVE, "light")
+        
+        assert await drain(scheduler, fake) == ["heavy-1", "light-1", "heavy-2", "heavy-3", "heavy-4"]
+    
+    @pytest.mark.asyncio
+    async def test_ready_depth_holds_jobs_until_a_consumer_takes_one(self, fake):
+        scheduler = ReviewScheduler()
+        await submit(scheduler, ["review-1", "review-2"], ReviewPriority.INTERACTIVE, "user-1")
+        
+        assert len(fake.stream) == 1
+        assert await scheduler.dispatch() is False
+        fake.deliver()
+        assert await scheduler.dispatch() is True
+        assert [entry["review_id"] for entry in fake.stream] == ["review-1", "review-2"]
+    
+    @pytest.mark.asyncio
+    async def test_interactive_backlog_beyond_threshold_is_demoted_to_bulk(self, fake):
+        with patch('app.services.review_scheduler.settings.REVIEW_SCHEDULER_BULK_THRESHOLD', 2):
+            queued = await submit(ReviewScheduler(), ["r1", "r2", "r3", "r4"], ReviewPriority.INTERACTIVE, "user-1")
+        
+        assert queued == ["interactive", "interactive", "bulk", "bulk"]
+        assert fake.depth["interactive"] == 1 and fake.depth["bulk"] == 2
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("waited,expected", [
+        (100, ["blocker", "fresh", "old-bulk"]),
+        (300, ["blocker", "old-bulk", "fresh"])
+    ])
+    async def test_old_bulk_work_eventually_beats_fresh_interactive_work(self, fake, waited, expected):
+        # Bulk (weight 1) ages to 1 + waited / 30 and outranks fresh interactive (8) after 210s
+        scheduler = ReviewScheduler()
+        await submit(scheduler, ["blocker"], ReviewPriority.INTERACTIVE, "user-a")
+        await submit(scheduler, ["old-bulk"], ReviewPriority.BULK, "user-b")
+        fake.now += waited
+        await submit(scheduler, ["fresh"], ReviewPriority.INTERACTIVE, "user-c")
+        
+        assert await drain(scheduler, fake) == expected
+    
+    def test_anonymous_submissions_share_by_ip(self):
+        assert ReviewScheduler.tenant(None, "1.2.3.4") == "ip:1.2.3.4"
+        assert ReviewScheduler.tenant("user-1", "1.2.3.4") == "user:user-1"
+    
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_back_to_direct_enqueue(self):
+        from app.services.review_service import ReviewService
+        from app.models.review import Review
+        
+        service = ReviewService()
+        review = Review(code="print(1)", language="python", ip_address="1.2.3.4", priority=ReviewPriority.BULK)
+        submit = AsyncMock(return_value=None)
+        
+        with patch('app.services.review_service.review_scheduler.submit_many', submit), \
+             patch.object(service, '_schedule', AsyncMock()) as schedule:
+            await service._admit("review-1", review)
+        
+        assert submit.await_args.args[1] == ReviewPriority.BULK
+        schedule.assert_awaited_once_with("review-1", payload={"code": "print(1)", "language": "python"})
+    
+    @pytest.mark.asyncio
+    async def test_snapshot_reports_wait_percentiles_per_class(self):
+        waits = [str(seconds) for seconds in range(1, 101)]
+        fake = AsyncMock()
+        fake.eval = AsyncMock(return_value=[3, 1, ["0.5", "0.2"], 40, 2, waits])
+        
+        with patch('app.services.review_scheduler.redis_client', fake):
+            snapshot = await ReviewScheduler().snapshot()
+        
+        interactive = snapshot["classes"]["interactive"]
+        bulk = snapshot["classes"]["bulk"]
+        assert interactive["waiting"] == 3 and interactive["wait_p95_seconds"] == 0.5
+        assert bulk["waiting"] == 40 and bulk["backlogged_users"] == 2
+        assert bulk["wait_p50_seconds"] == 51.0 and bulk["wait_p99_seconds"] == 100.0
@@ -1,6 +1,7 @@
 import pytest
 import os
 import sys
+from unittest.mock import AsyncMock, MagicMock, patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
@@ -20,4 +21,107 @@ class TestReviewService:
         service = ReviewService()
         assert hasattr(service, 'submit_review')
         assert hasattr(service, 'get_review')
-        assert hasattr(service, 'list_reviews')
\ No newline at end of file
+        assert hasattr(service, 'list_reviews')
+    
+    @pytest.mark.asyncio
+    async def test_batch_completes_cache_hits_and_queues_misses(self):
+        from bson import ObjectId
+        from app.services.review_service import ReviewService
+        from app.models.review import BatchSubmission, ReviewFeedback
+        
+        submission = BatchSubmission(files=[
+            {"path": "a.py", "code": "def a():\n    return 1\n", "language": "python"},
+            {"path": "b.py", "code": "def b():\n    return 2\n", "language": "python"}
+        ])
+        db = MagicMock()
+        db.reviews.insert_many = AsyncMock(return_value=MagicMock(inserted_ids=[ObjectId(), ObjectId()]))
+        db.submission_batches.insert_one = AsyncMock()
+        service = ReviewService()
+        
+        with patch('app.services.review_service.check_rate_limit', AsyncMock(return_value=True)) as rate_limit, \
+             patch('app.services.review_service.get_database', return_value=db), \
+             patch('app.services.review_service.ai_service.get_cached_reviews',
+                   AsyncMock(return_value=[ReviewFeedback(quality_score=9), None])), \
+             patch.object(service, '_admit_many', AsyncMock()) as admit_many:
+            batch = await service.submit_batch(submission, "1.2.3.4")
+        
+        assert rate_limit.await_args.kwargs["cost"] == 1
+        inserted = db.reviews.insert_many.await_args.args[0]
+        assert [doc["status"] for doc in inserted] == ["completed", "pending"]
+        assert inserted[0]["processing_time"] is not None and inserted[1]["processing_time"] is None
+        assert inserted[0]["submission_batch_id"] == batch.batch_id
+        
+        [(review_id, payload)] = admit_many.await_args.args[0]
+        assert review_id == batch.reviews[1].id and payload["code"].startswith("def b")
+        assert (batch.completed, batch.pending, batch.cache_hits) == (1, 1, 1)
+    
+    @pytest.mark.asyncio
+    async def test_largest_batch_fits_the_default_hourly_limit(self):
+        from app.core.config import settings
+        from app.services.review_service import ReviewService
+        from app.models.review import BatchSubmission
+        
+        submission = BatchSubmission(files=[{"code": "x = 1", "language": "python"}] * settings.MAX_BATCH_FILES)
+        rate_limit = AsyncMock(return_value=False)
+        
+        with patch('app.services.review_service.check_rate_limit', rate_limit), \
+             pytest.raises(Exception, match="Rate limit"):
+            await ReviewService().submit_batch(submission, "1.2.3.4")
+        
+        assert rate_limit.await_args.kwargs["cost"] <= settings.RATE_LIMIT_PER_HOUR
+    
+    @pytest.mark.asyncio
+    async def test_cached_submission_completes_inline(self):
+        from bson import ObjectId
+        from app.services.review_service import ReviewService
+        from app.models.review import CodeSubmission, ReviewFeedback
+        
+        db = MagicMock()
+        db.reviews.insert_one = AsyncMock(return_value=MagicMock(inserted_id=ObjectId()))
+        service = ReviewService()
+        submission = CodeSubmission(code="def a():\n    return 1\n", language="python")
+        
+        with patch('app.services.review_service.check_rate_limit', AsyncMock(return_value=True)), \
+             patch('app.services.review_service.get_database', return_value=db), \
+             patch('app.services.review_service.ai_service.get_cached_reviews',
+                   AsyncMock(return_value=[ReviewFeedback(quality_score=9)])), \
+             patch.object(service, '_admit', AsyncMock()) as admit:
+            review = await service.submit_review(submission, "1.2.3.4")
+        
+        admit.assert_not_awaited()
+        assert review.status == "completed" and review.feedback.quality_score == 9
+        stored = db.reviews.insert_one.await_args.args[0]
+        assert stored["status"] == "completed" and stored["completed_at"] is not None
+    
+    @pytest.mark.asyncio
+    async def test_uncached_submission_is_queued(self):
+        from bson import ObjectId
+        from app.services.review_service import ReviewService
+        from app.models.review import CodeSubmission
+        
+        db = MagicMock()
+        db.reviews.insert_one = AsyncMock(return_value=MagicMock(inserted_id=ObjectId()))
+        service = ReviewService()
+        
+        with patch('app.services.review_service.check_rate_limit', AsyncMock(return_value=True)), \
+             patch('app.services.review_service.get_database', return_value=db), \
+             patch('app.services.review_service.ai_service.get_cached_reviews', AsyncMock(return_value=[None])), \
+             patch.object(service, '_admit', AsyncMock()) as admit:
+            review = await service.submit_review(CodeSubmission(code="x = 1", language="python"), "1.2.3.4")
+        
+        assert review.status == "pending" and review.feedback is None
+        admit.assert_awaited_once_with(review.id, review)
+    
+    @pytest.mark.asyncio
+    async def test_deferred_submission_is_rejected_without_batching(self):
+        from app.services.review_service import ReviewService
+        from app.models.review import CodeSubmission
+        
+        rate_limit = AsyncMock(return_value=True)
+        
+        with patch('app.services.review_service.settings.BATCH_ENABLED', False), \
+             patch('app.services.review_service.check_rate_limit', rate_limit), \
+             pytest.raises(ValueError, match="batch processing is disabled"):
+            await ReviewService().submit_review(CodeSubmission(code="x = 1", language="python", deferred=True), "1.2.3.4")
+        
+        rate_limit.assert_not_awaited()
@@ -0,0 +1,78 @@
+import pytest
+import json
+from fastapi.testclient import TestClient
+
+from app.simulator import app, simulator, SimulatorConfig
+
+
+class TestSimulator:
+    
+    @pytest.fixture
+    def client(self):
+        simulator.config = SimulatorConfig(latency_median_ms=1, latency_p99_ms=2, tokens_per_second=1e6, seed=1)
+        simulator._window.clear()
+        return TestClient(app)
+    
+    def test_chat_completion_returns_review_json(self, client):
+        response = client.post("/v1/chat/completions", json={
+            "model": "gpt-4.1-mini",
+            "messages": [{"role": "user", "content": "print('hi')"}]
+        })
+        
+        assert response.status_code == 200
+        body = response.json()
+        review = json.loads(body["choices"][0]["message"]["content"])
+        assert 1 <= review["quality_score"] <= 10
+        assert body["usage"]["prompt_tokens"] > 0
+        assert "x-ratelimit-remaining-requests" in response.headers
+    
+    def test_streaming_emits_sse_chunks_and_usage(self, client):
+        response = client.post("/v1/chat/completions", json={
+            "messages": [{"role": "user", "content": "x = 1"}],
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        })
+        
+        events = [line[len("data: "):] for line in response.text.splitlines() if line.startswith("data: ")]
+        assert events[-1] == "[DONE]"
+        content = "".join(
+            json.loads(e)["choices"][0]["delta"].get("content", "")
+            for e in events[:-1] if json.loads(e)["choices"]
+        )
+        assert "quality_score" in json.loads(content)
+        assert "usage" in json.loads(events[-2])
+    
+    def test_rate_limit_returns_429_with_headers(self, client):
+        client.put("/simulator/config", json={"rate_limit_rpm": 1})
+        payload = {"messages": [{"role": "user", "content": "x"}]}
+        
+        assert client.post("/v1/chat/completions", json=payload).status_code == 200
+        limited = client.post("/v1/chat/completions", json=payload)
+        
+        assert limited.status_code == 429
+        assert limited.headers["x-ratelimit-remaining-requests"] == "0"
+        assert int(limited.headers["retry-after"]) >= 1
+    
+    def test_batch_lifecycle(self, client):
+        client.put("/simulator/config", json={"batch_completion_seconds": 0})
+        line = json.dumps({
+            "custom_id": "review-1",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {"model": "gpt-4.1-mini", "messages": [{"role": "user", "content": "x = 1"}]}
+        })
+        
+        uploaded = client.post("/v1/files", data={"purpose": "batch"}, files={"file": ("in.jsonl", line.encode())})
+        batch = client.post("/v1/batches", json={
+            "input_file_id": uploaded.json()["id"],
+            "endpoint": "/v1/chat/completions",
+            "completion_window": "24h"
+        }).json()
+        
+        finished = client.get(f"/v1/batches/{batch['id']}").json()
+        assert finished["status"] == "completed"
+        
+        output = client.get(f"/v1/files/{finished['output_file_id']}/content").text
+        result = json.loads(output)
+        assert result["custom_id"] == "review-1"
+        assert result["response"]["status_code"] == 200
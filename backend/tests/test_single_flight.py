@@ -0,0 +1,66 @@
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.utils.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    
+    @pytest.fixture
+    def mock_redis(self):
+        mock_redis = MagicMock()
+        mock_redis.set = AsyncMock(return_value=True)
+        mock_redis.get = AsyncMock(return_value=None)
+        mock_redis.delete = AsyncMock(return_value=True)
+        mock_redis.exists = AsyncMock(return_value=False)
+        return mock_redis
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self, mock_redis):
+        flight = SingleFlight()
+        calls = 0
+        
+        async def fn():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "feedback"
+        
+        with patch('app.utils.single_flight.redis_client', mock_redis):
+            results = await asyncio.gather(*[
+                flight.do("key", fn, AsyncMock(return_value=None)) for _ in range(10)
+            ])
+        
+        assert results == ["feedback"] * 10
+        assert calls == 1
+        assert flight.in_flight_count() == 0
+    
+    @pytest.mark.asyncio
+    async def test_follower_waits_for_leader_result(self, mock_redis):
+        flight = SingleFlight(poll_interval=0.01, wait_timeout=1)
+        mock_redis.set = AsyncMock(return_value=False)
+        mock_redis.exists = AsyncMock(return_value=True)
+        fn = AsyncMock(return_value="own call")
+        fetch_result = AsyncMock(side_effect=[None, "leader result"])
+        
+        with patch('app.utils.single_flight.redis_client', mock_redis):
+            result = await flight.do("key", fn, fetch_result)
+        
+        assert result == "leader result"
+        fn.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_all_waiters(self, mock_redis):
+        flight = SingleFlight()
+        
+        async def fn():
+            await asyncio.sleep(0.01)
+            raise Exception("upstream failed")
+        
+        with patch('app.utils.single_flight.redis_client', mock_redis):
+            results = await asyncio.gather(*[
+                flight.do("key", fn, AsyncMock(return_value=None)) for _ in range(3)
+            ], return_exceptions=True)
+        
+        assert all(isinstance(r, Exception) for r in results)
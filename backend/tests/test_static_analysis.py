@@ -0,0 +1,155 @@
+import pytest
+import os
+import sys
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bson import ObjectId
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.utils.static_analysis import AnalysisResult, run_analyzers
+
+
+class TestAnalyzers:
+    
+    def test_python_syntax_error_stops_the_chain(self):
+        result = run_analyzers("def broken(x:\n    pass\n", "python")
+        
+        assert not result.syntax_ok
+        assert result.issues[0].startswith("Line 1: Syntax error")
+        assert result.analyzers == ["python_syntax"]
+    
+    def test_newer_python_syntax_is_not_a_syntax_error(self):
+        with patch('app.utils.static_analysis.settings.STATIC_ANALYSIS_PYTHON_VERSION', "99.0"):
+            result = run_analyzers("type Point = tuple[float, float]\n", "python")
+        
+        assert result.syntax_ok and not result.parsed
+        assert result.issues == []
+        assert "may use newer syntax" in result.metrics["parse_error"]
+        
+        current = f"{sys.version_info[0]}.{sys.version_info[1]}"
+        with patch('app.utils.static_analysis.settings.STATIC_ANALYSIS_PYTHON_VERSION', current):
+            assert not run_analyzers("def f(:\n    pass\n", "python").syntax_ok
+    
+    def test_python_lint_rules(self):
+        code = (
+            "import os\n"
+            "import sys\n"
+            "def run(items=[]):\n"
+            "    try:\n"
+            "        eval(items)\n"
+            "    except:\n"
+            "        pass\n"
+            "    return sys.argv == None\n"
+        )
+        
+        result = run_analyzers(code, "python")
+        
+        assert result.syntax_ok
+        assert any("mutable default" in issue for issue in result.issues)
+        assert any("bare 'except:'" in issue for issue in result.issues)
+        assert any("'os' is imported but unused" in issue for issue in result.issues)
+        assert not any("'sys'" in issue for issue in result.issues)
+        assert result.security_concerns == ["Line 5: eval() executes arbitrary code"]
+        assert result.metrics["functions"] == 1
+    
+    def test_brackets_ignore_strings_and_comments(self):
+        code = 'class A {\n  /* } */\n  String s = "(";\n  void f() { g(s[0]); }\n}\n'
+        
+        assert run_analyzers(code, "java").syntax_ok
+        
+        broken = run_analyzers(code + "}\n", "java")
+        assert broken.syntax_ok
+        assert broken.issues == ["Line 6: unexpected '}' - brackets may be unbalanced"]
+    
+    def test_php_templates_are_not_bracket_checked(self):
+        code = "<p>Total (net: {{ amount ]</p>\n<?php if ($paid) { ?>\n<b>Paid</b>\n<?php } ?>\n"
+        
+        result = run_analyzers(code, "php")
+        
+        assert result.syntax_ok
+        assert result.issues == []
+    
+    def test_regex_literal_brace_is_only_an_issue(self):
+        result = run_analyzers("const s = text.replace(/\\{/g, '');\n", "javascript")
+        
+        assert result.syntax_ok
+        assert len(result.issues) == 1
+    
+    def test_languages_without_analyzers_pass(self):
+        result = run_analyzers("puts 'hi'", "ruby")
+        
+        assert result.syntax_ok
+        assert result.analyzers == []
+
+
+class TestAnalysisService:
+    
+    @pytest.mark.asyncio
+    async def test_analysis_runs_in_worker_process(self):
+        from app.services.analysis_service import AnalysisService
+        
+        service = AnalysisService()
+        try:
+            result = await service.analyze("x = (1,\n", "python")
+        finally:
+            await service.close()
+        
+        assert not result.syntax_ok
+        assert service.syntax_error_feedback(result).quality_score == 1
+    
+    def test_merge_prepends_local_findings(self):
+        from app.services.analysis_service import AnalysisService
+        from app.models.review import ReviewFeedback
+        
+        analysis = AnalysisResult(issues=["Line 1: 'os' is imported but unused"], analyzers=["python_lint"])
+        feedback = ReviewFeedback(quality_score=7, issues=["Missing docstring"])
+        
+        merged = AnalysisService().merge(feedback, analysis)
+        
+        assert merged.issues == ["Line 1: 'os' is imported but unused", "Missing docstring"]
+        assert merged.static_analysis["syntax_ok"] is True
+    
+    @pytest.mark.asyncio
+    async def test_syntax_errors_skip_the_ai_call(self):
+        from app.services.review_service import ReviewService
+        
+        review_id = ObjectId()
+        db = MagicMock()
+        db.reviews.with_options.return_value = db.reviews
+        db.reviews.update_one = AsyncMock()
+        db.reviews.find_one_and_update = AsyncMock(return_value={
+            "_id": review_id, "code": "def f(x:", "language": "python", "created_at": datetime.utcnow()
+        })
+        review_code = AsyncMock()
+        
+        with patch('app.services.review_service.get_database', return_value=db), \
+             patch('app.services.review_service.analysis_service.analyze',
+                   AsyncMock(return_value=run_analyzers("def f(x:", "python"))), \
+             patch('app.services.review_service.ai_service.review_code', review_code):
+            await ReviewService()._process_review(str(review_id))
+        
+        review_code.assert_not_awaited()
+        completed = db.reviews.update_one.call_args.args[1]["$set"]
+        assert completed["status"] == "completed"
+        assert completed["feedback"]["cost_info"]["source"] == "static_analysis"
+    
+    @pytest.mark.asyncio
+    async def test_job_payload_skips_reading_the_review(self):
+        from app.services.review_service import ReviewService
+        
+        db = MagicMock()
+        db.reviews.with_options.return_value = db.reviews
+        db.reviews.update_one = AsyncMock(return_value=MagicMock(matched_count=1))
+        db.reviews.find_one_and_update = AsyncMock()
+        
+        with patch('app.services.review_service.get_database', return_value=db), \
+             patch('app.services.review_service.analysis_service.analyze',
+                   AsyncMock(return_value=run_analyzers("def f(x:", "python"))):
+            await ReviewService()._process_review(str(ObjectId()), payload={"code": "def f(x:", "language": "python"})
+        
+        db.reviews.find_one_and_update.assert_not_awaited()
+        db.reviews.find_one.assert_not_called()
+        assert db.reviews.update_one.await_count == 2
+        assert db.reviews.update_one.call_args.args[1]["$set"]["status"] == "completed"
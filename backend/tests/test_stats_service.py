@@ -0,0 +1,33 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.stats_service import StatsService
+
+
+class TestCostStats:
+    
+    @pytest.mark.asyncio
+    async def test_latency_averages_skip_cache_served_reviews(self):
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[{
+            "totals": [{"reviews": 3, "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0,
+                        "cost_usd": 0.01, "avg_latency": 850.0, "cache_served": 2}],
+            "by_language": [{"_id": "python", "reviews": 3, "prompt_tokens": 0, "completion_tokens": 0,
+                             "cached_tokens": 0, "cost_usd": 0.01, "avg_latency": 850.0}],
+            "by_day": [{"_id": "2026-10-17", "reviews": 2, "prompt_tokens": 0, "completion_tokens": 0,
+                        "cached_tokens": 0, "cost_usd": 0.0, "avg_latency": None}]
+        }])
+        db = MagicMock()
+        db.reviews.aggregate.return_value = cursor
+        
+        with patch('app.services.stats_service.get_database', return_value=db):
+            stats = await StatsService()._get_cost_stats(user_id="user-1")
+        
+        facets = db.reviews.aggregate.call_args.args[0][1]["$facet"]
+        for facet in ("totals", "by_language", "by_day"):
+            group = next(stage["$group"] for stage in facets[facet] if "$group" in stage)
+            assert "cache" in group["avg_latency"]["$avg"]["$cond"][0]["$in"][1]
+        
+        assert stats["average_upstream_latency_ms"] == 850.0
+        assert stats["cost_by_language"][0].avg_upstream_latency_ms == 850.0
+        assert stats["cost_by_day"][0].avg_upstream_latency_ms is None
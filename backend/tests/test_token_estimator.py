@@ -0,0 +1,30 @@
+import pytest
+
+from app.utils.token_estimator import estimate_tokens, estimate_message_tokens
+
+
+class TestTokenEstimator:
+    
+    def test_empty_text(self):
+        assert estimate_tokens("") == 0
+    
+    def test_typical_code_density(self):
+        code = (
+            "def calculate_total(items):\n"
+            "    total = 0\n"
+            "    for item in items:\n"
+            "        total += item.price * item.quantity\n"
+            "    return total\n"
+        )
+        tokens = estimate_tokens(code)
+        
+        assert 2.5 <= len(code) / tokens <= 5
+    
+    def test_grows_linearly_with_input(self):
+        line = "result = compute(value, 42)\n"
+        
+        assert estimate_tokens(line * 10) == 10 * estimate_tokens(line)
+    
+    def test_message_overhead(self):
+        messages = [{"role": "user", "content": "hi"}]
+        assert estimate_message_tokens(messages) == estimate_tokens("hi") + 7
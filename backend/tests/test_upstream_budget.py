@@ -0,0 +1,85 @@
+import pytest
+from unittest.mock import patch
+
+from app.services.upstream_budget import UpstreamBudget
+
+
+class BucketRedis:
+    """
+    Evaluates the token-bucket script's semantics in Python (no refill)
+    """
+    
+    def __init__(self, requests, tokens):
+        self.requests = requests
+        self.tokens = tokens
+        self.calls = []
+    
+    async def eval(self, script, keys, args):
+        rpm, tpm, want_requests, want_tokens = args
+        self.calls.append((want_requests, want_tokens))
+        if (not rpm or self.requests >= want_requests) and (not tpm or self.tokens >= want_tokens):
+            self.requests -= want_requests
+            self.tokens -= want_tokens
+            return [1, "0", str(self.requests), str(self.tokens)]
+        wait = max((want_requests - self.requests) * 60 / rpm if rpm else 0, (want_tokens - self.tokens) * 60 / tpm if tpm else 0)
+        return [0, str(wait), str(self.requests), str(self.tokens)]
+
+
+class TestUpstreamBudget:
+    
+    @pytest.mark.asyncio
+    async def test_disabled_budget_never_calls_redis(self):
+        fake = BucketRedis(0, 0)
+        with patch('app.services.upstream_budget.redis_client', fake):
+            await UpstreamBudget("default").acquire(1000)
+        assert fake.calls == []
+    
+    @pytest.mark.asyncio
+    async def test_prefetched_permits_are_spent_locally(self):
+        fake = BucketRedis(requests=600, tokens=600_000)
+        budget = UpstreamBudget("default", rpm=600, tpm=600_000)
+        
+        with patch('app.services.upstream_budget.redis_client', fake), \
+             patch('app.services.upstream_budget.settings.AI_BUDGET_PREFETCH_REQUESTS', 5):
+            for _ in range(10):
+                await budget.acquire(1000)
+        
+        assert fake.calls == [(5, 5000), (5, 5000)]
+        assert budget.local_requests == 0 and budget.local_tokens == 0
+        assert budget.local_hits == 8
+    
+    @pytest.mark.asyncio
+    async def test_falls_back_to_exact_amount_when_batch_does_not_fit(self):
+        fake = BucketRedis(requests=1, tokens=100_000)
+        budget = UpstreamBudget("default", rpm=600, tpm=600_000)
+        
+        with patch('app.services.upstream_budget.redis_client', fake), \
+             patch('app.services.upstream_budget.settings.AI_BUDGET_PREFETCH_REQUESTS', 5):
+            await budget.acquire(1000)
+        
+        assert fake.calls == [(5, 5000), (1, 1000)]
+        assert fake.requests == 0
+    
+    @pytest.mark.asyncio
+    async def test_waits_while_exhausted_then_gives_up(self):
+        fake = BucketRedis(requests=0, tokens=0)
+        budget = UpstreamBudget("default", rpm=6000, tpm=0)
+        
+        with patch('app.services.upstream_budget.redis_client', fake), \
+             patch('app.services.upstream_budget.settings.AI_BUDGET_MAX_WAIT', 0.05):
+            await budget.acquire(1000)
+        
+        assert budget.waits >= 1
+        assert len(fake.calls) >= 2
+    
+    @pytest.mark.asyncio
+    async def test_fails_open_without_redis(self):
+        class Unavailable:
+            async def eval(self, script, keys, args):
+                return None
+        
+        budget = UpstreamBudget("default", rpm=60, tpm=0)
+        with patch('app.services.upstream_budget.redis_client', Unavailable()):
+            await budget.acquire(100)
+        
+        assert budget.fail_open == 1
@@ -27,4 +27,20 @@ class TestUtilities:
             assert review_service is not None
             
         except ImportError as e:
-            pytest.fail(f"Import failed: {e}")
\ No newline at end of file
+            pytest.fail(f"Import failed: {e}")
+    
+    def test_stats_csv_includes_cost_sections(self):
+        from app.utils.csv_exporter import csv_exporter
+        
+        csv_content = csv_exporter.export_stats_to_csv({
+            "total_cost_usd": 0.0123,
+            "cost_by_language": [{
+                "key": "python", "reviews": 3, "prompt_tokens": 1200,
+                "completion_tokens": 300, "cached_tokens": 0, "cost_usd": 0.0123
+            }]
+        })
+        
+        assert "Total Cost (USD),0.0123" in csv_content
+        assert "Cost By Language" in csv_content
+        assert "python,3,1200,300,0,0.0123" in csv_content
+        assert "Cost By User" not in csv_content
@@ -187,14 +187,12 @@ export const useReviewPolling = () => {
     try {
       console.log(`[POLLING] Starting polling for review ${reviewId}`);
       
-      const pollingPromise = ApiService.pollReviewStatus(
+      const pollingPromise = ApiService.watchReviewStatus(
         reviewId,
         (updatedReview) => {
           console.log(`[POLLING] Update received:`, updatedReview.status);
           setPollingReview(updatedReview);
-        },
-        20,
-        3000
+        }
       );
       
       pollingPromiseRef.current = pollingPromise;
@@ -4,6 +4,9 @@ import {
   ReviewResponse,
   ReviewListResponse,
   CodeSubmission,
+  DiffSubmission,
+  BatchSubmission,
+  BatchStatusResponse,
   StatsResponse,
   HealthCheck,
   ReviewFilters,
@@ -15,6 +18,9 @@ import {
   User
 } from '../types/api';
 
+// Kept below the axios timeout
+const LONG_POLL_SECONDS = 20;
+
 const api = axios.create({
   baseURL: process.env.REACT_APP_API_URL || '/api',
   timeout: 30000,
@@ -102,8 +108,25 @@ export class ApiService {
     return response.data;
   }
 
-  static async getReview(reviewId: string): Promise<Review> {
-    const response: AxiosResponse<Review> = await api.get(`/reviews/${reviewId}`);
+  static async submitDiffReview(reviewId: string, submission: DiffSubmission): Promise<ReviewResponse> {
+    const response: AxiosResponse<ReviewResponse> = await api.post(`/reviews/${reviewId}/diff`, submission);
+    return response.data;
+  }
+
+  static async submitBatchReview(submission: BatchSubmission): Promise<BatchStatusResponse> {
+    const response: AxiosResponse<BatchStatusResponse> = await api.post('/reviews/batch', submission);
+    return response.data;
+  }
+
+  static async getBatchReview(batchId: string): Promise<BatchStatusResponse> {
+    const response: AxiosResponse<BatchStatusResponse> = await api.get(`/reviews/batch/${batchId}`);
+    return response.data;
+  }
+
+  static async getReview(reviewId: string, waitSeconds: number = 0): Promise<Review> {
+    const response: AxiosResponse<Review> = await api.get(`/reviews/${reviewId}`, {
+      params: waitSeconds ? { wait: waitSeconds } : undefined
+    });
     return response.data;
   }
 
@@ -179,6 +202,74 @@ export class ApiService {
     window.URL.revokeObjectURL(url);
   }
 
+  static async watchReviewStatus(
+    reviewId: string,
+    onUpdate: (review: Review) => void,
+    timeoutMs: number = 300000
+  ): Promise<Review> {
+    if (typeof EventSource === 'undefined') {
+      return this.pollReviewStatus(reviewId, onUpdate);
+    }
+
+    let review = await this.getReview(reviewId);
+    onUpdate(review);
+    if (review.status === 'completed' || review.status === 'failed') {
+      return review;
+    }
+
+    return new Promise((resolve, reject) => {
+      const source = new EventSource(`${api.defaults.baseURL}/reviews/${reviewId}/events`);
+      let settled = false;
+
+      const settle = (finish: () => void) => {
+        if (settled) return;
+        settled = true;
+        clearTimeout(timeoutId);
+        source.close();
+        finish();
+      };
+
+      const fallBackToPolling = () => settle(() => {
+        console.log(`[EVENTS] Stream closed before completion, falling back to polling`);
+        this.pollReviewStatus(reviewId, onUpdate).then(resolve, reject);
+      });
+
+      const timeoutId = setTimeout(
+        () => settle(() => reject(new Error('Safety timeout reached'))),
+        timeoutMs
+      );
+
+      const apply = (event: Event): Review => {
+        const data = JSON.parse((event as MessageEvent).data);
+        review = data.type === 'section'
+          ? { ...review, partial_feedback: { ...review.partial_feedback, [data.section]: data.value } }
+          : {
+              ...review,
+              status: data.status,
+              feedback: data.feedback || review.feedback,
+              completed_at: data.completed_at || review.completed_at,
+              processing_time: data.processing_time || review.processing_time,
+              error_message: data.error_message || review.error_message
+            };
+        onUpdate(review);
+        return review;
+      };
+
+      source.addEventListener('status', apply);
+      source.addEventListener('section', apply);
+      source.addEventListener('completed', (event) => {
+        const finalReview = apply(event);
+        settle(() => resolve(finalReview));
+      });
+      source.addEventListener('failed', (event) => {
+        const finalReview = apply(event);
+        settle(() => resolve(finalReview));
+      });
+      source.addEventListener('timeout', fallBackToPolling);
+      source.onerror = fallBackToPolling;
+    });
+  }
+
   static async pollReviewStatus(
     reviewId: string,
     onUpdate: (review: Review) => void,
@@ -202,7 +293,8 @@ export class ApiService {
           attempts++;
           console.log(`[POLLING] Attempt ${attempts}/${maxAttempts} for review ${reviewId}`);
           
-          const review = await this.getReview(reviewId);
+          // Long poll: the server answers as soon as the review finishes
+          const review = await this.getReview(reviewId, LONG_POLL_SECONDS);
           onUpdate(review);
           
           if (review.status === 'completed' || review.status === 'failed') {
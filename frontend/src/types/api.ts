@@ -6,6 +6,11 @@ export enum ReviewStatus {
   FAILED = 'failed'
 }
 
+export enum ReviewPriority {
+  INTERACTIVE = 'interactive',
+  BULK = 'bulk'
+}
+
 export enum ProgrammingLanguage {
   PYTHON = 'python',
   JAVASCRIPT = 'javascript',
@@ -50,6 +55,26 @@ export interface CodeSubmission {
   code: string;
   language: ProgrammingLanguage;
   description?: string;
+  deferred?: boolean;
+  priority?: ReviewPriority;
+}
+
+export interface DiffSubmission {
+  diff?: string;
+  code?: string;
+  description?: string;
+}
+
+export interface BatchFile {
+  path?: string;
+  code: string;
+  language: ProgrammingLanguage;
+  description?: string;
+}
+
+export interface BatchSubmission {
+  files: BatchFile[];
+  priority?: ReviewPriority;
 }
 
 export interface ReviewFeedback {
@@ -59,6 +84,9 @@ export interface ReviewFeedback {
   security_concerns: string[];
   performance_recommendations: string[];
   positive_aspects: string[];
+  approximate?: boolean;
+  similarity?: number | null;
+  static_analysis?: Record<string, unknown> | null;
 }
 
 export interface Review {
@@ -68,6 +96,7 @@ export interface Review {
   description?: string;
   status: ReviewStatus;
   feedback?: ReviewFeedback;
+  partial_feedback?: Partial<ReviewFeedback>;
   created_at: string;
   completed_at?: string;
   ip_address?: string;
@@ -79,6 +108,26 @@ export interface ReviewResponse {
   id: string;
   status: ReviewStatus;
   message: string;
+  feedback?: ReviewFeedback;
+}
+
+export interface BatchReviewItem {
+  id: string;
+  path?: string;
+  status: ReviewStatus;
+}
+
+export interface BatchStatusResponse {
+  batch_id: string;
+  status: ReviewStatus;
+  total: number;
+  pending: number;
+  in_progress: number;
+  completed: number;
+  failed: number;
+  cache_hits: number;
+  reviews: BatchReviewItem[];
+  created_at?: string;
 }
 
 export interface ReviewListResponse {
@@ -106,6 +155,16 @@ export interface CommonIssue {
   count: number;
 }
 
+export interface CostBreakdown {
+  key: string;
+  reviews: number;
+  prompt_tokens: number;
+  completion_tokens: number;
+  cached_tokens: number;
+  cost_usd: number;
+  avg_upstream_latency_ms?: number | null;
+}
+
 export interface StatsResponse {
   total_reviews: number;
   total_completed: number;
@@ -116,6 +175,15 @@ export interface StatsResponse {
   daily_stats: DailyStats[];
   common_issues: CommonIssue[];
   score_distribution: Record<string, number>;
+  total_cost_usd: number;
+  total_prompt_tokens: number;
+  total_completion_tokens: number;
+  total_cached_tokens: number;
+  average_upstream_latency_ms: number;
+  cache_served_reviews: number;
+  cost_by_language: CostBreakdown[];
+  cost_by_day: CostBreakdown[];
+  cost_by_user: CostBreakdown[];
 }
 
 export interface HealthCheck {
@@ -113,7 +113,7 @@ export const APP_CONFIG = {
   name: 'AI Code Reviewer',
   version: '1.0.0',
   description: 'AI-powered code review system',
-  maxCodeLength: 10000,
+  maxCodeLength: 100000,
   maxDescriptionLength: 500,
   pollingInterval: 2000,
   pollingMaxAttempts: 30,
@@ -105,7 +105,7 @@ export const isValidUrl = (url: string) => {
   }
 };
 
-export const isValidCode = (code: string, maxLength: number = 10000) => {
+export const isValidCode = (code: string, maxLength: number = 100000) => {
   return code.trim().length > 0 && code.length <= maxLength;
 };
 